@@ -0,0 +1,82 @@
+"""
+Loads my_list.json files of 10k and 100k items with the original loader and with the generated codec.
+
+    python -m benchmarks.bench_codec [--sizes 10000 100000] > bench_output.txt
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import typing
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from cinescope.core.codec import decode_media, encode_media
+from cinescope.core.media import Media
+from .library import make_items
+
+def original_loader(data):
+    """What load_list did before the codec: untyped, status and seasons stay plain."""
+    return [Media(**item) for item in data]
+
+def _convert(tp, value):
+    if value is None:
+        return None
+    if typing.get_origin(tp) is typing.Union:
+        tp = next(arg for arg in typing.get_args(tp) if arg is not type(None))
+    origin = typing.get_origin(tp)
+    if isinstance(tp, type) and issubclass(tp, Enum):
+        return tp(value)
+    if is_dataclass(tp):
+        return reflective_decode(tp, value)
+    if origin is list:
+        (item_tp,) = typing.get_args(tp)
+        return [_convert(item_tp, v) for v in value]
+    if origin is dict:
+        _, value_tp = typing.get_args(tp)
+        return {k: _convert(value_tp, v) for k, v in value.items()}
+    return value
+
+def reflective_decode(cls, item: dict):
+    """Typed decoding that walks fields and type hints for every item."""
+    hints = typing.get_type_hints(cls)
+    return cls(**{f.name: _convert(hints[f.name], item[f.name]) for f in fields(cls) if f.name in item})
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+def run(size: int):
+    items = make_items(size)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "my_list.json")
+        with open(path, "w") as f:
+            json.dump(items, f, indent=4)
+        megabytes = os.path.getsize(path) / 1e6
+
+        def load(decode):
+            with open(path) as f:
+                return decode(json.load(f))
+
+        parse, _ = timed(load, lambda data: data)
+        original, _ = timed(load, original_loader)
+        reflective, _ = timed(load, lambda data: [reflective_decode(Media, item) for item in data])
+        codec, decoded = timed(load, lambda data: [decode_media(item) for item in data])
+        encode, _ = timed(lambda: [encode_media(media) for media in decoded])
+
+    print(f"{size:>7} items, {megabytes:.1f} MB file")
+    print(f"  json.load only:                 {parse:6.2f}s")
+    print(f"  original loader (untyped):      {original:6.2f}s")
+    print(f"  reflective typed conversion:    {reflective:6.2f}s")
+    print(f"  decode_media (typed):           {codec:6.2f}s")
+    print(f"  encode_media:                   {encode:6.2f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    for size in parser.parse_args().sizes:
+        run(size)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Reports traced bytes per media item for the original dataclass models, the slotted ones, and the
+slotted ones with seasons packed as JsonStorage loads them.
+
+    python -m benchmarks.bench_memory [--count 4000] > bench_output.txt
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from cinescope.core.codec import decode_media
+from cinescope.core.lazy_seasons import LazySeasons
+from cinescope.core.media import MediaStatus
+from .library import make_items
+
+# The models as they were before slots, interned genres and EpisodeList
+@dataclass
+class LegacyEpisode:
+    episode_number: int
+    name: str
+    vote_average: float
+
+@dataclass
+class LegacySeasonProgress:
+    episodesWatched: int
+    totalEpisodes: int
+    vote_average: Optional[float] = None
+    episodes: Optional[List[LegacyEpisode]] = field(default_factory=list)
+
+@dataclass
+class LegacyMedia:
+    id: int
+    title: str
+    year: str
+    type: str
+    poster_path: Optional[str]
+    plot: str
+    vote_average: float
+    status: MediaStatus
+    genres: List[Dict[str, Any]] = field(default_factory=list)
+    imdb_id: Optional[str] = None
+    tvdb_id: Optional[int] = None
+    runtime: Optional[int] = None
+    episode_run_time: Optional[List[int]] = field(default_factory=list)
+    number_of_seasons: Optional[int] = None
+    production_status: Optional[str] = None
+    seasons: Optional[Dict[str, LegacySeasonProgress]] = field(default_factory=dict)
+
+def legacy_decode(item: dict) -> LegacyMedia:
+    seasons = {
+        key: LegacySeasonProgress(season["episodesWatched"], season["totalEpisodes"], season["vote_average"],
+                                  [LegacyEpisode(**episode) for episode in season["episodes"]])
+        for key, season in item["seasons"].items()
+    }
+    return LegacyMedia(**dict(item, status=MediaStatus(item["status"]), seasons=seasons))
+
+def packed_decode(item: dict):
+    return decode_media(dict(item, seasons=LazySeasons.pack(item["seasons"])) if item["seasons"] else item)
+
+def bytes_per_item(decode, items: List[dict]) -> float:
+    """Memory still held once the parsed dicts are gone, i.e. what the decoded objects keep alive."""
+    data = json.dumps(items)
+    gc.collect()
+    tracemalloc.start()
+    parsed = json.loads(data)
+    decoded = [decode(item) for item in parsed]
+    del parsed
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(decoded) == len(items)
+    return current / len(items)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=4000)
+    count = parser.parse_args().count
+    items = make_items(count * 2, seasons=5, episodes=10)
+    kinds = {"movie": [item for item in items if item["type"] == "movie"][:count],
+             "series 5x10": [item for item in items if item["type"] == "series"][:count]}
+    print(f"{count} items of each kind, traced bytes per item")
+    print(f"  {'':<12} {'before':>8} {'after':>8} {'packed':>8}")
+    for kind, subset in kinds.items():
+        before = bytes_per_item(legacy_decode, subset)
+        after = bytes_per_item(decode_media, subset)
+        packed = bytes_per_item(packed_decode, subset)
+        print(f"  {kind:<12} {before:8.0f} {after:8.0f} {packed:8.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Saves and loads 10k and 100k-item libraries as pretty-printed JSON and as compact snapshots.
+
+    python -m benchmarks.bench_snapshot [--sizes 10000 100000] > bench_output.txt
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from cinescope.core.codec import decode_media, encode_media
+from cinescope.core.snapshot import decode_snapshot, encode_snapshot
+from .library import make_items
+
+def save_json(path, items):
+    with open(path, "w") as f:
+        json.dump(items, f, indent=4)
+
+def load_json(path):
+    with open(path) as f:
+        return [decode_media(item) for item in json.load(f)]
+
+def save_compact(path, items):
+    with open(path, "wb") as f:
+        f.write(encode_snapshot(items))
+
+def load_compact(path):
+    with open(path, "rb") as f:
+        return decode_snapshot(f.read())
+
+def timed(fn, *args) -> float:
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+def run(size: int):
+    # Save what DataManager would hand the backend: encoded typed objects
+    items = [encode_media(decode_media(item)) for item in make_items(size)]
+    print(f"{size:>7} items")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, save, load in (("json", save_json, load_json), ("compact", save_compact, load_compact)):
+            path = os.path.join(directory, f"my_list.{name}")
+            save_seconds = timed(save, path, items)
+            load_seconds = timed(load, path)
+            print(f"  {name:<8} {os.path.getsize(path) / 1e6:7.1f} MB   save {save_seconds:6.2f}s   load {load_seconds:6.2f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    for size in parser.parse_args().sizes:
+        run(size)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Synthetic my_list.json content shared by the benchmarks."""
+import random
+from typing import List
+
+GENRES = [{"id": 18, "name": "Drama"}, {"id": 35, "name": "Comedy"}, {"id": 28, "name": "Action"},
+          {"id": 878, "name": "Science Fiction"}, {"id": 80, "name": "Crime"}]
+STATUSES = ["Watching", "Completed", "Plan to Watch", "Dropped"]
+
+def make_items(count: int, seasons: int = 3, episodes: int = 8, seed: int = 0) -> List[dict]:
+    """Plain media dicts as stored in my_list.json; every other item is a series."""
+    rng = random.Random(seed)
+    items = []
+    for media_id in range(count):
+        item = {
+            "id": media_id, "title": f"Title {media_id}", "year": str(1970 + media_id % 55),
+            "poster_path": f"/poster{media_id}.jpg", "plot": "A one-sentence overview of the title.",
+            "vote_average": round(rng.uniform(4, 9), 3), "status": rng.choice(STATUSES),
+            "genres": rng.sample(GENRES, 2), "imdb_id": f"tt{media_id:07d}", "tvdb_id": None,
+        }
+        if media_id % 2:
+            item.update(type="series", runtime=None, episode_run_time=[45], number_of_seasons=seasons,
+                        production_status="Ended", seasons={
+                            str(number): {
+                                "episodesWatched": rng.randint(0, episodes), "totalEpisodes": episodes,
+                                "vote_average": round(rng.uniform(4, 9), 3),
+                                "episodes": [{"episode_number": e, "name": f"Episode {e}",
+                                              "vote_average": round(rng.uniform(4, 9), 3)}
+                                             for e in range(1, episodes + 1)],
+                            } for number in range(1, seasons + 1)})
+        else:
+            item.update(type="movie", runtime=rng.randint(80, 180), episode_run_time=[],
+                        number_of_seasons=None, production_status=None, seasons={})
+        items.append(item)
+    return items
@@ -0,0 +1,173 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Iterator, Optional
+from cinescope.core.util import Shared
+from .omdb_client import OMDbClient
+from .tmdb_client import TMDbClient
+from .trakt_client import TraktClient
+from .tvmaze_client import TVMazeClient
+
+# Requests in flight per host; the executor is sized to cover all of them at once
+HOST_LIMITS: Dict[str, int] = {
+    "api.themoviedb.org": 8,
+    "www.omdbapi.com": 4,
+    "api.trakt.tv": 4,
+    "api.tvmaze.com": 4,
+}
+
+# Of those, how many speculative (prefetch) requests may hold at once, so user-initiated ones keep the rest
+BACKGROUND_LIMIT = 2
+
+class AsyncRunner:
+    """
+    An asyncio event loop on a dedicated daemon thread.
+
+    The blocking clients run in the loop's executor, so coroutines can fan out
+    requests while the Qt event loop stays free. Use submit() from any thread.
+    """
+
+    def __init__(self, max_workers: int = sum(HOST_LIMITS.values()) + 4):
+        self.loop = asyncio.new_event_loop()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cinescope-io")
+        self.loop.set_default_executor(self.executor)
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._background_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._thread = threading.Thread(target=self.loop.run_forever, name="cinescope-asyncio", daemon=True)
+        self._thread.start()
+
+    def submit(self, coro) -> Future:
+        """Schedules a coroutine on the loop thread; returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """Runs a coroutine on the loop thread and blocks until it finishes."""
+        return self.submit(coro).result(timeout)
+
+    def semaphore(self, host: str) -> asyncio.Semaphore:
+        # Only called from coroutines, i.e. on the loop thread
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(HOST_LIMITS.get(host, 4))
+        return semaphore
+
+    def background_semaphore(self, host: str) -> asyncio.Semaphore:
+        """Gate for low-priority requests, taken before the host's own semaphore."""
+        semaphore = self._background_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._background_semaphores[host] = asyncio.Semaphore(BACKGROUND_LIMIT)
+        return semaphore
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.loop.close()
+
+def report_errors(future: Future, context: str) -> Future:
+    """Prints the exception of a fire-and-forget submit() instead of losing it."""
+    def done(f):
+        if not f.cancelled() and f.exception() is not None:
+            print(f"An error occurred in {context}: {f.exception()!r}")
+    future.add_done_callback(done)
+    return future
+
+_shared = Shared(AsyncRunner)
+
+def get_runner() -> AsyncRunner:
+    """Returns the process-wide loop thread, starting it on first use."""
+    return _shared.get()
+
+class _AsyncClient:
+    host = None
+
+    def __init__(self, client, runner: AsyncRunner = None):
+        self.client = client
+        self.runner = runner or get_runner()
+
+    async def _call(self, method, *args):
+        """Runs one blocking client call in the executor, within the host's concurrency cap."""
+        async with self.runner.semaphore(self.host):
+            return await asyncio.get_running_loop().run_in_executor(None, partial(method, *args))
+
+    async def _background_call(self, method, *args):
+        """Like _call, for speculative work; at most BACKGROUND_LIMIT of these use the host at once."""
+        async with self.runner.background_semaphore(self.host):
+            return await self._call(method, *args)
+
+class AsyncTMDbClient(_AsyncClient):
+    """Coroutine counterpart of TMDbClient."""
+    host = "api.themoviedb.org"
+
+    def __init__(self, client: TMDbClient, runner: AsyncRunner = None):
+        super().__init__(client, runner)
+
+    async def search_multi(self, query: str):
+        return await self._call(self.client.search_multi, query)
+
+    async def find_by_imdb_id(self, imdb_id: str):
+        return await self._call(self.client.find_by_imdb_id, imdb_id)
+
+    async def next_page(self, pages: Iterator[dict]) -> Optional[dict]:
+        """Advances a search_multi_pages iterator in the executor; None once it is exhausted."""
+        return await self._call(next, pages, None)
+
+    async def get_details(self, media_type: str, tmdb_id: int, fresh: bool = False):
+        return await self._call(self.client.get_details, media_type, tmdb_id, fresh)
+
+    async def get_tv_seasons(self, tmdb_id: int, season_numbers):
+        return await self._call(self.client.get_tv_seasons, tmdb_id, season_numbers)
+
+    async def prefetch_details(self, media_type: str, tmdb_id: int):
+        """Low-priority get_details, to warm the response cache ahead of a likely request."""
+        return await self._background_call(self.client.get_details, media_type, tmdb_id)
+
+class AsyncOMDbClient(_AsyncClient):
+    """Coroutine counterpart of OMDbClient."""
+    host = "www.omdbapi.com"
+
+    def __init__(self, client: OMDbClient, runner: AsyncRunner = None):
+        super().__init__(client, runner)
+
+    async def search(self, query: str):
+        return await self._call(self.client.search, query)
+
+class AsyncTraktClient(_AsyncClient):
+    """Coroutine counterpart of TraktClient."""
+    host = "api.trakt.tv"
+
+    def __init__(self, client: TraktClient, runner: AsyncRunner = None):
+        super().__init__(client, runner)
+
+    async def get_trending_movies(self):
+        return await self._call(self.client.get_trending_movies)
+
+    async def get_popular_movies(self):
+        return await self._call(self.client.get_popular_movies)
+
+    async def get_trending_shows(self):
+        return await self._call(self.client.get_trending_shows)
+
+    async def get_popular_shows(self):
+        return await self._call(self.client.get_popular_shows)
+
+class AsyncTVMazeClient(_AsyncClient):
+    """Coroutine counterpart of TVMazeClient."""
+    host = "api.tvmaze.com"
+
+    def __init__(self, client: TVMazeClient = None, runner: AsyncRunner = None):
+        super().__init__(client or TVMazeClient(), runner)
+
+    async def search_shows(self, query: str):
+        return await self._call(self.client.search_shows, query)
+
+    async def lookup_show(self, imdb_id: str = None, tvdb_id: int = None):
+        return await self._call(self.client.lookup_show, imdb_id, tvdb_id)
+
+    async def get_show_episodes(self, show_id: int, fresh: bool = False):
+        return await self._call(self.client.get_show_episodes, show_id, fresh)
+
+    async def get_show_updates(self, since: str = None):
+        return await self._call(self.client.get_show_updates, since)
+
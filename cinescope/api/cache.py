@@ -0,0 +1,223 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+import requests
+from requests.structures import CaseInsensitiveDict
+from cinescope.core.config import get_cache_dir
+from cinescope.core.util import Shared
+from .transport import HttpTransport, get_transport
+
+# Query parameters that identify the caller rather than the resource
+SECRET_PARAMS = {"api_key", "apikey"}
+
+# Seconds a stored response is served without asking upstream, by longest "host/path" prefix
+DEFAULT_TTL = 60 * 60
+ENDPOINT_TTLS: Dict[str, int] = {
+    # IMDb -> TMDb mappings practically never change
+    "api.themoviedb.org/3/find/": 30 * 24 * 60 * 60,
+    "api.themoviedb.org/3/search/": 15 * 60,
+    "api.themoviedb.org/3/trending/": 15 * 60,
+    "api.themoviedb.org/3/movie/": 24 * 60 * 60,
+    "api.themoviedb.org/3/tv/": 12 * 60 * 60,
+    "api.trakt.tv/movies/trending": 15 * 60,
+    "api.trakt.tv/shows/trending": 15 * 60,
+    "api.trakt.tv/movies/popular": 24 * 60 * 60,
+    "api.trakt.tv/shows/popular": 24 * 60 * 60,
+    "api.tvmaze.com/search/": 15 * 60,
+    "api.tvmaze.com/lookup/": 30 * 24 * 60 * 60,
+    # TVMaze itself only refreshes the feed hourly
+    "api.tvmaze.com/updates/": 30 * 60,
+    "api.tvmaze.com/shows/": 6 * 60 * 60,
+    "www.omdbapi.com": 15 * 60,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    headers TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access);
+"""
+
+def cache_key(url: str, params: Optional[dict] = None) -> str:
+    """Normalizes a request to host/path plus sorted params, without API keys."""
+    parts = urlsplit(url)
+    query = {}
+    if parts.query:
+        query.update(pair.split("=", 1) if "=" in pair else (pair, "") for pair in parts.query.split("&"))
+    query.update(params or {})
+    query = sorted((name, str(value)) for name, value in query.items() if name not in SECRET_PARAMS)
+    return f"{parts.hostname}{parts.path.rstrip('/')}?{urlencode(query)}"
+
+class ResponseCache:
+    """
+    SQLite-backed store of GET response bodies with per-endpoint TTLs and an LRU size cap.
+
+    Safe to share between threads; every statement runs under one lock.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024,
+                 ttls: Optional[Dict[str, int]] = None, default_ttl: int = DEFAULT_TTL):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = dict(ENDPOINT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self._size = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def ttl_for(self, key: str) -> int:
+        matches = [prefix for prefix in self.ttls if key.startswith(prefix)]
+        return self.ttls[max(matches, key=len)] if matches else self.default_ttl
+
+    def lookup(self, key: str) -> Optional[dict]:
+        """Returns the stored entry (fresh or stale) and marks it recently used."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT body, headers, etag, last_modified, expires_at FROM responses WHERE key = ?",
+                (key,)).fetchone()
+            if row is None:
+                return None
+            with self.conn:
+                self.conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+        body, headers, etag, last_modified, expires_at = row
+        return {"body": body, "headers": json.loads(headers), "etag": etag,
+                "last_modified": last_modified, "fresh": expires_at > time.time()}
+
+    def store(self, key: str, response: requests.Response):
+        body = response.content
+        headers = {name: value for name, value in response.headers.items()
+                   if name.lower() in ("content-type", "etag", "last-modified")}
+        now = time.time()
+        with self._lock:
+            with self.conn:
+                old = self.conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(key, body, headers, etag, last_modified, expires_at, last_access, size) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, body, json.dumps(headers), response.headers.get("ETag"),
+                     response.headers.get("Last-Modified"), now + self.ttl_for(key), now, len(body)))
+                self._size += len(body) - (old[0] if old else 0)
+                self._evict()
+
+    def refresh(self, key: str):
+        """Extends an entry's lifetime after upstream answered 304 Not Modified."""
+        now = time.time()
+        with self._lock:
+            with self.conn:
+                self.conn.execute("UPDATE responses SET expires_at = ?, last_access = ? WHERE key = ?",
+                                  (now + self.ttl_for(key), now, key))
+
+    def _evict(self):
+        # Called under the lock and inside a transaction; least recently used first, only until back under the cap
+        while self._size > self.max_bytes:
+            rows = self.conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access LIMIT 32").fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if self._size <= self.max_bytes:
+                    break
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._size -= size
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "revalidated": self.revalidated,
+                "evictions": self.evictions, "entries": entries, "bytes": self._size}
+
+    def clear(self):
+        with self._lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM responses")
+            self._size = 0
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+class CachingTransport:
+    """
+    Wraps an HttpTransport with a ResponseCache; clients use it through the same get().
+
+    Stale entries are revalidated with If-None-Match / If-Modified-Since when upstream
+    gave an ETag or Last-Modified, and served as-is if the network is unreachable.
+    A request sent with "Cache-Control: no-cache" treats its entry as stale.
+    """
+
+    def __init__(self, cache: ResponseCache, transport: HttpTransport = None):
+        self.cache = cache
+        self.transport = transport or get_transport()
+
+    def get(self, url: str, params: Optional[dict] = None, headers: Optional[dict] = None,
+            timeout: Optional[Tuple[float, float]] = None) -> requests.Response:
+        key = cache_key(url, params)
+        entry = self.cache.lookup(key)
+        no_cache = "no-cache" in (headers or {}).get("Cache-Control", "")
+        if entry is not None and entry["fresh"] and not no_cache:
+            self.cache.hits += 1
+            return self._response(url, entry)
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry["etag"]:
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            response = self.transport.get(url, params=params, headers=request_headers, timeout=timeout)
+        except requests.RequestException:
+            if entry is None:
+                raise
+            print(f"Serving stale cached response for {key}")
+            self.cache.hits += 1
+            return self._response(url, entry)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.revalidated += 1
+            self.cache.refresh(key)
+            return self._response(url, entry)
+        self.cache.misses += 1
+        if response.status_code == 200 and "no-store" not in response.headers.get("Cache-Control", ""):
+            self.cache.store(key, response)
+        return response
+
+    def close(self):
+        self.cache.close()
+
+    @staticmethod
+    def _response(url: str, entry: dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = entry["body"]
+        response.encoding = "utf-8"
+        return response
+
+_shared = Shared(lambda: CachingTransport(ResponseCache(os.path.join(get_cache_dir(), "http_cache.db"))))
+
+def get_cached_transport() -> CachingTransport:
+    """Returns the process-wide caching transport the API clients use by default."""
+    return _shared.get()
@@ -0,0 +1,224 @@
+import asyncio
+import datetime
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+from PySide6.QtCore import QObject, Signal
+from cinescope.core.config import get_cache_dir
+from cinescope.core.id_index import IdIndex, get_id_index
+from cinescope.core.util import Shared, write_atomic
+from .async_clients import AsyncRunner, AsyncTVMazeClient, get_runner, report_errors
+
+# Statuses (TMDb production_status or TVMaze status) of shows that will not air anything new
+ENDED_STATUSES = {"Ended", "Canceled", "Cancelled"}
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+def refresh_interval(next_airdate: Optional[datetime.date], status: Optional[str]) -> Optional[float]:
+    """Seconds until a show's schedule is worth fetching again; None if it never is."""
+    if status in ENDED_STATUSES:
+        return None
+    if next_airdate is None:
+        # Nothing announced; running shows get dates weeks ahead, undecided ones rarely
+        return DAY if status == "Running" else 3 * DAY
+    days_away = (next_airdate - datetime.date.today()).days
+    if days_away <= 1:
+        return HOUR
+    # Check a few times before the airdate, and at least weekly
+    return min(7 * DAY, max(HOUR, days_away * DAY / 4))
+
+# Windows of TVMaze's updates/shows feed, smallest first
+UPDATE_WINDOWS = (("day", DAY), ("week", 7 * DAY), ("month", 30 * DAY))
+
+def update_window(age: float) -> Optional[str]:
+    """The smallest updates/shows window covering the last age seconds; None means the full feed."""
+    for since, seconds in UPDATE_WINDOWS:
+        if age < seconds:
+            return since
+    return None
+
+class CalendarService(QObject):
+    """
+    Keeps the upcoming-episode schedule of followed series, persisted between runs.
+
+    upcoming() answers from the stored schedule without touching the network;
+    refresh() syncs on the asyncio loop thread and emits show_updated for each show
+    as it lands. A sync polls TVMaze's updates/shows feed once and re-fetches only
+    the shows whose update timestamp moved; when the feed is unavailable it falls
+    back to each show's adaptive next-check time.
+    """
+    show_updated = Signal(int)  # TMDb id of the series
+    refresh_finished = Signal()
+
+    def __init__(self, path: str, tvmaze: AsyncTVMazeClient = None, id_index: IdIndex = None,
+                 runner: AsyncRunner = None):
+        super().__init__()
+        self.path = path
+        self.runner = runner or get_runner()
+        self.tvmaze = tvmaze or AsyncTVMazeClient(runner=self.runner)
+        self.id_index = id_index or get_id_index()
+        # TMDb id -> {"title", "show_id", "updated", "next_check", "episodes": [...], "failed"?};
+        # next_check None means never, failed marks an entry whose last fetch did not come through
+        self._shows: Dict[str, dict] = {}
+        self.synced_at: Optional[float] = None
+        self._refreshing: Optional[Future] = None
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self._shows = data.get("shows", {})
+                self.synced_at = data.get("synced_at")
+            except (json.JSONDecodeError, OSError, AttributeError) as e:
+                print(f"Ignoring unreadable calendar {path}: {e}")
+
+    def upcoming(self, series_list) -> List[dict]:
+        """Episodes airing from today on for the given series, by airdate, from the stored schedule."""
+        today = datetime.date.today().isoformat()
+        episodes = []
+        with self._lock:
+            for series in series_list:
+                entry = self._shows.get(str(series.id))
+                if entry:
+                    episodes.extend(episode for episode in entry["episodes"] if episode["airDate"] >= today)
+        episodes.sort(key=lambda episode: episode["airDate"])
+        return episodes
+
+    def is_refreshing(self) -> bool:
+        return self._refreshing is not None and not self._refreshing.done()
+
+    def refresh(self, series_list, force: bool = False) -> Optional[Future]:
+        """Starts a sync of the given series unless one is running; force re-fetches every show."""
+        if self.is_refreshing():
+            return None
+        series_list = [series for series in series_list if series.production_status not in ENDED_STATUSES]
+        if not series_list:
+            return None
+        self._refreshing = report_errors(self.runner.submit(self._refresh(series_list, force)), "calendar refresh")
+        return self._refreshing
+
+    async def _due(self, series_list, force: bool) -> list:
+        """Picks the series to fetch, asking the updates feed about the ones already stored."""
+        now = time.time()
+        with self._lock:
+            entries = {series.id: self._shows.get(str(series.id)) for series in series_list}
+        if force:
+            return series_list
+        known = [series for series in series_list if entries[series.id] is not None]
+        updates = None
+        # Ended shows are never polled again
+        if any(entries[series.id]["next_check"] is not None for series in known) and self.synced_at:
+            updates = await self.tvmaze.get_show_updates(update_window(now - self.synced_at))
+        if updates is not None:
+            self.synced_at = now
+        due = []
+        for series in series_list:
+            entry = entries[series.id]
+            if entry is None:
+                due.append(series)
+            elif entry["next_check"] is None:
+                continue
+            elif entry.get("failed"):
+                # The last fetch failed; the feed window has moved past the update that made it due
+                due.append(series)
+            elif updates is not None:
+                if updates.get(entry["show_id"], 0) > entry.get("updated", 0):
+                    due.append(series)
+            elif entry["next_check"] <= now:
+                due.append(series)
+        return due
+
+    async def _refresh(self, series_list, force: bool):
+        try:
+            first_sync = self.synced_at is None
+            due = await self._due(series_list, force)
+            await asyncio.gather(*(self._refresh_show(series, fresh=not first_sync) for series in due))
+            if first_sync:
+                self.synced_at = time.time()
+            self.id_index.save()
+            self.save()
+        finally:
+            self.refresh_finished.emit()
+
+    async def _refresh_show(self, series, fresh: bool):
+        show_id = await self._resolve_show_id(series)
+        if show_id is None:
+            return  # Try again on the next refresh
+        # A show the feed reported as changed must not come from the HTTP cache
+        show_info = await self.tvmaze.get_show_episodes(show_id, fresh)
+        if not show_info:
+            with self._lock:
+                entry = self._shows.get(str(series.id))
+                if entry is not None:
+                    # Keep the old schedule, but fetch again on the next refresh whatever the feed says
+                    entry["failed"] = True
+            return
+
+        today = datetime.date.today()
+        episodes = []
+        for episode in (show_info.get("_embedded") or {}).get("episodes") or []:
+            if not episode.get("airstamp"):
+                continue
+            airdate = datetime.datetime.fromisoformat(episode['airstamp']).date()
+            if airdate >= today:
+                episodes.append({
+                    'showId': show_id,
+                    'showTitle': series.title,
+                    'airDate': airdate.isoformat(),
+                    'episodeName': episode['name'],
+                    'episodeNumber': episode['number'],
+                    'seasonNumber': episode['season'],
+                    'episodeOverview': episode.get('summary', '')
+                })
+        episodes.sort(key=lambda episode: episode['airDate'])
+        next_airdate = datetime.date.fromisoformat(episodes[0]['airDate']) if episodes else None
+        status = series.production_status if series.production_status in ENDED_STATUSES else show_info.get("status")
+        interval = refresh_interval(next_airdate, status)
+        with self._lock:
+            self._shows[str(series.id)] = {
+                "title": series.title, "show_id": show_id, "updated": show_info.get("updated", 0),
+                "episodes": episodes,
+                "next_check": time.time() + interval if interval is not None else None,
+            }
+        self.show_updated.emit(series.id)
+
+    async def _resolve_show_id(self, series):
+        """Maps a series to its TVMaze id: from the id index, else by external id, else by title."""
+        for source, value in (("tmdb_tv", series.id), ("imdb", series.imdb_id), ("tvdb", series.tvdb_id)):
+            ids = self.id_index.lookup(source, value)
+            if ids and "tvmaze" in ids:
+                return ids["tvmaze"]
+
+        show = None
+        if series.imdb_id:
+            show = await self.tvmaze.lookup_show(imdb_id=series.imdb_id)
+        if show is None and series.tvdb_id:
+            show = await self.tvmaze.lookup_show(tvdb_id=series.tvdb_id)
+        if show is not None:
+            externals = show.get("externals") or {}
+            self.id_index.link(tmdb_tv=series.id, tvmaze=show["id"],
+                               imdb=externals.get("imdb") or series.imdb_id,
+                               tvdb=externals.get("thetvdb") or series.tvdb_id)
+            return show["id"]
+
+        # No external ids to go by; the first title match is a guess, so it is not remembered
+        search_results = await self.tvmaze.search_shows(series.title)
+        return search_results[0]['show']['id'] if search_results else None
+
+    def save(self):
+        with self._lock:
+            data = json.dumps({"synced_at": self.synced_at, "shows": self._shows}, separators=(",", ":"))
+        try:
+            write_atomic(self.path, lambda f: f.write(data))
+        except OSError as e:
+            print(f"Error writing calendar {self.path}: {e}")
+
+_shared = Shared(lambda: CalendarService(os.path.join(get_cache_dir(), "calendar.json")))
+
+def get_calendar_service() -> CalendarService:
+    """Returns the process-wide calendar service stored in the cache directory."""
+    return _shared.get()
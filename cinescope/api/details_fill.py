@@ -0,0 +1,25 @@
+from cinescope.core.media import Media
+from .library_repair import LibraryRepair
+
+def is_placeholder(media: Media) -> bool:
+    """
+    Whether the title is still the placeholder an add built from its search result.
+
+    Search results carry no production status and details responses always do, so the
+    stored entry itself records that its details never arrived, across restarts too.
+    """
+    return media.production_status is None
+
+class DetailsFill(LibraryRepair):
+    """
+    Fills in placeholders whose details request failed or was cut short by a quit.
+
+    A LibraryRepair narrowed to placeholders and read through the HTTP cache; titles
+    that still cannot be fetched stay placeholders and are tried again on the next start.
+    """
+    name = "details fill"
+    checkpoint_name = "details_checkpoint.jsonl"
+    fresh = False
+
+    def select(self, media: Media) -> bool:
+        return is_placeholder(media)
@@ -0,0 +1,94 @@
+import asyncio
+from typing import Dict, List, Optional
+from PySide6.QtCore import QObject, Signal
+from cinescope.core.media import EpisodeList, Media, SeasonProgress
+from .async_clients import AsyncRunner, AsyncTMDbClient, get_runner, report_errors
+from .calendar_service import ENDED_STATUSES
+from .tmdb_client import MAX_APPENDED, TMDbClient
+
+def seasons_to_fetch(media: Media) -> List[str]:
+    """Season numbers missing some of their episodes, plus the latest season while the show is still running."""
+    seasons = media.seasons or {}
+    numbers = [int(number) for number in seasons if number.isdigit()]
+    latest = max((number for number in numbers if number > 0), default=None)
+    airing = media.production_status not in ENDED_STATUSES
+    due = []
+    for number, season in seasons.items():
+        # A season TMDb lists with no episodes has nothing to fetch until its count goes up
+        if len(season.episodes or ()) < season.totalEpisodes:
+            due.append(number)
+        elif airing and number.isdigit() and int(number) == latest:
+            due.append(number)
+    return due
+
+def merge_seasons(seasons, fetched: Dict[str, SeasonProgress]) -> Dict[str, SeasonProgress]:
+    """Applies fetched seasons over the stored ones, keeping each season's watched count."""
+    merged = dict(seasons or {})
+    for number, season in fetched.items():
+        current = merged.get(number)
+        watched = min(current.episodesWatched, season.totalEpisodes) if current else 0
+        if current is not None and not season.episodes:
+            season.episodes = current.episodes  # Only the summary came back
+        merged[number] = SeasonProgress(watched, season.totalEpisodes, season.vote_average, season.episodes)
+    return merged
+
+class EpisodeService(QObject):
+    """
+    Fills in per-episode names and ratings of TV seasons from TMDb.
+
+    Seasons are appended to a tv/{id} details request MAX_APPENDED at a time, so a
+    30-season show costs two requests. Only seasons missing episodes and the latest
+    season of a running show are requested; ended seasons are fetched once.
+    """
+    episodes_ready = Signal(int, object)  # TMDb id, {season number: SeasonProgress} to merge_seasons()
+
+    def __init__(self, tmdb_client: TMDbClient, runner: AsyncRunner = None):
+        super().__init__()
+        self.runner = runner or get_runner()
+        self.tmdb = AsyncTMDbClient(tmdb_client, self.runner)
+        self._pending = set()
+
+    def enrich(self, media: Media) -> bool:
+        """Starts fetching the title's due seasons; returns False if none is due or a fetch is running."""
+        if media.type != 'series' or media.id in self._pending:
+            return False
+        due = seasons_to_fetch(media)
+        if not due:
+            return False
+        self._pending.add(media.id)
+        report_errors(self.runner.submit(self._enrich(media.id, due)), "episode enrichment")
+        return True
+
+    async def _enrich(self, tmdb_id: int, due: List[str]):
+        try:
+            fetched = await self.fetch(tmdb_id, due)
+        finally:
+            self._pending.discard(tmdb_id)
+        if fetched:
+            self.episodes_ready.emit(tmdb_id, fetched)
+
+    async def fetch(self, tmdb_id: int, season_numbers: List[str]) -> Optional[Dict[str, SeasonProgress]]:
+        """Fetches the given seasons, plus current summaries of every season; None if every request failed."""
+        chunks = [season_numbers[i:i + MAX_APPENDED] for i in range(0, len(season_numbers), MAX_APPENDED)]
+        responses = await asyncio.gather(*(self.tmdb.get_tv_seasons(tmdb_id, chunk) for chunk in chunks))
+        if not any(responses):
+            return None
+
+        fetched: Dict[str, SeasonProgress] = {}
+        summaries = next(data for data in responses if data).get("seasons") or []
+        for summary in summaries:
+            # Announced seasons show up here first; their episodes are fetched next time
+            fetched[str(summary["season_number"])] = SeasonProgress(
+                0, summary.get("episode_count") or 0, summary.get("vote_average", 0))
+        for data in responses:
+            for key, season_data in (data or {}).items():
+                if not key.startswith("season/") or not season_data:
+                    continue
+                number = key[len("season/"):]
+                episodes = EpisodeList.from_rows(
+                    (episode.get("episode_number"), episode.get("name"), episode.get("vote_average"))
+                    for episode in season_data.get("episodes") or [])
+                season = fetched.setdefault(number, SeasonProgress(0, len(episodes), season_data.get("vote_average", 0)))
+                season.episodes = episodes
+                season.totalEpisodes = max(season.totalEpisodes, len(episodes))
+        return fetched
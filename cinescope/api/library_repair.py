@@ -0,0 +1,146 @@
+import asyncio
+import os
+from typing import Dict, List, Optional, Tuple
+from PySide6.QtCore import QObject, Signal
+from cinescope.core.config import get_cache_dir
+from cinescope.core.data_manager import DataManager
+from cinescope.core.journal import ChangeJournal
+from cinescope.core.media import Media, SeasonProgress
+from cinescope.core.storage import to_plain
+from .async_clients import AsyncRunner, AsyncTMDbClient, HOST_LIMITS, get_runner, report_errors
+from .episode_service import merge_seasons
+from .tmdb_client import TMDbClient, media_fields
+
+# Fetched items are checkpointed in groups, so a crash loses at most this many requests
+CHECKPOINT_EVERY = 25
+
+class LibraryRepair(QObject):
+    """
+    Re-fetches every title in the list from TMDb, keeping the user's status and season progress.
+
+    Requests run on the asyncio loop thread through a fixed pool of workers, under the
+    TMDb host cap and the transport's rate limiter. Each fetched title is appended to a
+    checkpoint journal, so a run interrupted by a crash or quit resumes where it stopped.
+    Nothing touches the list until every title is in; the results are then applied in a
+    single DataManager batch.
+
+    Narrower passes subclass it and override select(), extract() and merge() to pick
+    which titles to fetch and which fields of the details to write back.
+    """
+    progress = Signal(int, int)  # titles fetched (including earlier runs), total
+    finished = Signal(int, int)  # titles updated, titles that could not be fetched
+    _fetched = Signal(list, int)  # checkpointed records, failures; hops to the GUI thread to apply
+
+    name = "library repair"
+    checkpoint_name = "repair_checkpoint.jsonl"
+    fresh = True  # Bypass the HTTP cache; stale details are what a repair is for
+
+    def __init__(self, data_manager: DataManager, tmdb_client: TMDbClient, checkpoint_path: str = None,
+                 concurrency: int = HOST_LIMITS["api.themoviedb.org"], runner: AsyncRunner = None):
+        super().__init__()
+        self.data_manager = data_manager
+        self.runner = runner or get_runner()
+        self.tmdb = AsyncTMDbClient(tmdb_client, self.runner)
+        self.checkpoint = ChangeJournal(checkpoint_path or os.path.join(get_cache_dir(), self.checkpoint_name))
+        self.concurrency = concurrency
+        self._task = None
+        self._cancelled = False
+        self._fetched.connect(self._apply)
+
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def select(self, media: Media) -> bool:
+        """Whether start() fetches the title."""
+        return True
+
+    def targets(self) -> List[Tuple[int, str]]:
+        return [(media.id, 'tv' if media.type == 'series' else 'movie')
+                for media in self.data_manager.get_list() if self.select(media)]
+
+    def extract(self, details: dict, media_type: str) -> Optional[dict]:
+        """The fields to checkpoint and write back from a details response; None to leave the title alone."""
+        changes = to_plain(media_fields(details, media_type))
+        del changes["id"]
+        return changes
+
+    def merge(self, media: Media, fields: dict) -> dict:
+        """Turns checkpointed fields into update_media_fields() changes, keeping the user's season progress."""
+        changes = dict(fields)
+        fetched = {number: SeasonProgress(**season) for number, season in (changes.pop("seasons") or {}).items()}
+        if media.type == 'series':
+            changes["seasons"] = merge_seasons(media.seasons, fetched)
+        return changes
+
+    def start(self) -> bool:
+        """Starts or resumes a pass over the selected titles; returns False if none is selected or one is running."""
+        if self.is_running():
+            return False
+        targets = self.targets()
+        if not targets:
+            return False
+        self._cancelled = False
+        os.makedirs(os.path.dirname(os.path.abspath(self.checkpoint.path)), exist_ok=True)
+        self._task = report_errors(self.runner.submit(self._run(targets)), self.name)
+        return True
+
+    def cancel(self):
+        """Stops after the requests in flight; what was fetched stays checkpointed for the next start()."""
+        self._cancelled = True
+
+    async def _run(self, targets):
+        records: Dict[int, dict] = {record["id"]: record for record in self.checkpoint.replay()}
+        queue: asyncio.Queue = asyncio.Queue()
+        for target in targets:
+            if target[0] not in records:
+                queue.put_nowait(target)
+        total = len(targets)
+        done = total - queue.qsize()
+        failed = 0
+        pending: List[dict] = []
+        self.progress.emit(done, total)
+
+        async def worker():
+            nonlocal done, failed
+            while not self._cancelled:
+                try:
+                    tmdb_id, media_type = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                details = await self.tmdb.get_details(media_type, tmdb_id, self.fresh)
+                fields = self.extract(details, media_type) if details else None
+                if not details:
+                    failed += 1
+                elif fields is not None:
+                    record = {"id": tmdb_id, "fields": fields}
+                    records[tmdb_id] = record
+                    pending.append(record)
+                    if len(pending) >= CHECKPOINT_EVERY:
+                        self._flush(pending)
+                done += 1
+                self.progress.emit(done, total)
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        self._flush(pending)
+        self.checkpoint.close()
+        if not self._cancelled:
+            self._fetched.emit(list(records.values()), failed)
+
+    def _flush(self, pending: List[dict]):
+        if pending:
+            self.checkpoint.append(pending)
+            pending.clear()
+
+    def _apply(self, records: List[dict], failed: int):
+        """Writes every fetched title back in one batch, then drops the checkpoint."""
+        updated = 0
+        with self.data_manager.batch():
+            for record in records:
+                media = self.data_manager.get_media_by_id(record["id"])
+                if media is None:
+                    continue  # Removed while the pass ran
+                self.data_manager.update_media_fields(media.id, self.merge(media, record["fields"]))
+                updated += 1
+        self.checkpoint.reset()
+        print(f"{self.name.capitalize()}: updated {updated} items; {failed} could not be fetched.")
+        self.finished.emit(updated, failed)
@@ -1,16 +1,19 @@
 import requests
+from .cache import get_cached_transport
+from .transport import HttpTransport
 
 BASE_URL = "https://www.omdbapi.com/"
 
 class OMDbClient:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, transport: HttpTransport = None):
         if not api_key: raise ValueError("An API key is required.")
         self.api_key = api_key
+        self.transport = transport or get_cached_transport()
 
     def search(self, query: str):
         params = {"s": query, "apikey": self.api_key}
         try:
-            response = requests.get(BASE_URL, params=params)
+            response = self.transport.get(BASE_URL, params=params)
             response.raise_for_status()
             data = response.json()
             if data.get("Response") == "True":
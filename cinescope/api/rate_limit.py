@@ -0,0 +1,190 @@
+import random
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+import requests
+
+@dataclass
+class RateLimit:
+    rate: float  # tokens per second
+    burst: int  # bucket capacity
+    max_concurrency: int = 8
+
+# Published or observed quotas per upstream host; unknown hosts are not limited
+RATE_LIMITS: Dict[str, RateLimit] = {
+    "api.themoviedb.org": RateLimit(rate=40, burst=40),
+    # 1000 calls per 5 minutes per key
+    "api.trakt.tv": RateLimit(rate=1000 / 300, burst=10, max_concurrency=4),
+    "www.omdbapi.com": RateLimit(rate=5, burst=10, max_concurrency=4),
+    # 20 calls per 10 seconds per IP
+    "api.tvmaze.com": RateLimit(rate=2, burst=20, max_concurrency=4),
+}
+
+# Where each API carries its key; buckets are kept per host and key
+KEY_PARAMS = ("api_key", "apikey")
+KEY_HEADERS = ("trakt-api-key",)
+
+# Statuses that mean "slow down" and are worth retrying
+THROTTLE_STATUSES = {429, 503}
+
+def api_key_of(params: Optional[dict], headers: Optional[dict]) -> Optional[str]:
+    for name in KEY_PARAMS:
+        if params and params.get(name):
+            return params[name]
+    for name in KEY_HEADERS:
+        if headers and headers.get(name):
+            return headers[name]
+    return None
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Parses a Retry-After header given as seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class _Bucket:
+    """Token bucket plus an adaptive cap on requests in flight, for one host and API key."""
+
+    def __init__(self, limit: RateLimit):
+        self.limit = limit
+        self.tokens = float(limit.burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.concurrency = limit.max_concurrency
+        self.in_flight = 0
+        self.successes = 0
+        self.last_decrease = 0.0
+        self.stats = {"requests": 0, "throttled": 0, "retries": 0, "errors": 0, "wait_seconds": 0.0}
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        """Blocks until a slot and a token are available."""
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.limit.burst, self.tokens + (now - self.updated) * self.limit.rate)
+                self.updated = now
+                if self.in_flight < self.concurrency and now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    self.in_flight += 1
+                    self.stats["requests"] += 1
+                    return
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.tokens < 1:
+                    wait = (1 - self.tokens) / self.limit.rate
+                else:
+                    wait = None  # Woken by release()
+                started = time.monotonic()
+                self.condition.wait(wait)
+                self.stats["wait_seconds"] += time.monotonic() - started
+
+    def release(self, failed: bool, pause: float = 0.0):
+        with self.condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if pause:
+                self.paused_until = max(self.paused_until, now + pause)
+            if failed:
+                self.stats["errors"] += 1
+                self.successes = 0
+                # Multiplicative decrease, at most once per second so one burst of failures counts once
+                if now - self.last_decrease >= 1.0:
+                    self.concurrency = max(1, self.concurrency // 2)
+                    self.last_decrease = now
+            else:
+                self.successes += 1
+                # Additive increase after a full window of successes
+                if self.successes >= self.concurrency and self.concurrency < self.limit.max_concurrency:
+                    self.concurrency += 1
+                    self.successes = 0
+            self.condition.notify_all()
+
+class RateLimiter:
+    """
+    Per-host (and per-API-key) token buckets with 429/503 retries and adaptive concurrency.
+
+    Throttled responses are retried after Retry-After when upstream sends it, otherwise
+    after an exponential backoff with full jitter. Throttles and server errors halve
+    the host's concurrency; it grows back one slot per window of successes.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, RateLimit]] = None,
+                 key_limits: Optional[Dict[str, RateLimit]] = None,
+                 max_retries: int = 3, backoff_base: float = 0.5, max_backoff: float = 30.0):
+        self.limits = dict(RATE_LIMITS if limits is None else limits)
+        # Overrides for specific API keys, e.g. a paid OMDb key
+        self.key_limits = dict(key_limits or {})
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self._buckets: Dict[tuple, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str, api_key: Optional[str]) -> Optional[_Bucket]:
+        limit = self.key_limits.get(api_key) or self.limits.get(host)
+        if limit is None:
+            return None
+        with self._lock:
+            bucket = self._buckets.get((host, api_key))
+            if bucket is None:
+                bucket = self._buckets[(host, api_key)] = _Bucket(limit)
+            return bucket
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.backoff_base * 2 ** attempt))
+
+    def call(self, host: str, api_key: Optional[str], send: Callable[[], requests.Response]) -> requests.Response:
+        """Sends a request through the host's bucket, retrying throttled responses."""
+        bucket = self._bucket(host, api_key)
+        if bucket is None:
+            return send()
+        attempt = 0
+        while True:
+            bucket.acquire()
+            try:
+                response = send()
+            except requests.RequestException:
+                bucket.release(failed=True)
+                raise
+            if response.status_code not in THROTTLE_STATUSES:
+                bucket.release(failed=response.status_code >= 500)
+                return response
+
+            delay = retry_after_seconds(response)
+            if delay is None:
+                delay = self.backoff(attempt)
+            # Everyone on this host waits out a Retry-After, not just this request
+            bucket.release(failed=True, pause=delay)
+            with bucket.condition:
+                bucket.stats["throttled"] += 1
+            if attempt >= self.max_retries or delay > self.max_backoff:
+                return response
+            attempt += 1
+            with bucket.condition:
+                bucket.stats["retries"] += 1
+            time.sleep(delay)
+
+    def stats(self) -> Dict[str, dict]:
+        """Throttle statistics per host (summed over API keys)."""
+        result: Dict[str, dict] = {}
+        with self._lock:
+            buckets = list(self._buckets.items())
+        for (host, _), bucket in buckets:
+            with bucket.condition:
+                totals = result.setdefault(host, {"requests": 0, "throttled": 0, "retries": 0, "errors": 0,
+                                                  "wait_seconds": 0.0, "concurrency": 0})
+                for name, value in bucket.stats.items():
+                    totals[name] += value
+                totals["concurrency"] += bucket.concurrency
+        return result
@@ -0,0 +1,54 @@
+from typing import Optional
+from cinescope.core.media import Media, MediaStatus
+from .library_repair import LibraryRepair
+
+# Only these statuses add to the watch time, so only their runtimes are worth a request
+COUNTED_STATUSES = (MediaStatus.WATCHING, MediaStatus.COMPLETED)
+
+def missing_runtime(media: Media) -> bool:
+    """Whether the title counts towards watch time but has no runtime to count it with."""
+    if media.status not in COUNTED_STATUSES:
+        return False
+    if media.type == 'movie':
+        return not media.runtime
+    return not media.episode_run_time
+
+def runtime_fields(data: dict, media_type: str) -> Optional[dict]:
+    """The runtime fields of a TMDb details response; None if TMDb does not know them either."""
+    if media_type == 'movie':
+        return {"runtime": data["runtime"]} if data.get("runtime") else None
+    run_time = data.get("episode_run_time")
+    if not run_time:
+        # TMDb leaves episode_run_time empty for many shows; an episode's runtime is the next best thing
+        episode = data.get("last_episode_to_air") or data.get("next_episode_to_air") or {}
+        run_time = [episode["runtime"]] if episode.get("runtime") else None
+    return {"episode_run_time": run_time} if run_time else None
+
+class RuntimeBackfill(LibraryRepair):
+    """
+    Fills in missing movie and episode runtimes, which the watch-time statistic depends on.
+
+    A LibraryRepair narrowed to counted titles without a runtime and to the runtime
+    fields, read through the HTTP cache. Titles TMDb answered without a runtime are not
+    asked about again in this session; failed requests are retried on the next start().
+    """
+    name = "runtime backfill"
+    checkpoint_name = "runtime_checkpoint.jsonl"
+    fresh = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Titles TMDb has answered for without a runtime
+        self._unknown = set()
+
+    def select(self, media: Media) -> bool:
+        return media.id not in self._unknown and missing_runtime(media)
+
+    def extract(self, details: dict, media_type: str) -> Optional[dict]:
+        fields = runtime_fields(details, media_type)
+        if fields is None:
+            self._unknown.add(details["id"])
+        return fields
+
+    def merge(self, media: Media, fields: dict) -> dict:
+        return fields
@@ -0,0 +1,84 @@
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Optional
+from .tmdb_client import is_last_page
+
+# Result fields a title query is matched against when filtering locally
+TITLE_FIELDS = ("title", "name", "original_title", "original_name")
+
+def fold(text: str) -> str:
+    """Casefolds and strips accents, the way TMDb matches 'amelie' to 'Amélie'."""
+    return "".join(char for char in unicodedata.normalize("NFKD", text.casefold())
+                   if not unicodedata.combining(char))
+
+def normalize_query(query: str) -> str:
+    return " ".join(fold(query).split())
+
+def matches(result: dict, query: str) -> bool:
+    """Whether every word of a normalized query occurs in one of the result's titles."""
+    titles = fold(" ".join(result.get(name) or "" for name in TITLE_FIELDS))
+    return all(word in titles for word in query.split())
+
+@dataclass(slots=True)
+class CachedSearch:
+    results: List[dict] = field(default_factory=list)
+    next_page: int = 1
+    complete: bool = False
+
+class SearchCache:
+    """
+    LRU of recent search queries and the TMDb results loaded for each so far.
+
+    A query that extends a cached one whose every page is loaded is answered by
+    filtering that superset, without asking TMDb. Used from the GUI thread only.
+    """
+
+    def __init__(self, capacity: int = 32):
+        self.capacity = capacity
+        self._entries: "OrderedDict[str, CachedSearch]" = OrderedDict()
+
+    def get(self, query: str) -> Optional[CachedSearch]:
+        query = normalize_query(query)
+        entry = self._entries.get(query)
+        if entry is not None:
+            self._entries.move_to_end(query)
+        return entry
+
+    def narrow(self, query: str) -> Optional[CachedSearch]:
+        """
+        Filters the longest complete cached prefix of query down to its matches.
+
+        Returns None when nothing matches: TMDb's own matching is fuzzier than this filter,
+        so an empty result is not trusted and the query goes to TMDb instead.
+        """
+        query = normalize_query(query)
+        prefixes = [cached for cached, entry in self._entries.items()
+                    if entry.complete and query.startswith(cached)]
+        if not prefixes:
+            return None
+        superset = self._entries[max(prefixes, key=len)]
+        entry = CachedSearch([result for result in superset.results if matches(result, query)], complete=True)
+        if not entry.results:
+            return None
+        self._put(query, entry)
+        return entry
+
+    def add_page(self, query: str, data: dict) -> CachedSearch:
+        """Records the next page of a query's results; pages arriving out of order are ignored."""
+        query = normalize_query(query)
+        entry = self._entries.get(query)
+        if entry is None:
+            entry = CachedSearch()
+            self._put(query, entry)
+        if data.get("page", 1) == entry.next_page and not entry.complete:
+            entry.results.extend(data.get("results", []))
+            entry.next_page += 1
+            entry.complete = is_last_page(data)
+        return entry
+
+    def _put(self, query: str, entry: CachedSearch):
+        self._entries[query] = entry
+        self._entries.move_to_end(query)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
@@ -1,13 +1,50 @@
+from typing import Iterator
 import requests
+from cinescope.core.media import SeasonProgress
+from .cache import get_cached_transport
+from .transport import HttpTransport
 
 BASE_URL = "https://api.themoviedb.org/3"
 
+# TMDb rejects page numbers past 500
+MAX_PAGES = 500
+# Sub-requests TMDb accepts in one append_to_response
+MAX_APPENDED = 20
+
+def is_last_page(data: dict) -> bool:
+    """Whether a paged TMDb response has no page after it."""
+    return data.get("page", 1) >= min(data.get("total_pages", 1), MAX_PAGES)
+
+def media_fields(data: dict, media_type: str) -> dict:
+    """Maps a TMDb details response (or the subset in a search result) to Media constructor arguments, minus status."""
+    external_ids = data.get("external_ids") or {}
+    seasons = {}
+    for season in data.get("seasons") or []:
+        seasons[str(season['season_number'])] = SeasonProgress(
+            episodesWatched=0,
+            totalEpisodes=season['episode_count'],
+            vote_average=season.get('vote_average', 0)
+        )
+    return dict(
+        id=data["id"], title=data.get("title") or data.get("name"),
+        year=str(data.get("release_date") or data.get("first_air_date") or "").split('-')[0],
+        type='series' if media_type == 'tv' else 'movie', poster_path=data.get("poster_path"),
+        plot=data.get("overview"), vote_average=data.get("vote_average"),
+        genres=data.get("genres", []),
+        imdb_id=external_ids.get("imdb_id"), tvdb_id=external_ids.get("tvdb_id"), runtime=data.get("runtime"),
+        episode_run_time=data.get("episode_run_time"),
+        number_of_seasons=data.get("number_of_seasons"),
+        production_status=data.get("status"),
+        seasons=seasons
+    )
+
 class TMDbClient:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, transport: HttpTransport = None):
         if not api_key: raise ValueError("An API key is required.")
         self.api_key = api_key
+        self.transport = transport or get_cached_transport()
 
-    def _make_request(self, endpoint, params=None):
+    def _make_request(self, endpoint, params=None, headers=None):
         """Helper function to make requests and handle errors."""
         if params is None:
             params = {}
@@ -15,20 +52,43 @@ class TMDbClient:
         params["api_key"] = self.api_key
 
         try:
-            response = requests.get(f"{BASE_URL}/{endpoint}", params=params)
+            response = self.transport.get(f"{BASE_URL}/{endpoint}", params=params, headers=headers)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
             print(f"An error occurred with TMDb API ({endpoint}): {e}")
             return None
 
-    def search_multi(self, query: str):
-        return self._make_request("search/multi", {"query": query, "include_adult": False})
+    def search_multi(self, query: str, page: int = 1):
+        return self._make_request("search/multi", {"query": query, "include_adult": False, "page": page})
+
+    def search_multi_pages(self, query: str, start_page: int = 1) -> Iterator[dict]:
+        """
+        Yields search/multi responses a page at a time; each page is requested only when the next one is asked for.
+
+        Iteration stops after the last page or at the first failed request.
+        """
+        page = start_page
+        while True:
+            data = self.search_multi(query, page)
+            if not data:
+                return
+            yield data
+            if is_last_page(data):
+                return
+            page += 1
 
     def find_by_imdb_id(self, imdb_id: str):
         return self._make_request(f"find/{imdb_id}", {"external_source": "imdb_id"})
 
-    def get_details(self, media_type: str, tmdb_id: int):
-        # 'movie' or 'tv'
+    def get_details(self, media_type: str, tmdb_id: int, fresh: bool = False):
+        # 'movie' or 'tv'; TV details already list every season's summary, so one request covers an add
         endpoint = f"{media_type}/{tmdb_id}"
-        return self._make_request(endpoint, {"append_to_response": "external_ids"})
\ No newline at end of file
+        # fresh revalidates instead of trusting a cached copy that has not expired yet
+        headers = {"Cache-Control": "no-cache"} if fresh else None
+        return self._make_request(endpoint, {"append_to_response": "external_ids"}, headers)
+
+    def get_tv_seasons(self, tmdb_id: int, season_numbers):
+        """TV details with up to MAX_APPENDED seasons' episodes appended, under "season/<n>" keys."""
+        appended = ",".join(f"season/{number}" for number in season_numbers)
+        return self._make_request(f"tv/{tmdb_id}", {"append_to_response": appended})
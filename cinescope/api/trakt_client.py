@@ -1,12 +1,15 @@
 import requests
+from .cache import get_cached_transport
+from .transport import HttpTransport
 
 BASE_URL = "https://api.trakt.tv"
 
 class TraktClient:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, transport: HttpTransport = None):
         if not api_key:
             raise ValueError("A Trakt.tv API key is required.")
         self.api_key = api_key
+        self.transport = transport or get_cached_transport()
         self.headers = {
             "Content-Type": "application/json",
             "trakt-api-version": "2",
@@ -27,7 +30,7 @@ class TraktClient:
 
     def _make_request(self, endpoint):
         try:
-            response = requests.get(f"{BASE_URL}{endpoint}", headers=self.headers)
+            response = self.transport.get(f"{BASE_URL}{endpoint}", headers=self.headers)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
@@ -0,0 +1,89 @@
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from cinescope.core.util import Shared
+from .rate_limit import RateLimiter, api_key_of
+
+# (connect, read) seconds
+DEFAULT_TIMEOUT = (3.05, 10)
+
+# Per-endpoint timeouts, matched by the longest "host/path" prefix of the request URL
+ENDPOINT_TIMEOUTS: Dict[str, Tuple[float, float]] = {
+    "api.themoviedb.org/3/search/": (3.05, 5),
+    "www.omdbapi.com": (3.05, 5),
+    "api.tvmaze.com/search/": (3.05, 5),
+    # Shows embedded with every episode can be large
+    "api.tvmaze.com/shows/": (3.05, 20),
+    "image.tmdb.org": (3.05, 15),
+}
+
+# Posters are fetched by several QThreadPool workers at once
+POOL_SIZES: Dict[str, int] = {"image.tmdb.org": 16}
+
+class HttpTransport:
+    """
+    Keep-alive HTTP sessions shared by every API client, one connection pool per host.
+
+    Clients take a transport argument, so tests can pass any object with the same
+    get() signature instead of going to the network. Every request goes through the
+    limiter, which paces it per host and API key and retries 429/503 responses.
+    """
+
+    def __init__(self, pool_size: int = 8, pool_sizes: Optional[Dict[str, int]] = None,
+                 timeouts: Optional[Dict[str, Tuple[float, float]]] = None,
+                 default_timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+                 limiter: RateLimiter = None):
+        self.pool_size = pool_size
+        self.pool_sizes = dict(POOL_SIZES if pool_sizes is None else pool_sizes)
+        self.timeouts = dict(ENDPOINT_TIMEOUTS if timeouts is None else timeouts)
+        self.default_timeout = default_timeout
+        self.limiter = limiter or RateLimiter()
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def session(self, url: str) -> requests.Session:
+        """Returns the pooled session for the URL's host, creating it on first use."""
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}"
+        session = self._sessions.get(key)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(key)
+                if session is None:
+                    size = self.pool_sizes.get(parts.hostname, self.pool_size)
+                    session = requests.Session()
+                    session.mount(key, HTTPAdapter(pool_connections=1, pool_maxsize=size))
+                    self._sessions[key] = session
+        return session
+
+    def timeout_for(self, url: str) -> Tuple[float, float]:
+        parts = urlsplit(url)
+        target = f"{parts.hostname}{parts.path}"
+        matches = [prefix for prefix in self.timeouts if target.startswith(prefix)]
+        return self.timeouts[max(matches, key=len)] if matches else self.default_timeout
+
+    def get(self, url: str, params: Optional[dict] = None, headers: Optional[dict] = None,
+            timeout: Optional[Tuple[float, float]] = None) -> requests.Response:
+        """GETs a URL over the host's pooled connection; raises requests.RequestException on failure."""
+        session = self.session(url)
+        timeout = timeout or self.timeout_for(url)
+        return self.limiter.call(urlsplit(url).hostname, api_key_of(params, headers),
+                                 lambda: session.get(url, params=params, headers=headers, timeout=timeout))
+
+    def close(self):
+        for host, stats in self.limiter.stats().items():
+            if stats["throttled"]:
+                print(f"{host}: {stats['throttled']} throttled responses, {stats['retries']} retries, "
+                      f"{stats['wait_seconds']:.1f}s spent waiting")
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            session.close()
+
+_shared = Shared(HttpTransport)
+
+def get_transport() -> HttpTransport:
+    """Returns the process-wide transport the clients use when none is passed in."""
+    return _shared.get()
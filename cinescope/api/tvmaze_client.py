@@ -1,22 +1,54 @@
 import requests
+from .cache import get_cached_transport
+from .transport import HttpTransport
 
 BASE_URL = "https://api.tvmaze.com"
 
 class TVMazeClient:
+    def __init__(self, transport: HttpTransport = None):
+        self.transport = transport or get_cached_transport()
+
     def search_shows(self, query: str):
         try:
-            response = requests.get(f"{BASE_URL}/search/shows", params={"q": query})
+            response = self.transport.get(f"{BASE_URL}/search/shows", params={"q": query})
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
             print(f"An error occurred with TVMaze API (search/shows): {e}")
             return None
 
-    def get_show_episodes(self, show_id: int):
+    def lookup_show(self, imdb_id: str = None, tvdb_id: int = None):
+        """Finds a show by its IMDb or TheTVDB id; None if TVMaze does not list it."""
+        params = {"imdb": imdb_id} if imdb_id else {"thetvdb": tvdb_id}
+        try:
+            # TVMaze answers with a redirect to the show, which requests follows
+            response = self.transport.get(f"{BASE_URL}/lookup/shows", params=params)
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            return response.json()
+        except requests.RequestException as e:
+            print(f"An error occurred with TVMaze API (lookup/shows): {e}")
+            return None
+
+    def get_show_episodes(self, show_id: int, fresh: bool = False):
+        """Fetches a show with all its episodes; fresh skips a cached copy that has not expired yet."""
+        headers = {"Cache-Control": "no-cache"} if fresh else None
         try:
-            response = requests.get(f"{BASE_URL}/shows/{show_id}?embed=episodes")
+            response = self.transport.get(f"{BASE_URL}/shows/{show_id}", params={"embed": "episodes"},
+                                          headers=headers)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
             print(f"An error occurred with TVMaze API (shows/{show_id}): {e}")
             return None
+
+    def get_show_updates(self, since: str = None):
+        """Returns {show id: last update timestamp}; since is "day", "week" or "month", None for all shows."""
+        try:
+            response = self.transport.get(f"{BASE_URL}/updates/shows", params={"since": since} if since else None)
+            response.raise_for_status()
+            return {int(show_id): timestamp for show_id, timestamp in response.json().items()}
+        except requests.RequestException as e:
+            print(f"An error occurred with TVMaze API (updates/shows): {e}")
+            return None
@@ -0,0 +1,188 @@
+import ast
+import itertools
+import typing
+from dataclasses import MISSING, fields, is_dataclass
+from enum import Enum
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Tuple
+from .media import Media
+
+def _unwrap_optional(tp):
+    if typing.get_origin(tp) is typing.Union:
+        args = [arg for arg in typing.get_args(tp) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return tp
+
+def enum_lookup(enum_cls) -> dict:
+    """Maps stored values, member names and legacy str(member) forms straight to members."""
+    lookup = {}
+    for name, member in enum_cls.__members__.items():
+        lookup[member.value] = member
+        lookup[name] = member
+        # Older files stored str(member), e.g. "MediaStatus.WATCHING"
+        lookup[f"{enum_cls.__name__}.{name}"] = member
+        lookup[member] = member
+    return lookup
+
+def parse_repr(text: str) -> Optional[dict]:
+    """
+    Reads a dataclass repr(), e.g. "SeasonProgress(episodesWatched=4, ...)", back into plain dicts.
+
+    The original save_list() wrote seasons with json.dump(default=str), so existing files
+    hold them as repr() strings. Returns None for anything that is not such a repr.
+    """
+    try:
+        node = ast.parse(text, mode="eval").body
+        return _plain_node(node) if isinstance(node, ast.Call) else None
+    except (SyntaxError, ValueError):
+        return None
+
+def _plain_node(node):
+    if isinstance(node, ast.Call):
+        if node.args or any(keyword.arg is None for keyword in node.keywords):
+            raise ValueError("not a dataclass repr")
+        return {keyword.arg: _plain_node(keyword.value) for keyword in node.keywords}
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return [_plain_node(item) for item in node.elts]
+    return ast.literal_eval(node)
+
+def readable_items(mapping: dict, decode: Callable = None):
+    """A stored mapping's items with repr() strings decoded back; unreadable ones are dropped."""
+    for key, value in mapping.items():
+        if type(value) is str:
+            plain = parse_repr(value)
+            if plain is None or decode is None:
+                continue
+            try:
+                value = decode(plain)
+            except (KeyError, TypeError, ValueError):
+                continue
+        yield key, value
+
+class _CodecBuilder:
+    """
+    Generates one decode and one encode function per dataclass from its field types.
+
+    The functions are compiled from source once, so the per-item work is plain
+    attribute and dict access with no reflection over fields or type hints.
+    """
+
+    def __init__(self):
+        self.codecs: Dict[type, Tuple[Callable, Callable]] = {}
+        self._names = itertools.count()
+
+    def build(self, cls):
+        if cls not in self.codecs:
+            self.codecs[cls] = self._compile(cls)
+        return self.codecs[cls]
+
+    def _decode_expr(self, tp, var: str, namespace: dict) -> str | None:
+        """Source expression decoding `var` into `tp`, or None when the raw value is already right."""
+        tp = _unwrap_optional(tp)
+        origin = typing.get_origin(tp)
+        if isinstance(tp, type) and hasattr(tp, "from_plain"):
+            # Types with their own packed representation (e.g. EpisodeList) convert themselves
+            name = f"_type{next(self._names)}"
+            namespace[name] = tp
+            return f"{name}.from_plain({var})"
+        if isinstance(tp, type) and issubclass(tp, Enum):
+            name = f"_enum{next(self._names)}"
+            namespace[name] = enum_lookup(tp)
+            return f"{name}[{var}]"
+        if is_dataclass(tp):
+            name = f"_dec{next(self._names)}"
+            namespace[name] = self.build(tp)[0]
+            namespace[f"{name}_cls"] = tp
+            return f"({var} if type({var}) is {name}_cls else {name}({var}))"
+        if origin is list:
+            (item_tp,) = typing.get_args(tp) or (Any,)
+            item = self._decode_expr(item_tp, "x", namespace)
+            return f"[{item} for x in {var}]" if item else f"list({var})"
+        if origin is dict:
+            _, value_tp = typing.get_args(tp) or (Any, Any)
+            value = self._decode_expr(value_tp, "v", namespace)
+            if value:
+                # Legacy repr() strings are parsed back (see parse_repr);
+                # lazy mappings (see lazy_seasons) are not plain dicts and pass through untouched
+                name = f"_legacy{next(self._names)}"
+                value_tp = _unwrap_optional(value_tp)
+                legacy_decode = self.build(value_tp)[0] if is_dataclass(value_tp) else None
+                namespace[name] = partial(readable_items, decode=legacy_decode)
+                return (f"({{str(k): {value} for k, v in {name}({var})}} "
+                        f"if type({var}) is dict or not hasattr({var}, 'to_plain') else {var})")
+            return f"dict({var})"
+        return None
+
+    def _encode_expr(self, tp, var: str, namespace: dict) -> str | None:
+        tp = _unwrap_optional(tp)
+        origin = typing.get_origin(tp)
+        if isinstance(tp, type) and hasattr(tp, "from_plain"):
+            return f"{var}.to_plain()"
+        if isinstance(tp, type) and issubclass(tp, Enum):
+            return f"{var}.value"
+        if is_dataclass(tp):
+            name = f"_enc{next(self._names)}"
+            namespace[name] = self.build(tp)[1]
+            return f"{name}({var})"
+        if origin is list:
+            (item_tp,) = typing.get_args(tp) or (Any,)
+            item = self._encode_expr(item_tp, "x", namespace)
+            return f"[{item} for x in {var}]" if item else f"list({var})"
+        if origin is dict:
+            _, value_tp = typing.get_args(tp) or (Any, Any)
+            value = self._encode_expr(value_tp, "v", namespace)
+            if value:
+                # Lazy mappings encode themselves and may stay packed
+                return f"({var}.to_plain() if type({var}) is not dict else {{k: {value} for k, v in {var}.items()}})"
+            return f"dict({var})"
+        return None
+
+    def _compile(self, cls):
+        hints = typing.get_type_hints(cls)
+        namespace = {"_cls": cls}
+        decode_lines, args, items = [], [], []
+        for f in fields(cls):
+            var = f"v_{f.name}"
+            decode = self._decode_expr(hints[f.name], var, namespace)
+            if f.default is MISSING and f.default_factory is MISSING:
+                decode_lines.append(f"    {var} = d[{f.name!r}]")
+                fallback = None
+            elif f.default_factory is not MISSING:
+                namespace[f"_factory_{f.name}"] = f.default_factory
+                fallback = f"_factory_{f.name}()"
+            else:
+                namespace[f"_default_{f.name}"] = f.default
+                fallback = f"_default_{f.name}"
+            if fallback is not None:
+                decode_lines.append(f"    {var} = get({f.name!r})")
+            if fallback is not None and (decode or f.default is not None):
+                # Missing or null: fall back to the dataclass default
+                decode_lines.append(f"    {var} = {fallback} if {var} is None else {decode or var}")
+            elif decode:
+                decode_lines.append(f"    {var} = None if {var} is None else {decode}")
+            args.append(var)
+
+            encode = self._encode_expr(hints[f.name], f"o.{f.name}", namespace)
+            if encode:
+                encode = f"None if o.{f.name} is None else {encode}"
+            items.append(f"{f.name!r}: {encode or f'o.{f.name}'}")
+
+        source = "\n".join([
+            "def decode(d):",
+            "    get = d.get",
+            *decode_lines,
+            f"    return _cls({', '.join(args)})",
+            "def encode(o):",
+            f"    return {{{', '.join(items)}}}",
+        ])
+        exec(compile(source, f"<codec {cls.__name__}>", "exec"), namespace)
+        return namespace["decode"], namespace["encode"]
+
+_builder = _CodecBuilder()
+
+def compile_codec(cls) -> Tuple[Callable[[dict], Any], Callable[[Any], dict]]:
+    """Returns the generated (decode, encode) pair for a dataclass, building it on first use."""
+    return _builder.build(cls)
+
+decode_media, encode_media = compile_codec(Media)
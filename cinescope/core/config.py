@@ -1,18 +1,33 @@
 import os
 from dotenv import load_dotenv
 
+# The project root directory, where .env and the default cache directory live
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+def _load_env():
+    load_dotenv(dotenv_path=os.path.join(PROJECT_DIR, '.env'))
+
 def get_api_keys():
     """
     Loads API keys from the .env file in the project root.
     """
-    # The path to the project root directory
-    project_dir = os.path.join(os.path.dirname(__file__), '..', '..')
-    dotenv_path = os.path.join(project_dir, '.env')
-
-    load_dotenv(dotenv_path=dotenv_path)
-
+    _load_env()
     return {
         "tmdb": os.getenv("TMDB_API_KEY"),
         "omdb": os.getenv("OMDB_API_KEY"),
         "trakt": os.getenv("TRAKT_API_KEY"),
-    }
\ No newline at end of file
+    }
+
+def get_storage_backend():
+    """
+    Returns the DataManager storage backend ('json', 'compact' or 'sqlite') chosen in the .env file.
+    """
+    _load_env()
+    return os.getenv("CINESCOPE_STORAGE", "json").lower()
+
+def get_cache_dir():
+    """
+    Returns the directory for on-disk caches (CINESCOPE_CACHE_DIR, default .cache in the project root).
+    """
+    _load_env()
+    return os.getenv("CINESCOPE_CACHE_DIR", os.path.join(PROJECT_DIR, '.cache'))
@@ -1,13 +1,31 @@
 import json
 import os
-from typing import List, Set
+from contextlib import contextmanager
+from dataclasses import fields
+from enum import Enum
+from typing import Dict, List, Set
 from PySide6.QtCore import QObject, Signal
-from .media import Media, MediaStatus
+from .codec import decode_media, encode_media
+from .lazy_seasons import LazySeasons, SeasonCache, season_totals
+from .media import Media, MediaStatus, intern_genre
+from .storage import CompactStorage, JsonStorage, SqliteStorage, StorageBackend, migrate_json_to_sqlite, plain_default, to_plain
+
+def _status_key(status) -> str:
+    """Normalizes a MediaStatus or its stored string form to the status index key."""
+    return status.value if isinstance(status, Enum) else status
 
 class DataManager(QObject):
+    # Emitted after any change; the granular signals below say what changed
     list_updated = Signal()
+    item_added = Signal(int)
+    item_removed = Signal(int)
+    item_changed = Signal(int, list)  # media id, names of the changed fields
+    # Emitted once per batch instead of the per-item signals: {media id: names of the changed fields},
+    # or None instead of the names for items the batch added or removed
+    bulk_changed = Signal(object)
 
-    def __init__(self, filename="my_list.json"):
+    def __init__(self, filename="my_list.json", journaled=True, backend="json", save_delay_ms=500,
+                 storage: StorageBackend = None, season_cache_size=32):
         super().__init__()
         # The file will be stored in the project root (C:\media app)
         self.filepath = os.path.abspath(os.path.join(
@@ -15,42 +33,236 @@ class DataManager(QObject):
         ))
         self.my_list: List[Media] = []
         self.my_list_ids: Set[int] = set()
+        # Primary-key and facet indexes, kept in step with every mutation
+        self._by_id: Dict[int, Media] = {}
+        self._by_status: Dict[str, Dict[int, Media]] = {}
+        self._by_type: Dict[str, Dict[int, Media]] = {}
+        self._by_genre: Dict[int, Dict[int, Media]] = {}
+        # Ascending with list position (adds append, removes keep the order), so query() can return list order
+        self._order: Dict[int, int] = {}
+        self._next_order = 0
+        # Plain-dict encodings per id, dropped on mutation, so snapshots only re-encode changed items
+        self._plain: Dict[int, dict] = {}
+        # Change records collected while a batch() is open, None otherwise
+        self._batch: List[dict] | None = None
+        # Materialized season details; the least recently opened titles are packed away again
+        self.season_cache = SeasonCache(season_cache_size)
+        self.storage = storage or self._create_storage(backend, journaled, save_delay_ms)
         self.load_list()
 
+    def _create_storage(self, backend: str, journaled: bool, save_delay_ms: int) -> StorageBackend:
+        if backend == "sqlite":
+            db_path = os.path.splitext(self.filepath)[0] + ".db"
+            if not os.path.exists(db_path):
+                # First run on SQLite: import the existing JSON list once, leaving the files untouched
+                migrate_json_to_sqlite(self.filepath, db_path)
+            return SqliteStorage(db_path)
+        if backend == "compact":
+            return CompactStorage(self.filepath, journaled=journaled, save_delay_ms=save_delay_ms)
+        return JsonStorage(self.filepath, journaled=journaled, save_delay_ms=save_delay_ms)
+
     def load_list(self):
-        """Loads the media list from the JSON file if it exists."""
+        """Loads the media list from storage."""
         try:
-            if os.path.exists(self.filepath):
-                with open(self.filepath, 'r') as f:
-                    # We need to reconstruct the list of Media objects
-                    data = json.load(f)
-                    self.my_list = [Media(**item) for item in data]
-                    self.my_list_ids = {item.id for item in self.my_list}
-                    print(f"Loaded {len(self.my_list)} items from {self.filepath}")
-        except (json.JSONDecodeError, TypeError) as e:
+            self.my_list = self.storage.load()
+            self.my_list_ids = {item.id for item in self.my_list}
+        except (json.JSONDecodeError, TypeError, KeyError, ValueError) as e:
             print(f"Error loading or parsing {self.filepath}: {e}")
             self.my_list = []
             self.my_list_ids = set()
+        self._plain = {}
+        self._rebuild_indexes()
+        for media in self.my_list:
+            self.season_cache.attach(media.seasons)
+
+    def _rebuild_indexes(self):
+        self._by_id = {}
+        self._by_status = {}
+        self._by_type = {}
+        self._by_genre = {}
+        self._order = {media.id: position for position, media in enumerate(self.my_list)}
+        self._next_order = len(self.my_list)
+        for media in self.my_list:
+            self._index(media)
+
+    def _index(self, media: Media):
+        self._by_id[media.id] = media
+        self._by_status.setdefault(_status_key(media.status), {})[media.id] = media
+        self._by_type.setdefault(media.type, {})[media.id] = media
+        for genre in media.genres or []:
+            self._by_genre.setdefault(genre.get('id'), {})[media.id] = media
+
+    def _unindex(self, media: Media):
+        self._by_id.pop(media.id, None)
+        self._by_status.get(_status_key(media.status), {}).pop(media.id, None)
+        self._by_type.get(media.type, {}).pop(media.id, None)
+        for genre in media.genres or []:
+            self._by_genre.get(genre.get('id'), {}).pop(media.id, None)
 
     def save_list(self):
-        """Saves the current media list to the JSON file."""
-        with open(self.filepath, 'w') as f:
-            # Convert list of Media objects to list of dictionaries
-            data_to_save = [item.__dict__ for item in self.my_list]
-            json.dump(data_to_save, f, indent=4, default=str)
-        print(f"Saved {len(self.my_list)} items to {self.filepath}")
+        """Saves the full media list to storage."""
+        self.storage.save(self._snapshot())
+        self.list_updated.emit()
+
+    def export_json(self, path: str):
+        """Writes the list as portable, pretty-printed JSON, whatever the storage format."""
+        with open(path, 'w') as f:
+            json.dump(self._snapshot(), f, indent=4, default=plain_default)
+        print(f"Exported {len(self.my_list)} items to {path}")
+
+    def flush(self):
+        """Synchronously writes pending changes, e.g. when the window closes while the event loop still runs."""
+        self.storage.flush()
+
+    def close(self):
+        """Synchronously flushes pending writes and releases the storage backend; call on exit."""
+        self.storage.close()
+
+    def _snapshot(self) -> List[dict]:
+        # Cached dicts are replaced rather than mutated, so the result is safe to serialize on another thread
+        snapshot = []
+        for media in self.my_list:
+            plain = self._plain.get(media.id)
+            if plain is None:
+                plain = self._plain[media.id] = encode_media(media)
+            snapshot.append(plain)
+        return snapshot
+
+    def _commit(self, record: dict):
+        """Persists a single mutation through the storage backend, or defers it to the open batch."""
+        self._plain.pop(record["id"] if "id" in record else record["media"].id, None)
+        if self._batch is not None:
+            self._batch.append(to_plain(record))
+            return
+        self.storage.commit([to_plain(record)], self._snapshot)
+        op = record["op"]
+        if op == "add":
+            self.item_added.emit(record["media"].id)
+        elif op == "update":
+            self.item_changed.emit(record["id"], list(record["fields"]))
+        elif op == "remove":
+            self.item_removed.emit(record["id"])
         self.list_updated.emit()
 
+    @contextmanager
+    def batch(self):
+        """
+        Groups mutations into a single storage write and a single bulk_changed/list_updated emit.
+
+        If an exception escapes the block, the list is rolled back to its state before
+        the batch and nothing is written. Nested batches join the outermost one.
+        """
+        if self._batch is not None:
+            yield self
+            return
+        # Packed seasons are shared with the live list; copy them so edits in the block cannot leak into a rollback
+        before = [self._pinned(plain) for plain in self._snapshot()]
+        self._batch = []
+        try:
+            yield self
+        except BaseException:
+            self._batch = None
+            self._restore(before)
+            raise
+        records, self._batch = self._batch, None
+        if records:
+            self.storage.commit(records, self._snapshot)
+            self.bulk_changed.emit(self._changed_fields(records))
+            self.list_updated.emit()
+
+    @staticmethod
+    def _pinned(plain: dict) -> dict:
+        seasons = plain.get("seasons")
+        if isinstance(seasons, LazySeasons):
+            return dict(plain, seasons=seasons.copy())
+        return plain
+
+    @staticmethod
+    def _changed_fields(records: List[dict]) -> Dict[int, List[str] | None]:
+        changed: Dict[int, List[str] | None] = {}
+        for record in records:
+            if record["op"] == "update":
+                names = changed.get(record["id"], [])
+                if names is not None:
+                    changed[record["id"]] = names + [name for name in record["fields"] if name not in names]
+            else:
+                changed[record["id"] if "id" in record else record["media"]["id"]] = None
+        return changed
+
+    def _restore(self, snapshot: List[dict]):
+        """Resets the list to a snapshot, reusing the existing Media objects where possible."""
+        restored = []
+        for plain in snapshot:
+            fresh = decode_media(plain)
+            if type(fresh.seasons) is dict and fresh.seasons:
+                # Seasons that were materialized when the batch began go back packed
+                fresh.seasons = LazySeasons.pack(fresh.seasons)
+            media = self._by_id.get(fresh.id)
+            if media is None:
+                media = fresh
+            else:
+                for f in fields(Media):
+                    setattr(media, f.name, getattr(fresh, f.name))
+            self.season_cache.attach(media.seasons)
+            restored.append(media)
+        self.my_list = restored
+        self.my_list_ids = {media.id for media in restored}
+        self._plain = {plain["id"]: plain for plain in snapshot}
+        self._rebuild_indexes()
+
     def add_media(self, new_media: Media):
         """Adds a new media item to the list and saves."""
         if new_media.id not in self.my_list_ids:
+            new_media.seasons = self._packable(new_media, new_media.seasons)
             self.my_list.append(new_media)
             self.my_list_ids.add(new_media.id)
-            self.save_list()
+            self._order[new_media.id] = self._next_order
+            self._next_order += 1
+            self._index(new_media)
+            self._commit({"op": "add", "media": new_media})
             return True
         print(f"Item '{new_media.title}' is already in the list.")
         return False
 
+    def remove_media(self, media_id: int):
+        """Removes a media item from the list and saves."""
+        media = self._by_id.get(media_id)
+        if media:
+            self._unindex(media)
+            del self._order[media_id]
+            self.my_list.remove(media)
+            self.my_list_ids.discard(media_id)
+            self._commit({"op": "remove", "id": media_id})
+            print(f"Removed '{media.title}' from the list.")
+            return True
+        return False
+
+    def _packable(self, media: Media, seasons):
+        """
+        New seasons for a title as a LazySeasons in the cache, so release_details() can pack them again.
+
+        The title's current LazySeasons is reused when it has one, keeping it pinned if it is on screen.
+        """
+        if isinstance(seasons, LazySeasons) or not seasons:
+            return seasons
+        if isinstance(media.seasons, LazySeasons):
+            media.seasons.replace(seasons)
+            return media.seasons
+        lazy = LazySeasons.wrap(seasons)
+        self.season_cache.attach(lazy)
+        self.season_cache.touch(lazy)
+        return lazy
+
+    def open_details(self, media: Media) -> Media:
+        """Materializes a title's season and episode details and keeps them while it is shown."""
+        self.season_cache.pin(media.seasons)
+        return media
+
+    def release_details(self):
+        """Packs every materialized season map, including the open title's, once the details view closes."""
+        self.season_cache.pin(None)
+        self.season_cache.release_all()
+
     def get_list(self) -> List[Media]:
         """Returns the full list of media objects."""
         return self.my_list
@@ -61,27 +273,117 @@ class DataManager(QObject):
 
     def get_media_by_id(self, media_id: int) -> Media | None:
         """Returns a media object from the list by its ID."""
+        return self._by_id.get(media_id)
+
+    def query(self, status=None, type: str = None, genre: int = None) -> List[Media]:
+        """Returns media matching every given facet, answered from the in-memory indexes."""
+        candidates = []
+        if status is not None:
+            candidates.append(self._by_status.get(_status_key(status), {}))
+        if type is not None:
+            candidates.append(self._by_type.get(type, {}))
+        if genre is not None:
+            candidates.append(self._by_genre.get(genre, {}))
+        if not candidates:
+            return list(self.my_list)
+        # Walk the smallest bucket and probe the others
+        candidates.sort(key=len)
+        smallest, others = candidates[0], candidates[1:]
+        matches = [media for media_id, media in smallest.items() if all(media_id in other for other in others)]
+        # Buckets hold items in the order they were last indexed; return them in list order like SQLite does
+        matches.sort(key=lambda media: self._order[media.id])
+        return matches
+
+    def find_media(self, status: MediaStatus = None, title: str = None,
+                   sort: str = None, descending: bool = False) -> List[Media]:
+        """Returns media filtered by status and title substring, sorted by 'title', 'year' or 'vote_average'."""
+        if self.storage.supports_queries:
+            ids = self.storage.query_ids(_status_key(status) if status else None, title, sort, descending)
+            return [self._by_id[media_id] for media_id in ids if media_id in self._by_id]
+
+        media_list = self.query(status=status) if status else self.my_list
+        if title:
+            title = title.casefold()
+            media_list = [media for media in media_list if title in media.title.casefold()]
+        media_list = list(media_list)
+        if sort:
+            media_list.sort(key=lambda x: getattr(x, sort), reverse=descending)
+        return media_list
+
+    def summarize(self) -> dict:
+        """Returns raw watch-time, completion and genre counts for the statistics view."""
+        if self.storage.supports_queries:
+            return self.storage.summarize()
+
+        total_watch_time_minutes = 0
+        completed_movies = 0
+        completed_shows = 0
+        genre_counts = {}
+
         for media in self.my_list:
-            if media.id == media_id:
-                return media
-        return None
+            if media.status in [MediaStatus.WATCHING, MediaStatus.COMPLETED]:
+                if media.type == 'movie' and media.runtime:
+                    total_watch_time_minutes += media.runtime
+                elif media.type == 'series' and media.episode_run_time:
+                    # Aggregate progress is available without materializing lazy seasons
+                    watched_episodes, total_episodes = season_totals(media.seasons)
+                    if media.status == MediaStatus.COMPLETED:
+                        total_watch_time_minutes += total_episodes * media.episode_run_time[0]
+                    else: # Watching
+                        total_watch_time_minutes += watched_episodes * media.episode_run_time[0]
+
+            if media.status == MediaStatus.COMPLETED:
+                if media.type == 'movie':
+                    completed_movies += 1
+                else:
+                    completed_shows += 1
+
+            for genre in media.genres:
+                genre_name = genre['name']
+                genre_counts[genre_name] = genre_counts.get(genre_name, 0) + 1
+
+        return {
+            'total_watch_time_minutes': total_watch_time_minutes,
+            'completed_movies': completed_movies,
+            'completed_shows': completed_shows,
+            'total_items': len(self.my_list),
+            'genre_counts': genre_counts,
+        }
 
     def update_media_status(self, media_id: int, new_status: MediaStatus):
         """Updates the status of a media item and saves the list."""
-        for media in self.my_list:
-            if media.id == media_id:
-                media.status = new_status
-                self.save_list()
-                print(f"Updated status of '{media.title}' to '{new_status.value}'")
-                return True
+        media = self._by_id.get(media_id)
+        if media:
+            self._unindex(media)
+            media.status = new_status
+            self._index(media)
+            self._commit({"op": "update", "id": media_id, "fields": {"status": new_status}})
+            print(f"Updated status of '{media.title}' to '{new_status.value}'")
+            return True
+        return False
+
+    def update_media_fields(self, media_id: int, changes: dict):
+        """Updates several fields of a media item in one commit, e.g. when its details arrive."""
+        media = self._by_id.get(media_id)
+        if media:
+            self._unindex(media)
+            for name, value in changes.items():
+                if name == "genres":
+                    value = [intern_genre(genre) for genre in value or []]
+                elif name == "seasons":
+                    value = self._packable(media, value)
+                setattr(media, name, value)
+            self._index(media)
+            self._commit({"op": "update", "id": media_id, "fields": changes})
+            return True
         return False
 
     def update_media_seasons(self, media_id: int, seasons: dict):
         """Updates the seasons of a media item and saves the list."""
-        for media in self.my_list:
-            if media.id == media_id:
-                media.seasons = seasons
-                self.save_list()
-                print(f"Updated seasons of '{media.title}'")
-                return True
-        return False
\ No newline at end of file
+        media = self._by_id.get(media_id)
+        if media:
+            media.seasons = seasons = self._packable(media, seasons)
+            self._commit({"op": "update", "id": media_id, "fields": {"seasons": seasons}})
+            print(f"Updated seasons of '{media.title}'")
+            return True
+        return False
@@ -0,0 +1,116 @@
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+from .config import get_cache_dir
+from .util import Shared, write_atomic
+
+# Fields of a TMDb result that search cards need; the rest is not worth persisting
+RESULT_FIELDS = ("id", "media_type", "title", "name", "poster_path", "release_date", "first_air_date",
+                 "vote_average", "overview")
+
+# Id spaces a title can be cross-referenced in. TMDb movie and TV ids overlap, so they are kept apart.
+ID_SOURCES = ("tmdb_movie", "tmdb_tv", "imdb", "tvdb", "tvmaze")
+
+def tmdb_source(media_type: str) -> str:
+    """Maps a Media.type or TMDb media_type to its id source."""
+    return "tmdb_movie" if media_type == "movie" else "tmdb_tv"
+
+def find_results(data: dict) -> List[dict]:
+    """Flattens a TMDb find/ response into search results tagged with their media_type."""
+    results = []
+    for key, media_type in (("movie_results", "movie"), ("tv_results", "tv")):
+        for result in data.get(key) or []:
+            result = {name: result[name] for name in RESULT_FIELDS if name in result}
+            result.setdefault("media_type", media_type)
+            results.append(result)
+    return results
+
+class IdIndex:
+    """
+    Persisted id mappings shared by every feature that talks to more than one API.
+
+    It holds the TMDb results each IMDb id resolves to (an empty list records that TMDb
+    has no match, so that is not asked again either), and cross-references linking a
+    title's ids in each of ID_SOURCES, so a lookup by any one of them finds the others.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._imdb: Dict[str, List[dict]] = {}
+        # "source:value" -> the title's ids; every id of a title shares one dict
+        self._links: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self._imdb = data.get("imdb", {})
+                for ids in data.get("links", []):
+                    self._index(ids)
+            except (json.JSONDecodeError, OSError, AttributeError) as e:
+                print(f"Ignoring unreadable id index {path}: {e}")
+
+    def _index(self, ids: Dict[str, Any]):
+        for source, value in ids.items():
+            self._links[f"{source}:{value}"] = ids
+
+    def get_imdb(self, imdb_id: str) -> Optional[List[dict]]:
+        """Returns the TMDb results for an IMDb id, or None if it was never resolved."""
+        with self._lock:
+            return self._imdb.get(imdb_id)
+
+    def put_imdb(self, imdb_id: str, results: List[dict]):
+        with self._lock:
+            self._imdb[imdb_id] = results
+            self._dirty = True
+
+    def lookup(self, source: str, value) -> Optional[Dict[str, Any]]:
+        """Returns every known id of the title with the given id, or None if it was never linked."""
+        if value is None:
+            return None
+        with self._lock:
+            ids = self._links.get(f"{source}:{value}")
+            return dict(ids) if ids is not None else None
+
+    def link(self, **ids):
+        """Records that the given ids (keyword per ID_SOURCES entry) belong to one title."""
+        ids = {source: value for source, value in ids.items() if value is not None}
+        with self._lock:
+            known = [self._links[key] for key in (f"{source}:{value}" for source, value in ids.items())
+                     if key in self._links]
+            merged = {}
+            for previous in known:
+                merged.update(previous)
+            merged.update(ids)
+            if all(self._links.get(f"{source}:{value}") == merged for source, value in merged.items()):
+                return
+            # Ids the new link overrides no longer point at this title
+            for previous in known:
+                for source, value in previous.items():
+                    if merged.get(source) != value:
+                        self._links.pop(f"{source}:{value}", None)
+            self._index(merged)
+            self._dirty = True
+
+    def save(self):
+        """Writes the index if it changed since the last save."""
+        with self._lock:
+            if not self._dirty:
+                return
+            links = list({id(ids): ids for ids in self._links.values()}.values())
+            data = json.dumps({"imdb": self._imdb, "links": links}, separators=(",", ":"))
+            self._dirty = False
+        try:
+            write_atomic(self.path, lambda f: f.write(data))
+        except OSError as e:
+            print(f"Error writing id index {self.path}: {e}")
+            with self._lock:
+                self._dirty = True
+
+_shared = Shared(lambda: IdIndex(os.path.join(get_cache_dir(), "id_index.json")))
+
+def get_id_index() -> IdIndex:
+    """Returns the process-wide id index stored in the cache directory."""
+    return _shared.get()
@@ -0,0 +1,72 @@
+import json
+import os
+from typing import Iterator, List
+
+class ChangeJournal:
+    """Append-only log of list mutations, replayed on top of the last snapshot."""
+
+    def __init__(self, path: str, max_entries: int = 500, max_bytes: int = 256 * 1024):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = 0
+        self.size = 0
+        self._file = None
+
+    def append(self, records: List[dict]):
+        """Appends records as JSON lines with a single write and fsync."""
+        data = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.entries += len(records)
+        self.size += len(data)
+
+    def replay(self) -> Iterator[dict]:
+        """Yields every logged record in order."""
+        self.entries = 0
+        self.size = 0
+        for record in self._read(self.path):
+            self.entries += 1
+            yield record
+        if os.path.exists(self.path):
+            self.size = os.path.getsize(self.path)
+
+    def needs_compaction(self, incoming: int = 0) -> bool:
+        """Whether the log, plus `incoming` new records, has outgrown its thresholds."""
+        return self.entries + incoming >= self.max_entries or self.size >= self.max_bytes
+
+    def reset(self):
+        """Drops the log after a full snapshot has been written."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.entries = 0
+        self.size = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _read(self, path: str) -> List[dict]:
+        records = []
+        if not os.path.exists(path):
+            return records
+        with open(path, 'rb') as f:
+            data = f.read()
+        offset = 0
+        for line in data.splitlines(keepends=True):
+            try:
+                if line.strip():
+                    records.append(json.loads(line))
+            except json.JSONDecodeError:
+                # A torn final write from a crash; cut it off so later appends stay readable
+                print(f"Ignoring truncated journal record in {path}")
+                with open(path, 'r+b') as f:
+                    f.truncate(offset)
+                break
+            offset += len(line)
+        return records
@@ -0,0 +1,196 @@
+import json
+from collections import OrderedDict
+from collections.abc import Mapping, MutableMapping
+from typing import Callable, Dict, List, Optional, Tuple
+from .codec import compile_codec, readable_items
+from .media import EpisodeList, SeasonProgress
+
+_decode_season, _encode_season = compile_codec(SeasonProgress)
+
+def season_rows(seasons) -> List[list]:
+    """Positional rows of a seasons mapping; plain dicts (or legacy repr strings) are read without building objects."""
+    rows = []
+    for key, season in readable_items(seasons, _decode_season):
+        if type(season) is dict:
+            episodes = [[episode.get("episode_number"), episode.get("name"), episode.get("vote_average")]
+                        for episode in season.get("episodes") or [] if type(episode) is dict]
+            rows.append([str(key), season["episodesWatched"], season["totalEpisodes"], season.get("vote_average"),
+                         episodes])
+        else:
+            rows.append([str(key), season.episodesWatched, season.totalEpisodes, season.vote_average,
+                         season.episodes.rows() if season.episodes else []])
+    return rows
+
+def pack_rows(rows: List[list]) -> bytes:
+    # ensure_ascii keeps byte and character offsets identical inside compact snapshots
+    return json.dumps(rows, separators=(",", ":")).encode("ascii") if rows else b""
+
+def pack_seasons(seasons) -> bytes:
+    """Packs a seasons mapping (objects or plain dicts) into compact positional season rows."""
+    return pack_rows(season_rows(seasons))
+
+def unpack_rows(rows) -> Dict[str, SeasonProgress]:
+    return {
+        key: SeasonProgress(watched, total, vote_average, EpisodeList.from_rows(episodes))
+        for key, watched, total, vote_average, episodes in rows
+    }
+
+def unpack_seasons(payload: bytes) -> Dict[str, SeasonProgress]:
+    return unpack_rows(json.loads(payload)) if payload else {}
+
+def season_totals(seasons) -> Tuple[int, int]:
+    """Returns (episodes watched, total episodes) without materializing lazy seasons."""
+    if isinstance(seasons, LazySeasons):
+        return seasons.totals()
+    if not seasons:
+        return 0, 0
+    return (sum(season.episodesWatched for season in seasons.values()),
+            sum(season.totalEpisodes for season in seasons.values()))
+
+class LazySeasons(MutableMapping):
+    """
+    A media item's seasons, kept as a packed payload (or a storage loader) until first access.
+
+    Aggregate progress is known up front, so grids and statistics never need the detail.
+    Once materialized it behaves like the plain dict it replaces; release() packs it back.
+    """
+
+    def __init__(self, count: int, watched: int, total: int, payload: Optional[bytes] = None,
+                 loader: Optional[Callable[[], Dict[str, SeasonProgress]]] = None):
+        self.payload = payload
+        self.cache: Optional["SeasonCache"] = None
+        self._loader = loader
+        self._data: Optional[Dict[str, SeasonProgress]] = None
+        self._count = count
+        self._watched = watched
+        self._total = total
+
+    @classmethod
+    def pack(cls, seasons) -> "LazySeasons":
+        """Packs a parsed seasons mapping (plain dicts or objects), e.g. straight after json.load."""
+        rows = season_rows(seasons)
+        return cls(len(rows), sum(row[1] for row in rows), sum(row[2] for row in rows), payload=pack_rows(rows))
+
+    @classmethod
+    def wrap(cls, seasons: Dict[str, SeasonProgress]) -> "LazySeasons":
+        """Takes over a materialized seasons dict, so it can be packed away once released."""
+        lazy = cls(0, 0, 0)
+        lazy._data = dict(seasons)
+        return lazy
+
+    @property
+    def loaded(self) -> bool:
+        return self._data is not None
+
+    def materialize(self) -> Dict[str, SeasonProgress]:
+        if self._data is None:
+            self._data = self._loader() if self.payload is None and self._loader else unpack_seasons(self.payload)
+        data = self._data
+        if self.cache is not None:
+            self.cache.touch(self)
+        return data
+
+    def release(self):
+        """Drops the materialized objects, packing any edits back into the payload first."""
+        if self._data is None:
+            return
+        self._watched, self._total = season_totals(self._data)
+        self._count = len(self._data)
+        self.payload = pack_seasons(self._data)
+        self._loader = None
+        self._data = None
+
+    def replace(self, seasons: Dict[str, SeasonProgress]):
+        """Swaps in new season objects, e.g. merged fetch results, keeping this mapping packable."""
+        self._data = dict(seasons)
+        self.payload = None
+        self._loader = None
+        if self.cache is not None:
+            self.cache.touch(self)
+
+    def copy(self) -> "LazySeasons":
+        """An unmaterialized copy of the packed state, unaffected by later edits to this one."""
+        return LazySeasons(self._count, self._watched, self._total, self.payload, self._loader)
+
+    def totals(self) -> Tuple[int, int]:
+        if self._data is not None:
+            return season_totals(self._data)
+        return self._watched, self._total
+
+    def packed_totals(self) -> List[int]:
+        """Season count, episodes watched and total episodes matching the current payload."""
+        return [self._count, self._watched, self._total]
+
+    def to_plain(self):
+        """Encoding hook used by the codec: stays packed unless the objects are in memory."""
+        if self._data is None:
+            return self
+        return {key: _encode_season(season) for key, season in self._data.items()}
+
+    def plain(self) -> dict:
+        """Plain season dicts for writers; reads the packed payload when there is one."""
+        if self._data is None and self.payload is not None:
+            return {key: _encode_season(season) for key, season in unpack_seasons(self.payload).items()}
+        return {key: _encode_season(season) for key, season in self.materialize().items()}
+
+    def __getitem__(self, key):
+        return self.materialize()[key]
+
+    def __setitem__(self, key, value):
+        self.materialize()[key] = value
+
+    def __delitem__(self, key):
+        del self.materialize()[key]
+
+    def __iter__(self):
+        return iter(self.materialize())
+
+    def __len__(self):
+        return len(self._data) if self._data is not None else self._count
+
+    def __eq__(self, other):
+        if isinstance(other, Mapping):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self):
+        if self._data is not None:
+            return repr(self._data)
+        return f"<LazySeasons {self._count} seasons, {self._watched}/{self._total} episodes>"
+
+class SeasonCache:
+    """LRU of materialized LazySeasons; the oldest are released once over capacity."""
+
+    def __init__(self, capacity: int = 32):
+        self.capacity = capacity
+        self.pinned: Optional[LazySeasons] = None
+        self._entries: "OrderedDict[int, LazySeasons]" = OrderedDict()
+
+    def attach(self, seasons):
+        if isinstance(seasons, LazySeasons):
+            seasons.cache = self
+
+    def pin(self, seasons):
+        """Keeps one title (the one open in the details view) from being released."""
+        self.pinned = seasons if isinstance(seasons, LazySeasons) else None
+        if self.pinned is not None:
+            self.pinned.materialize()
+
+    def touch(self, seasons: LazySeasons):
+        self._entries[id(seasons)] = seasons
+        self._entries.move_to_end(id(seasons))
+        # Oldest first; the title being touched and the pinned one stay even if that leaves the cache over capacity
+        for key, oldest in list(self._entries.items()):
+            if len(self._entries) <= self.capacity:
+                break
+            if oldest is seasons or oldest is self.pinned:
+                continue
+            del self._entries[key]
+            oldest.release()
+
+    def release_all(self):
+        """Releases everything except the pinned title, e.g. when memory is tight."""
+        for seasons in list(self._entries.values()):
+            if seasons is not self.pinned:
+                seasons.release()
+        self._entries = OrderedDict((id(s), s) for s in [self.pinned] if s is not None)
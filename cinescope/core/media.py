@@ -1,3 +1,6 @@
+import math
+from array import array
+from collections.abc import MutableSequence, Sequence
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Optional, List, Dict, Any
@@ -9,20 +12,145 @@ class MediaStatus(Enum):
     PLAN_TO_WATCH = 'Plan to Watch'
     DROPPED = 'Dropped'
 
-@dataclass
+# Every Media shares one dict per distinct genre instead of holding its own copies
+_genres: Dict[tuple, Dict[str, Any]] = {}
+
+def intern_genre(genre):
+    """Returns the shared dict for a genre like {'id': 18, 'name': 'Drama'}."""
+    try:
+        key = tuple(genre.items())
+        shared = _genres.get(key)
+    except (AttributeError, TypeError):
+        return genre
+    if shared is None:
+        shared = _genres[key] = genre
+    return shared
+
+@dataclass(slots=True)
 class Episode:
     episode_number: int
     name: str
     vote_average: float
 
-@dataclass
+# Sentinel for a missing episode number in the int32 array
+_NO_NUMBER = -2 ** 31
+
+class EpisodeList(MutableSequence):
+    """
+    A season's episodes packed column-wise: int32 numbers, float32 ratings and a list of names.
+
+    Indexing returns Episode objects built on the fly, so assign episodes back
+    (episodes[i] = episode) rather than mutating the returned object. Ratings
+    keep three decimals, which is what TMDb reports.
+    """
+    __slots__ = ("_numbers", "_names", "_ratings")
+
+    def __init__(self, episodes=()):
+        self._numbers = array('i')
+        self._names: List[Optional[str]] = []
+        self._ratings = array('f')
+        for episode in episodes:
+            self.append(episode)
+
+    @classmethod
+    def from_rows(cls, rows) -> "EpisodeList":
+        """Builds the list from [episode_number, name, vote_average] rows."""
+        episodes = cls()
+        for number, name, rating in rows:
+            episodes._append(number, name, rating)
+        return episodes
+
+    @classmethod
+    def from_plain(cls, values) -> "EpisodeList":
+        """Codec hook: accepts stored dicts or Episode objects."""
+        if type(values) is cls:
+            return values
+        episodes = cls()
+        for value in values:
+            if type(value) is dict:
+                episodes._append(value.get("episode_number"), value.get("name"), value.get("vote_average"))
+            elif isinstance(value, Episode):
+                episodes._append(value.episode_number, value.name, value.vote_average)
+        return episodes
+
+    def to_plain(self) -> List[dict]:
+        # NaN is the only value not equal to itself
+        return [{"episode_number": None if number == _NO_NUMBER else number, "name": name,
+                 "vote_average": None if rating != rating else round(rating, 3)}
+                for number, name, rating in zip(self._numbers, self._names, self._ratings)]
+
+    def rows(self) -> List[list]:
+        return [[None if number == _NO_NUMBER else number, name, None if rating != rating else round(rating, 3)]
+                for number, name, rating in zip(self._numbers, self._names, self._ratings)]
+
+    @staticmethod
+    def _number(value):
+        return None if value == _NO_NUMBER else value
+
+    @staticmethod
+    def _rating(value):
+        return None if math.isnan(value) else round(value, 3)
+
+    def _append(self, number, name, rating):
+        self._numbers.append(_NO_NUMBER if number is None else number)
+        self._names.append(name)
+        self._ratings.append(math.nan if rating is None else rating)
+
+    def _episode(self, i: int) -> Episode:
+        return Episode(self._number(self._numbers[i]), self._names[i], self._rating(self._ratings[i]))
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._episode(j) for j in range(*i.indices(len(self)))]
+        return self._episode(i)
+
+    def __setitem__(self, i, episode):
+        if isinstance(i, slice):
+            episodes = list(self)
+            episodes[i] = episode
+            self.__init__(episodes)
+            return
+        self._numbers[i] = _NO_NUMBER if episode.episode_number is None else episode.episode_number
+        self._names[i] = episode.name
+        self._ratings[i] = math.nan if episode.vote_average is None else episode.vote_average
+
+    def __delitem__(self, i):
+        del self._numbers[i]
+        del self._names[i]
+        del self._ratings[i]
+
+    def __len__(self):
+        return len(self._numbers)
+
+    def insert(self, i, episode):
+        if i >= len(self):
+            self._append(episode.episode_number, episode.name, episode.vote_average)
+            return
+        episodes = list(self)
+        episodes.insert(i, episode)
+        self.__init__(episodes)
+
+    def __eq__(self, other):
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+@dataclass(slots=True)
 class SeasonProgress:
     episodesWatched: int
     totalEpisodes: int
     vote_average: Optional[float] = None
-    episodes: Optional[List[Episode]] = field(default_factory=list)
+    episodes: Optional[EpisodeList] = field(default_factory=EpisodeList)
 
-@dataclass
+    def __post_init__(self):
+        # Plain lists of Episode objects are still accepted and packed here
+        if self.episodes is not None and type(self.episodes) is not EpisodeList:
+            self.episodes = EpisodeList.from_plain(self.episodes)
+
+@dataclass(slots=True)
 class Media:
     """The core data class for a movie or TV show."""
     # Core attributes from the documentation
@@ -39,7 +167,7 @@ class Media:
     # Optional IDs
     imdb_id: Optional[str] = None
     tvdb_id: Optional[int] = None
-    
+
     # Movie-specific attributes
     runtime: Optional[int] = None
 
@@ -47,4 +175,8 @@ class Media:
     episode_run_time: Optional[List[int]] = field(default_factory=list)
     number_of_seasons: Optional[int] = None
     production_status: Optional[str] = None
-    seasons: Optional[Dict[str, SeasonProgress]] = field(default_factory=dict)
\ No newline at end of file
+    seasons: Optional[Dict[str, SeasonProgress]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if self.genres:
+            self.genres = [intern_genre(genre) for genre in self.genres]
@@ -0,0 +1,72 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+from PySide6.QtCore import QCoreApplication, QObject, QTimer
+
+class SaveScheduler(QObject):
+    """
+    Coalesces bursts of mutations into one background write.
+
+    `prepare` runs on the GUI thread once the window has elapsed and returns a job
+    built from immutable data (or None); the job then runs on a single worker thread,
+    so writes never overlap and land in order. A steady stream of mutations still
+    gets written every `max_delay_ms`. Once closed, writes happen synchronously.
+    """
+
+    def __init__(self, prepare: Callable[[], Optional[Callable[[], None]]], delay_ms: int = 500,
+                 max_delay_ms: int = 5000):
+        super().__init__()
+        self.prepare = prepare
+        self.delay_ms = delay_ms
+        self.max_delay_ms = max_delay_ms
+        self._dirty = False
+        self._closed = False
+        # Monotonic time by which the oldest pending mutation has to be written
+        self._deadline: Optional[float] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cinescope-save")
+        self._last_future = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def schedule(self):
+        """Marks the store dirty; the write happens once no new mutation arrives within the window."""
+        self._dirty = True
+        if self._closed or QCoreApplication.instance() is None:
+            # No event loop to drive the timer (scripts, migrations) or no worker left: write straight away
+            self.flush()
+            return
+        now = time.monotonic()
+        if self._deadline is None:
+            self._deadline = now + self.max_delay_ms / 1000
+        self._timer.start(max(0, min(self.delay_ms, int((self._deadline - now) * 1000))))
+
+    def flush(self):
+        """Synchronously writes anything pending and waits for in-flight writes, e.g. on exit."""
+        self._timer.stop()
+        self._submit()
+        if self._last_future is not None:
+            self._last_future.result()
+            self._last_future = None
+
+    def close(self):
+        """Flushes and stops the worker thread; later mutations are written synchronously."""
+        self.flush()
+        self._closed = True
+        self._executor.shutdown(wait=True)
+
+    def _on_timeout(self):
+        self._submit()
+
+    def _submit(self):
+        self._deadline = None
+        if not self._dirty:
+            return
+        self._dirty = False
+        job = self.prepare()
+        if job is None:
+            return
+        if self._closed:
+            job()
+        else:
+            self._last_future = self._executor.submit(job)
@@ -0,0 +1,153 @@
+"""
+Compact binary snapshot format for the media library.
+
+Layout (little-endian):
+    magic b"CSNP" | u16 version | u32 length + string table | u32 record count | records
+
+The string table is a JSON array holding every low-cardinality string (years,
+types, statuses, production statuses, genre names) once. Each record is a
+length-prefixed header (a positional JSON array, interned strings replaced by
+their table index) followed by a length-prefixed season block, which is empty
+for movies. Field names such as `episodesWatched` never appear in the file.
+
+Since version 2 the header ends with the title's season count, episodes watched
+and total episodes, and the season block is kept packed in a LazySeasons until
+the title is opened. Version 1 files are still read, eagerly.
+"""
+import json
+import json.scanner
+import struct
+from dataclasses import fields
+from typing import Dict, List
+from .codec import enum_lookup
+from .lazy_seasons import LazySeasons, pack_seasons, unpack_rows
+from .media import Media, MediaStatus, intern_genre
+
+MAGIC = b"CSNP"
+VERSION = 2
+
+_HEADER = struct.Struct("<4sH")
+_U32 = struct.Struct("<I")
+
+# The header array follows the Media field order (minus seasons), so records decode positionally
+HEADER_FIELDS = [f.name for f in fields(Media) if f.name != "seasons"]
+INTERNED_FIELDS = {"year", "type", "status", "production_status"}
+
+def _dumps(value) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+class _StringTable:
+    def __init__(self):
+        self.strings: List[str] = []
+        self.index: Dict[str, int] = {}
+
+    def intern(self, value):
+        if value is None:
+            return None
+        position = self.index.get(value)
+        if position is None:
+            position = self.index[value] = len(self.strings)
+            self.strings.append(value)
+        return position
+
+def encode_snapshot(items: List[dict]) -> bytes:
+    """Encodes plain media dicts (as produced by encode_media) into the compact format."""
+    table = _StringTable()
+    records = []
+    for item in items:
+        header = []
+        for name in HEADER_FIELDS:
+            value = item.get(name)
+            if name == "genres":
+                value = [[genre.get("id"), table.intern(genre.get("name"))] for genre in value or []]
+            elif name in INTERNED_FIELDS:
+                value = table.intern(value)
+            header.append(value)
+        seasons = item.get("seasons") or {}
+        if isinstance(seasons, LazySeasons) and seasons.payload is not None:
+            # Still packed from the last load: copy the block as is
+            season_bytes = seasons.payload
+            header.extend(seasons.packed_totals())
+        else:
+            if isinstance(seasons, LazySeasons):
+                seasons = seasons.plain()
+            season_bytes = pack_seasons(seasons)
+            header.append(len(seasons))
+            header.extend(_plain_totals(seasons))
+        # ensure_ascii keeps byte and character offsets identical, which the decoder relies on
+        header_bytes = _dumps(header)
+        records.append(b"".join((_U32.pack(len(header_bytes)), header_bytes,
+                                 _U32.pack(len(season_bytes)), season_bytes)))
+
+    table_bytes = _dumps(table.strings)
+    return b"".join([
+        _HEADER.pack(MAGIC, VERSION),
+        _U32.pack(len(table_bytes)), table_bytes,
+        _U32.pack(len(records)),
+        *records,
+    ])
+
+def _plain_totals(seasons: dict) -> List[int]:
+    return [sum(season.get("episodesWatched", 0) for season in seasons.values()),
+            sum(season.get("totalEpisodes", 0) for season in seasons.values())]
+
+def decode_snapshot(data: bytes) -> List[Media]:
+    """Decodes a compact snapshot straight into Media objects; raises ValueError if it is truncated or corrupt."""
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a CineScope snapshot")
+    offset = len(MAGIC)
+    try:
+        (version,) = struct.unpack_from("<H", data, offset)
+        if version not in (1, VERSION):
+            raise ValueError(f"Unsupported snapshot version {version}")
+        # latin-1 maps bytes to characters one to one, so record offsets index the text directly
+        text = data.decode("latin-1")
+        scan = json.scanner.make_scanner(json.JSONDecoder())
+        unpack_u32 = _U32.unpack_from
+
+        offset = _HEADER.size
+        strings, offset = scan(text, offset + 4)
+        statuses = enum_lookup(MediaStatus)
+        (count,) = unpack_u32(data, offset)
+        offset += 4
+
+        status_index = HEADER_FIELDS.index("status")
+        genres_index = HEADER_FIELDS.index("genres")
+        interned = [i for i, name in enumerate(HEADER_FIELDS) if name in INTERNED_FIELDS and i != status_index]
+        # Identical genres share one dict across the whole library
+        genre_cache = {}
+        items = []
+        for _ in range(count):
+            header, offset = scan(text, offset + 4)
+            (length,) = unpack_u32(data, offset)
+            offset += 4
+            if version == 1:
+                if length:
+                    rows, offset = scan(text, offset)
+                    seasons = unpack_rows(rows)
+                else:
+                    seasons = {}
+            else:
+                season_count, watched, total = header[-3:]
+                del header[-3:]
+                seasons = LazySeasons(season_count, watched, total, payload=data[offset:offset + length]) if length else {}
+                offset += length
+                if offset > len(data):
+                    raise IndexError(offset)
+
+            for i in interned:
+                if header[i] is not None:
+                    header[i] = strings[header[i]]
+            header[status_index] = statuses[strings[header[status_index]]]
+            genres = []
+            for genre_id, name in header[genres_index]:
+                genre = genre_cache.get((genre_id, name))
+                if genre is None:
+                    genre = genre_cache[(genre_id, name)] = intern_genre(
+                        {"id": genre_id, "name": strings[name] if name is not None else None})
+                genres.append(genre)
+            header[genres_index] = genres
+            items.append(Media(*header, seasons))
+    except (StopIteration, IndexError, KeyError, TypeError, struct.error) as e:
+        raise ValueError(f"Corrupt snapshot near offset {offset}") from e
+    return items
@@ -0,0 +1,453 @@
+import json
+import os
+import sqlite3
+from collections.abc import Mapping
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from typing import Callable, Dict, List, Optional
+from .codec import decode_media, encode_media
+from .journal import ChangeJournal
+from .lazy_seasons import LazySeasons
+from .media import EpisodeList, Media, SeasonProgress
+from .save_scheduler import SaveScheduler
+from .snapshot import decode_snapshot, encode_snapshot
+from .util import write_atomic
+
+def to_plain(value):
+    """Converts enums, dataclasses and containers into JSON-compatible values."""
+    if isinstance(value, Enum):
+        return value.value
+    if is_dataclass(value):
+        return {f.name: to_plain(getattr(value, f.name)) for f in fields(value)}
+    if isinstance(value, Mapping):
+        return {str(k): to_plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_plain(v) for v in value]
+    if hasattr(value, "from_plain"):
+        # Packed containers such as EpisodeList
+        return value.to_plain()
+    return value
+
+def plain_default(value):
+    """json.dump hook for seasons that are still packed in the snapshot."""
+    if isinstance(value, LazySeasons):
+        return value.plain()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def apply_record(items: List[dict], record: dict):
+    """Applies one change record to a list of plain media dicts; records are idempotent."""
+    op = record.get("op")
+    if op == "add":
+        item = record["media"]
+        if not any(existing["id"] == item["id"] for existing in items):
+            items.append(item)
+    elif op == "update":
+        for existing in items:
+            if existing["id"] == record["id"]:
+                existing.update(record["fields"])
+                break
+    elif op == "remove":
+        items[:] = [existing for existing in items if existing["id"] != record["id"]]
+
+class StorageBackend:
+    """Interface DataManager uses to load and persist the media list."""
+    # Backends that can filter, sort and aggregate without scanning the list in Python
+    supports_queries = False
+
+    def load(self) -> List[Media]:
+        """Returns the stored media, in list order."""
+        raise NotImplementedError
+
+    def save(self, snapshot: List[dict]):
+        """Replaces the stored list with a full snapshot."""
+        raise NotImplementedError
+
+    def commit(self, records: List[dict], snapshot: Callable[[], List[dict]]):
+        """Persists change records as one write; `snapshot` builds the full list if the backend needs it."""
+        raise NotImplementedError
+
+    def flush(self):
+        """Synchronously writes anything pending; the backend stays usable."""
+        pass
+
+    def close(self):
+        pass
+
+class JsonStorage(StorageBackend):
+    """
+    The my_list.json file, optionally paired with an append-only change journal.
+
+    Writes are coalesced by a SaveScheduler and happen on its worker thread.
+    """
+
+    def __init__(self, filepath: str, journaled: bool = True, save_delay_ms: int = 500):
+        self.filepath = filepath
+        self.journal = ChangeJournal(self._journal_path()) if journaled else None
+        self.scheduler = SaveScheduler(self._prepare_write, delay_ms=save_delay_ms)
+        self._pending: List[dict] = []
+        self._snapshot: Callable[[], List[dict]] = None
+        self._force_snapshot = False
+        self._closed = False
+
+    def load(self) -> List[Media]:
+        items = self._read_snapshot()
+        if not self.journal:
+            return items
+
+        records = list(self.journal.replay())
+        if records:
+            # Replay works on plain dicts, so only a journaled start pays for the round trip
+            plain = [encode_media(media) for media in items]
+            for record in records:
+                apply_record(plain, record)
+            items = [decode_media(item) for item in plain]
+            print(f"Replayed {len(records)} journal records from {self.journal.path}")
+        return items
+
+    def _journal_path(self) -> str:
+        return os.path.splitext(self.filepath)[0] + ".journal"
+
+    def _read_snapshot(self) -> List[Media]:
+        if not os.path.exists(self.filepath):
+            return []
+        with open(self.filepath, 'r') as f:
+            data = json.load(f)
+        for item in data:
+            # Seasons stay packed until a title is opened, so the parsed episode dicts are not kept alive
+            if type(item.get("seasons")) is dict and item["seasons"]:
+                item["seasons"] = LazySeasons.pack(item["seasons"])
+        items = [decode_media(item) for item in data]
+        print(f"Loaded {len(items)} items from {self.filepath}")
+        return items
+
+    def save(self, snapshot: List[dict]):
+        self._snapshot = lambda: snapshot
+        self._force_snapshot = True
+        self._pending = []
+        self.scheduler.schedule()
+
+    def commit(self, records: List[dict], snapshot: Callable[[], List[dict]]):
+        self._pending.extend(records)
+        self._snapshot = snapshot
+        self.scheduler.schedule()
+
+    def flush(self):
+        self.scheduler.flush()
+
+    def close(self):
+        """Synchronously writes anything still pending and stops the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self.scheduler.flush()
+        if self._force_snapshot and self._snapshot:
+            # A full snapshot is still owed (failed write or format switch); write it before exiting
+            self.scheduler.schedule()
+        self.scheduler.close()
+        if self.journal:
+            self.journal.close()
+
+    def _prepare_write(self):
+        # Runs on the GUI thread: only grabs references, all encoding happens in _write
+        records, self._pending = self._pending, []
+        full = self._force_snapshot or not self.journal or self.journal.needs_compaction(len(records))
+        self._force_snapshot = False
+        data = self._snapshot() if full else None
+        return lambda: self._write(records, data)
+
+    def _write(self, records: List[dict], data: List[dict]):
+        try:
+            if data is None:
+                self.journal.append(records)
+                return
+            self._write_snapshot(data)
+            if self.journal:
+                # The snapshot already contains every journaled change
+                self.journal.reset()
+            print(f"Saved {len(data)} items to {self.filepath}")
+        except OSError as e:
+            # Fall back to a full snapshot on the next write so nothing is lost
+            print(f"Error writing {self.filepath}: {e}")
+            self._force_snapshot = True
+
+    def _write_snapshot(self, data: List[dict]):
+        write_atomic(self.filepath, lambda f: json.dump(data, f, indent=4, default=plain_default), fsync=True)
+
+class CompactStorage(JsonStorage):
+    """
+    JsonStorage variant that keeps its snapshot in the compact binary format.
+
+    If no compact snapshot exists yet, the existing my_list.json is read instead,
+    so switching formats needs no migration step.
+    """
+
+    def __init__(self, filepath: str, journaled: bool = True, save_delay_ms: int = 500):
+        self.json_path = filepath
+        super().__init__(os.path.splitext(filepath)[0] + ".csnp", journaled, save_delay_ms)
+
+    def _journal_path(self) -> str:
+        # Separate from the JSON journal, which replays on top of a different snapshot
+        return self.filepath + ".journal"
+
+    def _read_snapshot(self) -> List[Media]:
+        if os.path.exists(self.filepath):
+            with open(self.filepath, 'rb') as f:
+                items = decode_snapshot(f.read())
+            print(f"Loaded {len(items)} items from {self.filepath}")
+            return items
+        # No compact snapshot yet: read the JSON list (and its journal) and convert on the next write
+        items = JsonStorage(self.json_path).load()
+        if items:
+            self._force_snapshot = True
+            # Converted on close even if nothing is edited; DataManager's own snapshot replaces this on commit
+            self._snapshot = lambda: [encode_media(media) for media in items]
+        return items
+
+    def _write_snapshot(self, data: List[dict]):
+        write_atomic(self.filepath, lambda f: f.write(encode_snapshot(data)), binary=True, fsync=True)
+
+# Sort keys MyListWidget can push down, mapped to indexed columns
+SORT_COLUMNS = {"title": "title", "year": "year", "vote_average": "vote_average"}
+
+_SCALAR_COLUMNS = [
+    "title", "year", "type", "poster_path", "plot", "vote_average", "status",
+    "imdb_id", "tvdb_id", "runtime", "number_of_seasons", "production_status",
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS media (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    year TEXT,
+    type TEXT NOT NULL,
+    poster_path TEXT,
+    plot TEXT,
+    vote_average REAL,
+    status TEXT NOT NULL,
+    imdb_id TEXT,
+    tvdb_id INTEGER,
+    runtime INTEGER,
+    episode_run_time TEXT,
+    number_of_seasons INTEGER,
+    production_status TEXT
+);
+CREATE TABLE IF NOT EXISTS media_genres (
+    media_id INTEGER NOT NULL REFERENCES media(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    genre_id INTEGER,
+    name TEXT,
+    PRIMARY KEY (media_id, position)
+);
+CREATE TABLE IF NOT EXISTS seasons (
+    media_id INTEGER NOT NULL REFERENCES media(id) ON DELETE CASCADE,
+    season_number TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    episodes_watched INTEGER NOT NULL,
+    total_episodes INTEGER NOT NULL,
+    vote_average REAL,
+    PRIMARY KEY (media_id, season_number)
+);
+CREATE TABLE IF NOT EXISTS episodes (
+    media_id INTEGER NOT NULL,
+    season_number TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    episode_number INTEGER,
+    name TEXT,
+    vote_average REAL,
+    PRIMARY KEY (media_id, season_number, position),
+    FOREIGN KEY (media_id, season_number) REFERENCES seasons(media_id, season_number) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_media_status ON media(status);
+CREATE INDEX IF NOT EXISTS idx_media_type ON media(type);
+CREATE INDEX IF NOT EXISTS idx_media_year ON media(year);
+CREATE INDEX IF NOT EXISTS idx_media_vote_average ON media(vote_average);
+CREATE INDEX IF NOT EXISTS idx_media_title ON media(title);
+CREATE INDEX IF NOT EXISTS idx_media_genres_genre ON media_genres(genre_id);
+"""
+
+class SqliteStorage(StorageBackend):
+    """SQLite database with one row per media, season and episode; updates touch single rows."""
+    supports_queries = True
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.conn = sqlite3.connect(filepath)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        # With WAL, NORMAL skips the fsync on every commit; only checkpoints sync
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        # SQLite's lower() only folds ASCII; title search has to match the in-memory backends
+        self.conn.create_function("casefold", 1, lambda text: text.casefold() if text else text, deterministic=True)
+        self.conn.executescript(_SCHEMA)
+
+    def load(self) -> List[Media]:
+        genres: Dict[int, list] = {}
+        for media_id, genre_id, name in self.conn.execute(
+                "SELECT media_id, genre_id, name FROM media_genres ORDER BY media_id, position"):
+            genres.setdefault(media_id, []).append({"id": genre_id, "name": name})
+
+        # Only per-title aggregates are read up front; season and episode rows load on first access
+        progress: Dict[int, tuple] = {}
+        for media_id, count, watched, total in self.conn.execute(
+                "SELECT media_id, COUNT(*), SUM(episodes_watched), SUM(total_episodes) "
+                "FROM seasons GROUP BY media_id"):
+            progress[media_id] = (count, watched, total)
+
+        items = []
+        columns = ["id"] + _SCALAR_COLUMNS + ["episode_run_time"]
+        for row in self.conn.execute(f"SELECT {', '.join(columns)} FROM media ORDER BY position"):
+            item = dict(zip(columns, row))
+            item["episode_run_time"] = json.loads(item["episode_run_time"] or "[]")
+            item["genres"] = genres.get(item["id"], [])
+            if item["id"] in progress:
+                loader = lambda media_id=item["id"]: self._load_seasons(media_id)
+                item["seasons"] = LazySeasons(*progress[item["id"]], loader=loader)
+            else:
+                item["seasons"] = {}
+            items.append(decode_media(item))
+        print(f"Loaded {len(items)} items from {self.filepath}")
+        return items
+
+    def _load_seasons(self, media_id: int) -> Dict[str, SeasonProgress]:
+        episodes: Dict[str, list] = {}
+        for season_number, episode_number, name, vote_average in self.conn.execute(
+                "SELECT season_number, episode_number, name, vote_average FROM episodes "
+                "WHERE media_id = ? ORDER BY season_number, position", (media_id,)):
+            episodes.setdefault(season_number, []).append((episode_number, name, vote_average))
+        return {
+            season_number: SeasonProgress(watched, total, vote_average, EpisodeList.from_rows(episodes.get(season_number, [])))
+            for season_number, watched, total, vote_average in self.conn.execute(
+                "SELECT season_number, episodes_watched, total_episodes, vote_average FROM seasons "
+                "WHERE media_id = ? ORDER BY position", (media_id,))
+        }
+
+    def save(self, snapshot: List[dict]):
+        # Unpack lazy seasons first: their loaders read the rows about to be deleted
+        snapshot = [self._unpacked(item) for item in snapshot]
+        with self.conn:
+            self.conn.execute("DELETE FROM media")
+            for position, item in enumerate(snapshot):
+                self._insert_media(item, position)
+        print(f"Saved {len(snapshot)} items to {self.filepath}")
+
+    def commit(self, records: List[dict], snapshot: Callable[[], List[dict]]):
+        # One transaction for the whole group of records
+        with self.conn:
+            for record in records:
+                op = record.get("op")
+                if op == "add":
+                    position = self.conn.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM media").fetchone()[0]
+                    self.conn.execute("DELETE FROM media WHERE id = ?", (record["media"]["id"],))
+                    self._insert_media(record["media"], position)
+                elif op == "update":
+                    self._update_media(record["id"], record["fields"])
+                elif op == "remove":
+                    self.conn.execute("DELETE FROM media WHERE id = ?", (record["id"],))
+
+    def close(self):
+        self.conn.close()
+
+    def query_ids(self, status: Optional[str] = None, title: Optional[str] = None,
+                  sort: Optional[str] = None, descending: bool = False) -> List[int]:
+        """Returns matching media ids, filtered and ordered by the database."""
+        sql = "SELECT id FROM media"
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if title:
+            clauses.append("instr(casefold(title), ?) > 0")
+            params.append(title.casefold())
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if sort in SORT_COLUMNS:
+            sql += f" ORDER BY {SORT_COLUMNS[sort]} {'DESC' if descending else 'ASC'}, position"
+        else:
+            sql += " ORDER BY position"
+        return [row[0] for row in self.conn.execute(sql, params)]
+
+    def summarize(self) -> dict:
+        """Computes the statistics-tab aggregates with indexed queries."""
+        total_items = self.conn.execute("SELECT COUNT(*) FROM media").fetchone()[0]
+        completed = dict(self.conn.execute(
+            "SELECT type, COUNT(*) FROM media WHERE status = 'Completed' GROUP BY type"))
+        movie_minutes = self.conn.execute(
+            "SELECT COALESCE(SUM(runtime), 0) FROM media "
+            "WHERE type = 'movie' AND status IN ('Watching', 'Completed') AND runtime").fetchone()[0]
+        series_minutes = self.conn.execute(
+            "SELECT COALESCE(SUM(CASE WHEN m.status = 'Completed' THEN s.total_episodes "
+            "ELSE s.episodes_watched END * json_extract(m.episode_run_time, '$[0]')), 0) "
+            "FROM media m JOIN seasons s ON s.media_id = m.id "
+            "WHERE m.type = 'series' AND m.status IN ('Watching', 'Completed') "
+            "AND json_extract(m.episode_run_time, '$[0]')").fetchone()[0]
+        genre_counts = dict(self.conn.execute(
+            "SELECT name, COUNT(*) FROM media_genres GROUP BY name"))
+        return {
+            'total_watch_time_minutes': int(movie_minutes + series_minutes),
+            'completed_movies': completed.get('movie', 0),
+            'completed_shows': sum(count for media_type, count in completed.items() if media_type != 'movie'),
+            'total_items': total_items,
+            'genre_counts': genre_counts,
+        }
+
+    def _insert_media(self, item: dict, position: int):
+        columns = ["id", "position"] + _SCALAR_COLUMNS + ["episode_run_time"]
+        values = [item["id"], position] + [item.get(name) for name in _SCALAR_COLUMNS]
+        values.append(json.dumps(item.get("episode_run_time") or []))
+        self.conn.execute(
+            f"INSERT INTO media ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})", values)
+        self._replace_genres(item["id"], item.get("genres") or [])
+        self._replace_seasons(item["id"], item.get("seasons") or {})
+
+    def _update_media(self, media_id: int, changed: dict):
+        scalars = {name: value for name, value in changed.items() if name in _SCALAR_COLUMNS}
+        if "episode_run_time" in changed:
+            scalars["episode_run_time"] = json.dumps(changed["episode_run_time"] or [])
+        if scalars:
+            assignments = ", ".join(f"{name} = ?" for name in scalars)
+            self.conn.execute(f"UPDATE media SET {assignments} WHERE id = ?", list(scalars.values()) + [media_id])
+        if "genres" in changed:
+            self._replace_genres(media_id, changed["genres"] or [])
+        if "seasons" in changed:
+            self._replace_seasons(media_id, changed["seasons"] or {})
+
+    def _replace_genres(self, media_id: int, genres: list):
+        self.conn.execute("DELETE FROM media_genres WHERE media_id = ?", (media_id,))
+        self.conn.executemany(
+            "INSERT INTO media_genres (media_id, position, genre_id, name) VALUES (?, ?, ?, ?)",
+            [(media_id, i, genre.get("id"), genre.get("name")) for i, genre in enumerate(genres)])
+
+    @staticmethod
+    def _unpacked(item: dict) -> dict:
+        seasons = item.get("seasons")
+        if isinstance(seasons, LazySeasons):
+            item = dict(item, seasons=seasons.plain())
+        return item
+
+    def _replace_seasons(self, media_id: int, seasons: dict):
+        if isinstance(seasons, LazySeasons):
+            seasons = seasons.plain()
+        self.conn.execute("DELETE FROM seasons WHERE media_id = ?", (media_id,))
+        for position, (season_number, season) in enumerate(seasons.items()):
+            self.conn.execute(
+                "INSERT INTO seasons (media_id, season_number, position, episodes_watched, total_episodes, vote_average) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (media_id, str(season_number), position, season.get("episodesWatched", 0),
+                 season.get("totalEpisodes", 0), season.get("vote_average")))
+            self.conn.executemany(
+                "INSERT INTO episodes (media_id, season_number, position, episode_number, name, vote_average) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(media_id, str(season_number), i, episode.get("episode_number"), episode.get("name"),
+                  episode.get("vote_average")) for i, episode in enumerate(season.get("episodes") or [])])
+
+def migrate_json_to_sqlite(json_path: str, db_path: str) -> int:
+    """One-shot import of an existing my_list.json (and its journal) into a new SQLite database."""
+    items = JsonStorage(json_path).load()
+    storage = SqliteStorage(db_path)
+    try:
+        storage.save([encode_media(media) for media in items])
+    finally:
+        storage.close()
+    print(f"Migrated {len(items)} items from {json_path} to {db_path}")
+    return len(items)
@@ -0,0 +1,34 @@
+import os
+import threading
+from typing import IO, Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+class Shared(Generic[T]):
+    """A process-wide instance, created by `factory` on first use from whichever thread asks first."""
+
+    def __init__(self, factory: Callable[[], T]):
+        self.factory = factory
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        with self._lock:
+            if self._instance is None:
+                self._instance = self.factory()
+            return self._instance
+
+def write_atomic(path: str, write: Callable[[IO], None], binary: bool = False, fsync: bool = False):
+    """
+    Writes a file through a temporary sibling and os.replace(), so readers never see half a file.
+
+    With fsync the data is on disk before the rename, which a crash could otherwise reorder.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') if binary else open(tmp_path, 'w', encoding='utf-8') as f:
+        write(f)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
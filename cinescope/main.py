@@ -1,4 +1,6 @@
 import sys
+from cinescope.api.cache import get_cached_transport
+from cinescope.api.transport import get_transport
 from cinescope.ui.main_window import MainWindow
 from PySide6.QtWidgets import QApplication
 
@@ -6,6 +8,10 @@ def run():
     """Initializes and runs the Qt application."""
     app = QApplication(sys.argv)
     window = MainWindow()
+    # Make sure coalesced writes still pending in the background reach the disk
+    app.aboutToQuit.connect(window.data_manager.close)
+    app.aboutToQuit.connect(get_cached_transport().close)
+    app.aboutToQuit.connect(get_transport().close)
     window.show()
     sys.exit(app.exec())
 
@@ -1,6 +1,9 @@
 import sys
 from PySide6.QtWidgets import QMainWindow, QVBoxLayout, QWidget, QStackedWidget, QToolBar
 from PySide6.QtGui import QAction
+from cinescope.api.library_repair import LibraryRepair
+from cinescope.api.tmdb_client import TMDbClient
+from cinescope.core.config import get_api_keys, get_storage_backend
 from cinescope.core.data_manager import DataManager
 from cinescope.ui.my_list_widget import MyListWidget
 from cinescope.ui.search_widget import SearchWidget
@@ -11,7 +14,7 @@ from cinescope.ui.calendar_widget import CalendarWidget
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.data_manager = DataManager()
+        self.data_manager = DataManager(backend=get_storage_backend())
         self.setWindowTitle("CineScope")
         self.resize(1000, 800)
 
@@ -30,11 +33,27 @@ class MainWindow(QMainWindow):
         self.stacked_widget.addWidget(self.statistics_widget)
         self.stacked_widget.addWidget(self.calendar_widget)
 
+        self.library_repair = LibraryRepair(self.data_manager, TMDbClient(api_key=get_api_keys().get("tmdb")))
+        self.library_repair.progress.connect(
+            lambda done, total: self.statusBar().showMessage(f"Repairing library: {done} / {total}"))
+        self.library_repair.finished.connect(
+            lambda repaired, failed: self.statusBar().showMessage(
+                f"Library repaired: {repaired} updated, {failed} could not be fetched", 10000))
+
         self.my_list_widget.media_clicked.connect(self.show_media_details)
         self.media_details_widget.back_requested.connect(lambda: self.stacked_widget.setCurrentWidget(self.my_list_widget))
 
         self.create_toolbar()
 
+    def closeEvent(self, event):
+        # A running repair or fill keeps its checkpoint and resumes on the next start
+        self.library_repair.cancel()
+        self.search_widget.details_fill.cancel()
+        self.statistics_widget.runtime_backfill.cancel()
+        # The event loop still runs, so late results can still land; main() closes the storage on aboutToQuit
+        self.data_manager.flush()
+        super().closeEvent(event)
+
     def show_media_details(self, media_info):
         media = self.data_manager.get_media_by_id(media_info['id'])
         if media:
@@ -59,4 +78,8 @@ class MainWindow(QMainWindow):
 
         calendar_action = QAction("Calendar", self)
         calendar_action.triggered.connect(lambda: self.stacked_widget.setCurrentWidget(self.calendar_widget))
-        toolbar.addAction(calendar_action)
\ No newline at end of file
+        toolbar.addAction(calendar_action)
+
+        repair_action = QAction("Repair Library", self)
+        repair_action.triggered.connect(self.library_repair.start)
+        toolbar.addAction(repair_action)
\ No newline at end of file
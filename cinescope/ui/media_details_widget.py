@@ -1,6 +1,9 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QGroupBox, QCheckBox
 from PySide6.QtGui import QPixmap
 from PySide6.QtCore import Signal
+from cinescope.api.episode_service import EpisodeService, merge_seasons
+from cinescope.api.tmdb_client import TMDbClient
+from cinescope.core.config import get_api_keys
 from cinescope.core.media import Media, MediaStatus
 from cinescope.ui.widgets import PosterLoader
 
@@ -13,6 +16,8 @@ class MediaDetailsWidget(QWidget):
         super().__init__()
         self.data_manager = data_manager
         self.media = None
+        self.episode_service = EpisodeService(TMDbClient(api_key=get_api_keys().get("tmdb")))
+        self.episode_service.episodes_ready.connect(self._on_episodes_ready)
 
         main_layout = QVBoxLayout(self)
 
@@ -54,8 +59,14 @@ class MediaDetailsWidget(QWidget):
 
         self.status_combo.currentTextChanged.connect(self._on_status_changed)
 
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        # Leaving the details view lets every title's seasons be packed away again
+        self.data_manager.release_details()
+
     def set_media(self, media: Media):
-        self.media = media
+        # Season and episode details are only materialized for the title being shown
+        self.media = self.data_manager.open_details(media)
         self.title_label.setText(f"{media.title} ({media.year})")
         self.plot_label.setText(media.plot)
         self.status_combo.setCurrentText(media.status.value)
@@ -63,6 +74,8 @@ class MediaDetailsWidget(QWidget):
         if media.type == 'series':
             self.progress_groupbox.setVisible(True)
             self._update_progress_view()
+            # Episode names and ratings arrive in the background
+            self.episode_service.enrich(media)
         else:
             self.progress_groupbox.setVisible(False)
 
@@ -74,6 +87,14 @@ class MediaDetailsWidget(QWidget):
             from PySide6.QtCore import QThreadPool
             QThreadPool.globalInstance().start(worker)
 
+    def _on_episodes_ready(self, tmdb_id, fetched):
+        media = self.data_manager.get_media_by_id(tmdb_id)
+        if media is None:
+            return  # Removed while the episodes were on the way
+        self.data_manager.update_media_seasons(tmdb_id, merge_seasons(media.seasons, fetched))
+        if self.media is media:
+            self._update_progress_view()
+
     def _update_progress_view(self):
         # Clear the old season widgets
         for i in reversed(range(self.seasons_layout.count())):
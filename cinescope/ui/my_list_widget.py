@@ -1,16 +1,41 @@
+from typing import Dict
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QScrollArea, QGridLayout, QHBoxLayout, QComboBox, QLineEdit, QLabel
 from PySide6.QtCore import Signal
 from cinescope.core.data_manager import DataManager
 from cinescope.core.media import MediaStatus
 from cinescope.ui.widgets import MediaCard
 
+# Sort combo entries mapped to (Media attribute, descending)
+SORT_OPTIONS = {
+    "Title (A-Z)": ("title", False),
+    "Title (Z-A)": ("title", True),
+    "Year (Newest)": ("year", True),
+    "Year (Oldest)": ("year", False),
+    "Rating (Highest)": ("vote_average", True),
+    "Rating (Lowest)": ("vote_average", False),
+}
+
+# Fields shown on a MediaCard; a change to one of these rebuilds that card
+CARD_FIELDS = {"title", "poster_path"}
+# Fields the grid filters or sorts on; a change to one of these re-places the cards
+LAYOUT_FIELDS = {"title", "year", "vote_average", "status"}
+
+def _card_info(media):
+    """The small dict a MediaCard displays and emits back on click."""
+    return {"id": media.id, "title": media.title, "name": media.title, "poster_path": media.poster_path}
+
 class MyListWidget(QWidget):
     media_clicked = Signal(dict)
 
     def __init__(self, data_manager: DataManager):
         super().__init__()
         self.data_manager = data_manager
-        self.data_manager.list_updated.connect(self.load_my_list)
+        self.data_manager.item_added.connect(self._on_item_added)
+        self.data_manager.item_removed.connect(self._on_item_removed)
+        self.data_manager.item_changed.connect(self._on_item_changed)
+        self.data_manager.bulk_changed.connect(self._on_bulk_changed)
+        # Grid cards by media id, kept across refreshes so a change only rebuilds what it touches
+        self._cards: Dict[int, MediaCard] = {}
 
         layout = QVBoxLayout(self)
 
@@ -29,7 +54,7 @@ class MyListWidget(QWidget):
         controls_layout.addWidget(self.search_bar)
 
         self.sort_combo = QComboBox()
-        self.sort_combo.addItems(["Title (A-Z)", "Title (Z-A)", "Year (Newest)", "Year (Oldest)", "Rating (Highest)", "Rating (Lowest)"])
+        self.sort_combo.addItems(list(SORT_OPTIONS))
         controls_layout.addWidget(self.sort_combo)
 
         layout.addLayout(controls_layout)
@@ -54,6 +79,7 @@ class MyListWidget(QWidget):
 
     def _update_view(self, view_text):
         self._clear_layout(self.results_container.layout())
+        self._cards = {}
         if view_text == "List View":
             self.search_bar.setVisible(False)
             self.status_filter_combo.setVisible(False)
@@ -70,50 +96,79 @@ class MyListWidget(QWidget):
     def load_my_list(self):
         self._apply_filters_and_sort()
 
-    def _apply_filters_and_sort(self):
-        media_list = self.data_manager.get_list()
+    def _on_item_added(self, media_id):
+        self._refresh()
+
+    def _on_item_removed(self, media_id):
+        self._discard_card(media_id)
+        self._refresh()
+
+    def _on_item_changed(self, media_id, changed_fields):
+        changed = set(changed_fields)
+        if changed & CARD_FIELDS:
+            self._discard_card(media_id)
+        if changed & (CARD_FIELDS | LAYOUT_FIELDS):
+            self._refresh()
+
+    def _on_bulk_changed(self, changes):
+        refresh = False
+        for media_id, changed_fields in changes.items():
+            # Added and removed items carry no field names
+            changed = set(changed_fields) if changed_fields is not None else CARD_FIELDS
+            if changed & CARD_FIELDS:
+                self._discard_card(media_id)
+            refresh = refresh or bool(changed & (CARD_FIELDS | LAYOUT_FIELDS))
+        if refresh:
+            self._refresh()
+
+    def _refresh(self):
+        if self.view_combo.currentText() == "List View":
+            self._update_view("List View")
+        else:
+            self._apply_filters_and_sort()
+
+    def _discard_card(self, media_id):
+        card = self._cards.pop(media_id, None)
+        if card:
+            self.results_grid.removeWidget(card)
+            card.deleteLater()
 
+    def _apply_filters_and_sort(self):
         # Filter by status
         status_filter = self.status_filter_combo.currentText()
-        if status_filter != "All Statuses":
-            media_list = [media for media in media_list if media.status.value == status_filter]
+        status = MediaStatus(status_filter) if status_filter != "All Statuses" else None
 
         # Filter by search term
-        search_term = self.search_bar.text().lower()
-        if search_term:
-            media_list = [media for media in media_list if search_term in media.title.lower()]
+        search_term = self.search_bar.text()
 
         # Sort
-        sort_option = self.sort_combo.currentText()
-        if sort_option == "Title (A-Z)":
-            media_list.sort(key=lambda x: x.title)
-        elif sort_option == "Title (Z-A)":
-            media_list.sort(key=lambda x: x.title, reverse=True)
-        elif sort_option == "Year (Newest)":
-            media_list.sort(key=lambda x: x.year, reverse=True)
-        elif sort_option == "Year (Oldest)":
-            media_list.sort(key=lambda x: x.year)
-        elif sort_option == "Rating (Highest)":
-            media_list.sort(key=lambda x: x.vote_average, reverse=True)
-        elif sort_option == "Rating (Lowest)":
-            media_list.sort(key=lambda x: x.vote_average)
+        sort_key, descending = SORT_OPTIONS.get(self.sort_combo.currentText(), (None, False))
 
+        media_list = self.data_manager.find_media(status=status, title=search_term, sort=sort_key, descending=descending)
         self._display_grid_view(media_list)
 
     def _display_grid_view(self, media_list):
-        self._clear_layout(self.results_grid)
+        # Detach the cards without deleting them; only items without a card get a new one
+        while self.results_grid.count():
+            self.results_grid.takeAt(0)
+        visible = set()
         row, col = 0, 0
         for media in media_list:
-            media_dict = media.__dict__
-            if media.type == 'series' and 'name' not in media_dict:
-                media_dict['name'] = media.title
-            card = MediaCard(media_dict, is_added=True)
-            card.media_clicked.connect(self.media_clicked.emit)
+            card = self._cards.get(media.id)
+            if card is None:
+                card = MediaCard(_card_info(media), is_added=True)
+                card.media_clicked.connect(self.media_clicked.emit)
+                self._cards[media.id] = card
             self.results_grid.addWidget(card, row, col)
+            card.setVisible(True)
+            visible.add(media.id)
             col += 1
             if col >= 5:
                 col = 0
                 row += 1
+        for media_id, card in self._cards.items():
+            if media_id not in visible:
+                card.setVisible(False)
 
     def _display_list_view(self):
         media_list = self.data_manager.get_list()
@@ -129,8 +184,7 @@ class MyListWidget(QWidget):
         movies_widget = QWidget()
         movies_layout = QHBoxLayout(movies_widget)
         for movie in movies:
-            media_dict = movie.__dict__
-            card = MediaCard(media_dict, is_added=True)
+            card = MediaCard(_card_info(movie), is_added=True)
             card.media_clicked.connect(self.media_clicked.emit)
             movies_layout.addWidget(card)
         movies_scroll_area.setWidget(movies_widget)
@@ -142,10 +196,7 @@ class MyListWidget(QWidget):
         series_widget = QWidget()
         series_layout = QHBoxLayout(series_widget)
         for show in series:
-            media_dict = show.__dict__
-            if 'name' not in media_dict:
-                media_dict['name'] = show.title
-            card = MediaCard(media_dict, is_added=True)
+            card = MediaCard(_card_info(show), is_added=True)
             card.media_clicked.connect(self.media_clicked.emit)
             series_layout.addWidget(card)
         series_scroll_area.setWidget(series_widget)
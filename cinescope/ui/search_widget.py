@@ -1,15 +1,37 @@
 import sys
 import re
+import asyncio
+from PySide6.QtCore import QObject, QRect, QTimer, Signal
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QScrollArea, QGridLayout
 )
-from cinescope.api.tmdb_client import TMDbClient
+from cinescope.api.async_clients import AsyncOMDbClient, AsyncTMDbClient, get_runner, report_errors
+from cinescope.api.details_fill import DetailsFill, is_placeholder
+from cinescope.api.tmdb_client import TMDbClient, media_fields
 from cinescope.api.omdb_client import OMDbClient
-from cinescope.core.media import Media, MediaStatus, SeasonProgress
+from cinescope.api.search_cache import SearchCache
+from cinescope.core.media import Media, MediaStatus
 from cinescope.core.config import get_api_keys
 from cinescope.core.data_manager import DataManager
+from cinescope.core.id_index import find_results, get_id_index, tmdb_source
 from cinescope.ui.widgets import MediaCard
 
+GRID_COLUMNS = 5
+# Pixels from the bottom of the grid at which the next page of results is requested
+LOAD_MORE_MARGIN = 600
+# Quiet time after the last keystroke before a live search starts
+SEARCH_DEBOUNCE_MS = 250
+# Details fetched speculatively for the cards in view, per search, so an add finds them cached
+PREFETCH_BUDGET = 10
+PREFETCH_DELAY_MS = 150
+
+class SearchSignals(QObject):
+    """Carries results resolved on the asyncio loop thread back to the GUI thread."""
+    results_ready = Signal(int, list)  # search generation, TMDb results to add to the grid
+    lookup_ready = Signal(int, list)  # search generation, TMDb results of an IMDb id lookup
+    page_ready = Signal(int, object)  # search generation, next search/multi page or None if it failed
+    details_ready = Signal(int, str, object)  # TMDb id, media type, details or None if the request failed
+
 class SearchWidget(QWidget):
     def __init__(self, data_manager: DataManager):
         super().__init__()
@@ -17,6 +39,27 @@ class SearchWidget(QWidget):
         self.api_keys = get_api_keys()
         self.tmdb_client = TMDbClient(api_key=self.api_keys.get("tmdb"))
         self.omdb_client = OMDbClient(api_key=self.api_keys.get("omdb"))
+        self.async_tmdb = AsyncTMDbClient(self.tmdb_client)
+        self.async_omdb = AsyncOMDbClient(self.omdb_client)
+        self.id_index = get_id_index()
+        self.signals = SearchSignals()
+        self.signals.results_ready.connect(self._on_results_ready)
+        self.signals.lookup_ready.connect(self._on_lookup_ready)
+        self.signals.page_ready.connect(self._on_page_ready)
+        self.signals.details_ready.connect(self._on_details_ready)
+        self.search_cache = SearchCache()
+        # Bumped on every search so results from an older one are dropped
+        self._search_generation = 0
+        self._query = ""
+        # Pages of the current search not fetched yet; None when there are no more
+        self._pages = None
+        self._page_loading = False
+        # Adds whose details request is in flight
+        self._pending_adds = set()
+        self.prefetch_budget = PREFETCH_BUDGET
+        # Ids prefetched for the current search, and the futures still running
+        self._prefetched = set()
+        self._prefetches = []
         self.imdb_pattern = re.compile(r"^tt\d+$")
 
         layout = QVBoxLayout(self)
@@ -27,17 +70,40 @@ class SearchWidget(QWidget):
         controls_layout.addWidget(self.search_bar)
         layout.addLayout(controls_layout)
 
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        layout.addWidget(scroll_area)
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidgetResizable(True)
+        layout.addWidget(self.scroll_area)
+        self.scroll_bar = self.scroll_area.verticalScrollBar()
+        self.scroll_bar.valueChanged.connect(self._maybe_load_more)
+        # Also fires when a page of cards still leaves the grid short of the viewport
+        self.scroll_bar.rangeChanged.connect(self._maybe_load_more)
+        # Prefetch once scrolling settles rather than for every card that flies past
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(PREFETCH_DELAY_MS)
+        self.prefetch_timer.timeout.connect(self._prefetch_visible)
+        # Lambdas, since QTimer.start(int) would take the scroll value as its interval
+        self.scroll_bar.valueChanged.connect(lambda value: self.prefetch_timer.start())
+        self.scroll_bar.rangeChanged.connect(lambda minimum, maximum: self.prefetch_timer.start())
 
         self.results_container = QWidget()
         self.results_grid = QGridLayout(self.results_container)
-        scroll_area.setWidget(self.results_container)
+        self.scroll_area.setWidget(self.results_container)
 
+        # Live search: every keystroke restarts the timer, so only a pause in typing searches
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.debounce_timer.timeout.connect(self._on_search_triggered)
+        self.search_bar.textChanged.connect(self.debounce_timer.start)
         self.search_bar.returnPressed.connect(self._on_search_triggered)
         self.displayed_cards = {}
 
+        # Placeholders left behind by a failed add or a quit get their details on the next start
+        self.details_fill = DetailsFill(data_manager, self.tmdb_client)
+        self.details_fill.finished.connect(self._on_details_filled)
+        QTimer.singleShot(0, self.details_fill.start)
+
     def _clear_layout(self, layout):
         while layout.count():
             child = layout.takeAt(0)
@@ -47,81 +113,204 @@ class SearchWidget(QWidget):
 
     def _display_results(self, results):
         self._clear_layout(self.results_grid)
-        unique_results = {str(r['id']): r for r in results}.values()
+        self._append_results(results)
+
+    def _append_results(self, results):
+        """Adds cards for displayable results after the ones already in the grid."""
         my_list_ids = self.data_manager.get_list_ids()
-        row, col = 0, 0
-        for result in unique_results:
+        for result in results:
             tmdb_id = result.get("id")
-            is_added = tmdb_id in my_list_ids
-            card = MediaCard(result, is_added=is_added)
+            if result.get("media_type") not in ["movie", "tv"] or not result.get("poster_path"):
+                continue
+            if tmdb_id in self.displayed_cards:
+                continue
+            incomplete = tmdb_id in my_list_ids and self._is_incomplete(tmdb_id)
+            card = MediaCard(result, is_added=tmdb_id in my_list_ids and not incomplete)
             card.add_media_requested.connect(self._on_add_media)
+            row, col = divmod(len(self.displayed_cards), GRID_COLUMNS)
             self.results_grid.addWidget(card, row, col)
             self.displayed_cards[tmdb_id] = card
-            col += 1
-            if col >= 5:
-                col = 0
-                row += 1
-
-    def _perform_omdb_fallback(self, query):
-        omdb_results = self.omdb_client.search(query)
-        final_results = []
-        for res in omdb_results:
-            if imdb_id := res.get("imdbID"):
-                tmdb_data = self.tmdb_client.find_by_imdb_id(imdb_id)
-                if tmdb_data:
-                    final_results.extend(tmdb_data.get("movie_results", []) + tmdb_data.get("tv_results", []))
-        return final_results
-        
+            if incomplete:
+                # Clicking re-runs the add, which only refetches the details
+                pending = tmdb_id in self._pending_adds
+                self._set_card_state(tmdb_id, "✓ Added" if pending else "Retry Details", enabled=not pending)
+        self.prefetch_timer.start()
+
+    async def _perform_omdb_fallback(self, query, generation):
+        """Runs on the loop thread; each IMDb id's TMDb results are streamed to the grid as they resolve."""
+        omdb_results = await self.async_omdb.search(query)
+        imdb_ids = list(dict.fromkeys(res["imdbID"] for res in omdb_results if res.get("imdbID")))
+
+        async def resolve(imdb_id):
+            results = self.id_index.get_imdb(imdb_id)
+            if results is None:
+                tmdb_data = await self.async_tmdb.find_by_imdb_id(imdb_id)
+                if tmdb_data is None:
+                    return  # Request failed; try again next time
+                results = find_results(tmdb_data)
+                self.id_index.put_imdb(imdb_id, results)
+                if len(results) == 1:
+                    self.id_index.link(imdb=imdb_id, **{tmdb_source(results[0]["media_type"]): results[0]["id"]})
+            if results:
+                self.signals.results_ready.emit(generation, results)
+
+        # The lookups run concurrently, so the last card lands after the slowest one
+        await asyncio.gather(*(resolve(imdb_id) for imdb_id in imdb_ids))
+        self.id_index.save()
+
+    def _on_results_ready(self, generation, results):
+        if generation == self._search_generation:
+            self._append_results(results)
+
+    def _maybe_load_more(self, *args):
+        """Fetches the next page off the GUI thread once the grid is scrolled near its end."""
+        if self._pages is None or self._page_loading:
+            return
+        if self.scroll_bar.maximum() - self.scroll_bar.value() > LOAD_MORE_MARGIN:
+            return
+        self._page_loading = True
+        report_errors(get_runner().submit(self._fetch_next_page(self._pages, self._search_generation)),
+                      "search paging")
+
+    async def _fetch_next_page(self, pages, generation):
+        self.signals.page_ready.emit(generation, await self.async_tmdb.next_page(pages))
+
+    def _on_page_ready(self, generation, data):
+        if generation != self._search_generation:
+            return  # The search was superseded; its iterator is already dropped
+        self._page_loading = False
+        if data is None:
+            self._pages = None
+            if self.search_cache.get(self._query) is None:
+                self._start_omdb_fallback()  # Not even the first page came back
+            return
+        entry = self.search_cache.add_page(self._query, data)
+        if entry.complete:
+            self._pages = None
+        if data.get("page", 1) == 1:
+            if not entry.results:
+                self._start_omdb_fallback()
+                return
+            self._display_results(data.get("results", []))
+            return
+        shown = len(self.displayed_cards)
+        self._append_results(data.get("results", []))
+        if len(self.displayed_cards) == shown:
+            # Nothing displayable on this page, so the grid will not grow and fire rangeChanged
+            self._maybe_load_more()
+
+    async def _perform_lookup(self, imdb_id, generation):
+        data = await self.async_tmdb.find_by_imdb_id(imdb_id)
+        self.signals.lookup_ready.emit(generation, find_results(data) if data else [])
+
+    def _on_lookup_ready(self, generation, results):
+        if generation == self._search_generation:
+            self._display_results(results)
+
+    def _start_omdb_fallback(self):
+        self._clear_layout(self.results_grid)
+        report_errors(get_runner().submit(self._perform_omdb_fallback(self._query, self._search_generation)),
+                      "OMDb fallback")
+
     def _on_search_triggered(self):
-        query = self.search_bar.text().strip()
-        if not query: return
-        final_results = []
+        """Starts a search for the text in the search bar; the grid keeps the previous results until it lands."""
+        self.debounce_timer.stop()
+        query = " ".join(self.search_bar.text().split())
+        if query == self._query:
+            return
+        self._query = query
+        self._search_generation += 1
+        self._cancel_prefetches()
+        # Stop paging through the previous search
+        self._pages = None
+        self._page_loading = False
+        if not query:
+            self._clear_layout(self.results_grid)
+            return
         if self.imdb_pattern.match(query):
-            data = self.tmdb_client.find_by_imdb_id(query)
-            if data: final_results = data.get("movie_results", []) + data.get("tv_results", [])
-        else:
-            data = self.tmdb_client.search_multi(query)
-            if data and data.get("results"):
-                final_results = data["results"]
-            else:
-                final_results = self._perform_omdb_fallback(query)
-        filtered_results = [r for r in final_results if r.get("media_type") in ["movie", "tv"] and r.get("poster_path")]
-        self._display_results(filtered_results)
+            report_errors(get_runner().submit(self._perform_lookup(query, self._search_generation)), "IMDb lookup")
+            return
+
+        entry = self.search_cache.get(query) or self.search_cache.narrow(query)
+        if entry is not None:
+            if not entry.results:
+                self._start_omdb_fallback()
+                return
+            self._display_results(entry.results)
+            if not entry.complete:
+                self._pages = self.tmdb_client.search_multi_pages(query, entry.next_page)
+            return
+        self._pages = self.tmdb_client.search_multi_pages(query)
+        self._page_loading = True
+        report_errors(get_runner().submit(self._fetch_next_page(self._pages, self._search_generation)), "search")
     
+    def _prefetch_visible(self):
+        """Warms the response cache with details of the cards in view that are not in the list yet."""
+        self._prefetches = [future for future in self._prefetches if not future.done()]
+        viewport = self.scroll_area.viewport()
+        visible = QRect(0, self.scroll_bar.value(), viewport.width(), viewport.height())
+        my_list_ids = self.data_manager.get_list_ids()
+        for tmdb_id, card in self.displayed_cards.items():
+            if len(self._prefetched) >= self.prefetch_budget:
+                break
+            if tmdb_id in self._prefetched or tmdb_id in my_list_ids or not card.geometry().intersects(visible):
+                continue
+            self._prefetched.add(tmdb_id)
+            media_type = card.media_info.get("media_type", "movie")
+            self._prefetches.append(get_runner().submit(self.async_tmdb.prefetch_details(media_type, tmdb_id)))
+
+    def _cancel_prefetches(self):
+        # Prefetches still queued behind the background gate never start; ones already sent just finish
+        for future in self._prefetches:
+            future.cancel()
+        self._prefetches = []
+        self._prefetched = set()
+
     def _on_add_media(self, search_result: dict):
+        """Adds a placeholder from the search result at once and fills it in when the details arrive."""
         media_type = search_result.get("media_type", "movie")
         tmdb_id = search_result.get("id")
-        if not tmdb_id: return
-        details = self.tmdb_client.get_details(media_type, tmdb_id)
-        if not details: return
-
-        seasons_data = {}
-        if media_type == 'tv' and 'seasons' in details:
-            for season in details['seasons']:
-                seasons_data[str(season['season_number'])] = SeasonProgress(
-                    episodesWatched=0,
-                    totalEpisodes=season['episode_count'],
-                    vote_average=season.get('vote_average', 0)
-                )
-
-        new_media = Media(
-            id=details["id"], title=details.get("title") or details.get("name"),
-            year=str(details.get("release_date") or details.get("first_air_date","")).split('-')[0],
-            type='series' if media_type == 'tv' else 'movie', poster_path=details.get("poster_path"),
-            plot=details.get("overview"), vote_average=details.get("vote_average"),
-            status=MediaStatus.PLAN_TO_WATCH, genres=details.get("genres", []),
-            imdb_id=details.get("external_ids", {}).get("imdb_id"),
-            tvdb_id=details.get("external_ids", {}).get("tvdb_id"), runtime=details.get("runtime"),
-            episode_run_time=details.get("episode_run_time"),
-            number_of_seasons=details.get("number_of_seasons"),
-            production_status=details.get("status"),
-            seasons=seasons_data
-        )
-        if self.data_manager.add_media(new_media):
-            print(f"Successfully added '{new_media.title}' to the list.")
-            if tmdb_id in self.displayed_cards:
-                card = self.displayed_cards[tmdb_id]
-                card.add_button.setText("✓ Added")
-                card.add_button.setEnabled(False)
-        else:
-             print(f"Could not add '{new_media.title}' (already in list).")
+        if not tmdb_id or tmdb_id in self._pending_adds: return
+        if tmdb_id not in self.data_manager.get_list_ids():
+            placeholder = Media(status=MediaStatus.PLAN_TO_WATCH, **media_fields(search_result, media_type))
+            self.data_manager.add_media(placeholder)
+        elif not self._is_incomplete(tmdb_id):
+            # Already fully in the list, e.g. filled in by the startup fill since the card was shown
+            self._set_card_state(tmdb_id, "✓ Added", enabled=False)
+            return
+        # A retry of a failed add only refetches; the placeholder is already in the list
+        self._pending_adds.add(tmdb_id)
+        self._set_card_state(tmdb_id, "✓ Added", enabled=False)
+        report_errors(get_runner().submit(self._fetch_details(media_type, tmdb_id)), "add details")
+
+    async def _fetch_details(self, media_type, tmdb_id):
+        details = await self.async_tmdb.get_details(media_type, tmdb_id)
+        self.signals.details_ready.emit(tmdb_id, media_type, details)
+
+    def _on_details_ready(self, tmdb_id, media_type, details):
+        self._pending_adds.discard(tmdb_id)
+        if not details:
+            print(f"Could not fetch details for {tmdb_id}; the entry keeps its search result data.")
+            self._set_card_state(tmdb_id, "Retry Details", enabled=True)
+            return
+        changes = media_fields(details, media_type)
+        del changes["id"]
+        if self.data_manager.update_media_fields(tmdb_id, changes):
+            print(f"Successfully added '{changes['title']}' to the list.")
+
+    def _is_incomplete(self, tmdb_id) -> bool:
+        media = self.data_manager.get_media_by_id(tmdb_id)
+        return media is not None and is_placeholder(media)
+
+    def _on_details_filled(self, updated, failed):
+        """Settles the retry buttons of placeholders the startup fill has filled in."""
+        my_list_ids = self.data_manager.get_list_ids()
+        for tmdb_id, card in self.displayed_cards.items():
+            if tmdb_id in my_list_ids and card.add_button.text() == "Retry Details" and not self._is_incomplete(tmdb_id):
+                self._set_card_state(tmdb_id, "✓ Added", enabled=False)
+
+    def _set_card_state(self, tmdb_id, text, enabled):
+        card = self.displayed_cards.get(tmdb_id)
+        if card is not None:
+            card.add_button.setText(text)
+            card.add_button.setEnabled(enabled)
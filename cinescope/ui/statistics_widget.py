@@ -1,6 +1,9 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PySide6.QtCore import QTimer
+from cinescope.api.runtime_backfill import RuntimeBackfill
+from cinescope.api.tmdb_client import TMDbClient
+from cinescope.core.config import get_api_keys
 from cinescope.core.data_manager import DataManager
-from cinescope.core.media import MediaStatus
 
 class StatisticsWidget(QWidget):
     def __init__(self, data_manager: DataManager):
@@ -14,20 +17,42 @@ class StatisticsWidget(QWidget):
         self.completed_shows_label = QLabel()
         self.total_items_label = QLabel()
         self.genre_breakdown_label = QLabel()
+        self.backfill_label = QLabel()
+        self.backfill_label.hide()
 
         layout.addWidget(self.total_watch_time_label)
         layout.addWidget(self.completed_movies_label)
         layout.addWidget(self.completed_shows_label)
         layout.addWidget(self.total_items_label)
         layout.addWidget(self.genre_breakdown_label)
+        layout.addWidget(self.backfill_label)
 
-        self.update_stats()
+        # Stats are recomputed when shown, or right away if the list changes while they are on screen
+        self._stale = True
+        data_manager.list_updated.connect(self._on_data_changed)
+
+        self.runtime_backfill = RuntimeBackfill(data_manager, TMDbClient(api_key=get_api_keys().get("tmdb")))
+        self.runtime_backfill.progress.connect(self._on_backfill_progress)
+        self.runtime_backfill.finished.connect(lambda filled, failed: self.backfill_label.hide())
 
     def showEvent(self, event):
         super().showEvent(event)
-        self.update_stats()
+        if self._stale:
+            self.update_stats()
+        # Paint from what is stored first; missing runtimes are looked up afterwards
+        QTimer.singleShot(0, self.runtime_backfill.start)
+
+    def _on_data_changed(self):
+        self._stale = True
+        if self.isVisible():
+            self.update_stats()
+
+    def _on_backfill_progress(self, done: int, total: int):
+        self.backfill_label.setText(f"Looking up missing runtimes: {done} / {total}")
+        self.backfill_label.show()
 
     def update_stats(self):
+        self._stale = False
         stats = self._calculate_stats()
         self.total_watch_time_label.setText(f"Total Watch Time: {stats['total_watch_time']}")
         self.completed_movies_label.setText(f"Completed Movies: {stats['completed_movies']}")
@@ -36,34 +61,9 @@ class StatisticsWidget(QWidget):
         self.genre_breakdown_label.setText(f"Genre Breakdown:\n{stats['genre_breakdown']}")
 
     def _calculate_stats(self):
-        media_list = self.data_manager.get_list()
-        total_watch_time_minutes = 0
-        completed_movies = 0
-        completed_shows = 0
-        total_items = len(media_list)
-        genre_counts = {}
-
-        for media in media_list:
-            if media.status in [MediaStatus.WATCHING, MediaStatus.COMPLETED]:
-                if media.type == 'movie' and media.runtime:
-                    total_watch_time_minutes += media.runtime
-                elif media.type == 'series' and media.episode_run_time:
-                    if media.status == MediaStatus.COMPLETED:
-                        total_episodes = sum(season.totalEpisodes for season in media.seasons.values())
-                        total_watch_time_minutes += total_episodes * media.episode_run_time[0]
-                    else: # Watching
-                        watched_episodes = sum(season.episodesWatched for season in media.seasons.values())
-                        total_watch_time_minutes += watched_episodes * media.episode_run_time[0]
-
-            if media.status == MediaStatus.COMPLETED:
-                if media.type == 'movie':
-                    completed_movies += 1
-                else:
-                    completed_shows += 1
-
-            for genre in media.genres:
-                genre_name = genre['name']
-                genre_counts[genre_name] = genre_counts.get(genre_name, 0) + 1
+        summary = self.data_manager.summarize()
+        total_watch_time_minutes = summary['total_watch_time_minutes']
+        genre_counts = summary['genre_counts']
 
         # Format watch time
         days = total_watch_time_minutes // (24 * 60)
@@ -77,8 +77,8 @@ class StatisticsWidget(QWidget):
 
         return {
             'total_watch_time': total_watch_time,
-            'completed_movies': completed_movies,
-            'completed_shows': completed_shows,
-            'total_items': total_items,
+            'completed_movies': summary['completed_movies'],
+            'completed_shows': summary['completed_shows'],
+            'total_items': summary['total_items'],
             'genre_breakdown': genre_breakdown
         }
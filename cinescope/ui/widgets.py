@@ -3,6 +3,7 @@ import requests
 from PySide6.QtCore import Qt, Signal, QObject, QRunnable, QThreadPool
 from PySide6.QtGui import QPixmap, QImage
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton
+from cinescope.api.transport import HttpTransport, get_transport
 
 # --- Worker for Background Tasks ---
 class WorkerSignals(QObject):
@@ -12,14 +13,15 @@ class WorkerSignals(QObject):
 
 class PosterLoader(QRunnable):
     """Worker thread for loading an image from a URL."""
-    def __init__(self, url):
+    def __init__(self, url, transport: HttpTransport = None):
         super().__init__()
         self.url = url
+        self.transport = transport or get_transport()
         self.signals = WorkerSignals()
 
     def run(self):
         try:
-            response = requests.get(self.url, timeout=10)
+            response = self.transport.get(self.url)
             response.raise_for_status()
             self.signals.finished.emit(response.content)
         except requests.RequestException as e:
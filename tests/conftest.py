@@ -0,0 +1,21 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PySide6.QtWidgets import QApplication
+from cinescope.core.media import Media, MediaStatus, SeasonProgress
+
+@pytest.fixture(scope="session")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+@pytest.fixture(scope="session")
+def make_media():
+    """Builds a Media with test defaults; series get two seasons of ten episodes."""
+    def make(media_id: int, type: str = "movie", status: MediaStatus = MediaStatus.PLAN_TO_WATCH, **fields):
+        if type == "series":
+            fields.setdefault("seasons", {"1": SeasonProgress(5, 10, 7.5), "2": SeasonProgress(0, 10, 8.0)})
+        defaults = dict(title=f"Title {media_id}", year="2020", poster_path=None, plot="", vote_average=7.0)
+        return Media(id=media_id, type=type, status=status, **{**defaults, **fields})
+    return make
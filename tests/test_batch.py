@@ -0,0 +1,103 @@
+import pytest
+from cinescope.core.data_manager import DataManager
+from cinescope.core.media import MediaStatus
+
+@pytest.fixture(params=["json", "sqlite"])
+def data_manager(request, tmp_path, make_media):
+    dm = DataManager(filename=str(tmp_path / "my_list.json"), backend=request.param)
+    for media_id in range(1, 4):
+        dm.add_media(make_media(media_id, type="series" if media_id == 3 else "movie"))
+    yield dm
+    dm.close()
+
+def _record(dm, writes, emits):
+    commit = dm.storage.commit
+    dm.storage.commit = lambda records, snapshot: (writes.append(len(records)), commit(records, snapshot))
+    dm.list_updated.connect(lambda: emits.append("list_updated"))
+    dm.bulk_changed.connect(lambda ids: emits.append(("bulk_changed", ids)))
+    dm.item_changed.connect(lambda media_id, names: emits.append("item_changed"))
+
+def test_batch_writes_and_notifies_once(data_manager, make_media):
+    writes, emits = [], []
+    _record(data_manager, writes, emits)
+
+    with data_manager.batch():
+        data_manager.update_media_status(1, MediaStatus.COMPLETED)
+        data_manager.update_media_status(2, MediaStatus.WATCHING)
+        data_manager.add_media(make_media(4))
+        data_manager.remove_media(3)
+
+    assert writes == [4]
+    assert emits == [("bulk_changed", {1: ["status"], 2: ["status"], 4: None, 3: None}), "list_updated"]
+
+def test_bulk_changed_unions_fields_per_item(data_manager, make_media):
+    writes, emits = [], []
+    _record(data_manager, writes, emits)
+
+    with data_manager.batch():
+        data_manager.update_media_fields(1, {"runtime": 100, "title": "Renamed"})
+        data_manager.update_media_status(1, MediaStatus.COMPLETED)
+        data_manager.update_media_fields(1, {"runtime": 110})
+        data_manager.add_media(make_media(4))
+        data_manager.update_media_status(4, MediaStatus.WATCHING)
+
+    assert emits[0] == ("bulk_changed", {1: ["runtime", "title", "status"], 4: None})
+
+def test_nested_batches_join_the_outermost(data_manager):
+    writes, emits = [], []
+    _record(data_manager, writes, emits)
+
+    with data_manager.batch():
+        data_manager.update_media_status(1, MediaStatus.DROPPED)
+        with data_manager.batch():
+            data_manager.update_media_status(2, MediaStatus.DROPPED)
+        assert writes == []
+
+    assert writes == [2]
+
+def test_empty_batch_writes_nothing(data_manager):
+    writes, emits = [], []
+    _record(data_manager, writes, emits)
+
+    with data_manager.batch():
+        pass
+
+    assert writes == [] and emits == []
+
+def test_rollback_restores_list_and_writes_nothing(data_manager, make_media):
+    writes, emits = [], []
+    _record(data_manager, writes, emits)
+    untouched = data_manager.get_media_by_id(1)
+
+    with pytest.raises(RuntimeError):
+        with data_manager.batch():
+            data_manager.update_media_status(1, MediaStatus.COMPLETED)
+            data_manager.add_media(make_media(4))
+            data_manager.remove_media(2)
+            data_manager.get_media_by_id(3).seasons["1"].episodesWatched = 9
+            data_manager.update_media_seasons(3, data_manager.get_media_by_id(3).seasons)
+            raise RuntimeError("import failed")
+
+    assert writes == [] and emits == []
+    assert [media.id for media in data_manager.get_list()] == [1, 2, 3]
+    assert data_manager.get_list_ids() == {1, 2, 3}
+    # Existing objects are reset in place, so references held by views stay valid
+    assert data_manager.get_media_by_id(1) is untouched
+    assert untouched.status is MediaStatus.PLAN_TO_WATCH
+    assert data_manager.get_media_by_id(3).seasons["1"].episodesWatched == 5
+    assert [media.id for media in data_manager.query(status=MediaStatus.COMPLETED)] == []
+    assert len(data_manager.query(status=MediaStatus.PLAN_TO_WATCH)) == 3
+
+def test_rollback_is_not_persisted(data_manager, tmp_path):
+    backend = "sqlite" if data_manager.storage.supports_queries else "json"
+    with pytest.raises(RuntimeError):
+        with data_manager.batch():
+            data_manager.update_media_status(1, MediaStatus.COMPLETED)
+            raise RuntimeError
+    data_manager.update_media_status(2, MediaStatus.WATCHING)
+    data_manager.close()
+
+    reloaded = DataManager(filename=str(tmp_path / "my_list.json"), backend=backend)
+    assert reloaded.get_media_by_id(1).status is MediaStatus.PLAN_TO_WATCH
+    assert reloaded.get_media_by_id(2).status is MediaStatus.WATCHING
+    reloaded.close()
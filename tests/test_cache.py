@@ -0,0 +1,149 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import pytest
+import requests
+from cinescope.api.cache import CachingTransport, ResponseCache, cache_key
+from cinescope.api.rate_limit import RateLimiter
+from cinescope.api.transport import HttpTransport
+
+HOST = "127.0.0.1"
+
+class StandIn(ThreadingHTTPServer):
+    """Local API stand-in; answers with an ETag per path and 304 when the client already has it."""
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__((HOST, 0), _Handler)
+        self.lock = threading.Lock()
+        self.calls = []
+        self.versions = {}
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        parts = urlsplit(self.path)
+        query = {name: values[0] for name, values in parse_qs(parts.query).items()}
+        with server.lock:
+            server.calls.append((parts.path, query, self.headers.get("If-None-Match")))
+            etag = f'"v{server.versions.get(parts.path, 1)}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = f'{{"path": "{parts.path}", "etag": {etag}}}'.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        if "no_store" in query:
+            self.send_header("Cache-Control", "no-store")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    server = StandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def cache(tmp_path):
+    # Entries under /stale are expired as soon as they are stored
+    cache = ResponseCache(str(tmp_path / "http_cache.db"), ttls={f"{HOST}/stale": 0}, default_ttl=3600)
+    yield cache
+    cache.close()
+
+def _get(transport, server, path, **params):
+    return transport.get(f"http://{HOST}:{server.server_port}{path}", params=params)
+
+def _transport(cache) -> CachingTransport:
+    return CachingTransport(cache, HttpTransport(limiter=RateLimiter({})))
+
+def _stored(size: int) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b"x" * size
+    return response
+
+def test_cache_key_strips_secrets_and_sorts():
+    key = cache_key("https://api.themoviedb.org/3/movie/550/?language=en&api_key=secret", {"append": "credits"})
+
+    assert key == "api.themoviedb.org/3/movie/550?append=credits&language=en"
+    assert cache_key("https://www.omdbapi.com/", {"apikey": "a", "i": "tt1"}) == \
+        cache_key("https://www.omdbapi.com/", {"i": "tt1", "apikey": "b"})
+
+def test_fresh_entries_skip_the_network(server, cache):
+    transport = _transport(cache)
+
+    first = _get(transport, server, "/fresh", api_key="one")
+    second = _get(transport, server, "/fresh", api_key="two")
+
+    assert second.json() == first.json()
+    assert len(server.calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_no_cache_request_and_no_store_response_bypass_the_cache(server, cache):
+    transport = _transport(cache)
+    _get(transport, server, "/fresh")
+
+    transport.get(f"http://{HOST}:{server.server_port}/fresh", headers={"Cache-Control": "no-cache"})
+    _get(transport, server, "/private", no_store=1)
+    _get(transport, server, "/private", no_store=1)
+
+    assert [call[0] for call in server.calls] == ["/fresh", "/fresh", "/private", "/private"]
+
+def test_stale_entries_revalidate_with_etag(server, cache):
+    transport = _transport(cache)
+    _get(transport, server, "/stale")
+
+    unchanged = _get(transport, server, "/stale")
+    server.versions["/stale"] = 2
+    changed = _get(transport, server, "/stale")
+
+    assert [call[2] for call in server.calls] == [None, '"v1"', '"v1"']
+    assert unchanged.status_code == 200 and unchanged.json()["etag"] == "v1"
+    assert changed.json()["etag"] == "v2"
+    assert cache.revalidated == 1
+
+def test_stale_entry_is_served_when_upstream_is_down(server, cache):
+    transport = _transport(cache)
+    url = f"http://{HOST}:{server.server_port}/stale"
+    transport.get(url)
+    server.shutdown()
+    server.server_close()
+
+    response = transport.get(url)
+
+    assert response.status_code == 200 and response.json()["path"] == "/stale"
+    with pytest.raises(requests.RequestException):
+        transport.get(f"http://{HOST}:{server.server_port}/never-cached")
+
+def test_eviction_drops_least_recently_used_until_under_the_cap(cache):
+    cache.max_bytes = 250
+    cache.store("a", _stored(100))
+    cache.store("b", _stored(100))
+    cache.lookup("a")  # Now b is the least recently used
+
+    cache.store("c", _stored(100))
+
+    assert cache.lookup("b") is None
+    assert cache.lookup("a") is not None and cache.lookup("c") is not None
+    assert cache.stats()["evictions"] == 1 and cache.stats()["bytes"] == 200
+
+def test_size_survives_reopening(tmp_path):
+    path = str(tmp_path / "http_cache.db")
+    cache = ResponseCache(path)
+    cache.store("a", _stored(10))
+    cache.store("a", _stored(30))
+    cache.close()
+
+    reopened = ResponseCache(path)
+    assert reopened.stats()["bytes"] == 30
+    reopened.close()
@@ -0,0 +1,115 @@
+import asyncio
+import datetime
+import pytest
+from cinescope.api.calendar_service import DAY, HOUR, CalendarService, refresh_interval, update_window
+from cinescope.core.id_index import IdIndex
+
+class FakeTVMaze:
+    """Shows 101, 102, ... for series 1, 2, ...; show ids in `failing` return no episodes."""
+
+    def __init__(self):
+        self.failing = set()
+        self.updates = {}
+        self.fetched = []
+        self.windows = []
+
+    async def lookup_show(self, imdb_id=None, tvdb_id=None):
+        return {"id": 100 + int(imdb_id[2:]), "externals": {"imdb": imdb_id}}
+
+    async def get_show_episodes(self, show_id, fresh=False):
+        self.fetched.append(show_id)
+        if show_id in self.failing:
+            return None
+        airstamp = (datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=3)).isoformat()
+        return {"status": "Running", "updated": self.updates.get(show_id, 1),
+                "_embedded": {"episodes": [{"airstamp": airstamp, "name": f"Episode of {show_id}",
+                                            "number": 1, "season": 1, "summary": ""}]}}
+
+    async def get_show_updates(self, since=None):
+        self.windows.append(since)
+        return dict(self.updates)
+
+    async def search_shows(self, query):
+        return []
+
+@pytest.fixture
+def calendar(tmp_path, make_media):
+    tvmaze = FakeTVMaze()
+    service = CalendarService(str(tmp_path / "calendar.json"), tvmaze=tvmaze,
+                              id_index=IdIndex(str(tmp_path / "id_index.json")), runner=object())
+    series = [make_media(media_id, type="series", imdb_id=f"tt{media_id}") for media_id in (1, 2)]
+    return service, tvmaze, series
+
+def _sync(service, series, force=False):
+    asyncio.run(service._refresh(series, force))
+
+def test_first_sync_fetches_every_show(calendar):
+    service, tvmaze, series = calendar
+
+    _sync(service, series)
+
+    assert sorted(tvmaze.fetched) == [101, 102]
+    assert [episode["showId"] for episode in service.upcoming(series)] == [101, 102]
+    assert service.synced_at is not None
+
+def test_later_syncs_fetch_only_updated_shows(calendar):
+    service, tvmaze, series = calendar
+    _sync(service, series)
+    tvmaze.fetched.clear()
+    tvmaze.updates = {101: 1, 102: 50}
+
+    _sync(service, series)
+
+    assert tvmaze.fetched == [102]
+    assert tvmaze.windows == ["day"]
+
+def test_failed_fetch_is_retried_after_the_feed_window_moves_on(calendar):
+    service, tvmaze, series = calendar
+    _sync(service, series)
+    # Show 102 changes, but its fetch fails
+    tvmaze.updates = {102: 50}
+    tvmaze.failing = {102}
+    _sync(service, series)
+    assert service.upcoming(series)  # The old schedule is kept meanwhile
+
+    # A day later the change has dropped out of the feed window
+    tvmaze.updates = {}
+    tvmaze.failing = set()
+    tvmaze.fetched.clear()
+    _sync(service, series)
+
+    assert tvmaze.fetched == [102]
+    # Once fetched it is left alone again
+    tvmaze.fetched.clear()
+    _sync(service, series)
+    assert tvmaze.fetched == []
+
+def test_failed_state_survives_a_restart(calendar, tmp_path):
+    service, tvmaze, series = calendar
+    _sync(service, series)
+    tvmaze.updates = {101: 50}
+    tvmaze.failing = {101}
+    _sync(service, series)
+
+    reopened = CalendarService(service.path, tvmaze=tvmaze, id_index=service.id_index, runner=object())
+    tvmaze.updates = {}
+    tvmaze.failing = set()
+    tvmaze.fetched.clear()
+    _sync(reopened, series)
+
+    assert tvmaze.fetched == [101]
+
+def test_refresh_interval():
+    today = datetime.date.today()
+
+    assert refresh_interval(None, "Ended") is None
+    assert refresh_interval(today, "Running") == HOUR
+    assert refresh_interval(today + datetime.timedelta(days=8), "Running") == 2 * DAY
+    assert refresh_interval(today + datetime.timedelta(days=90), "Running") == 7 * DAY
+    assert refresh_interval(None, "Running") == DAY
+
+def test_update_window():
+    assert update_window(HOUR) == "day"
+    assert update_window(3 * DAY) == "week"
+    assert update_window(10 * DAY) == "month"
+    assert update_window(60 * DAY) is None
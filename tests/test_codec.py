@@ -0,0 +1,106 @@
+import json
+from cinescope.core.codec import decode_media, encode_media
+from cinescope.core.data_manager import DataManager
+from cinescope.core.media import Episode, EpisodeList, Media, MediaStatus, SeasonProgress
+
+def _stored(**overrides) -> dict:
+    item = {"id": 1, "title": "Title", "year": "2020", "type": "series", "poster_path": "/p.jpg",
+            "plot": "Plot", "vote_average": 7.5, "status": "Watching"}
+    item.update(overrides)
+    return item
+
+def test_round_trip_restores_types(make_media):
+    media = make_media(1, type="series", status=MediaStatus.WATCHING, genres=[{"id": 18, "name": "Drama"}],
+                       episode_run_time=[45], seasons={"1": SeasonProgress(2, 3, 8.1, [Episode(1, "Pilot", 7.9)])})
+
+    stored = json.loads(json.dumps(encode_media(media)))
+    decoded = decode_media(stored)
+
+    assert decoded == media
+    assert decoded.status is MediaStatus.WATCHING
+    assert type(decoded.seasons["1"]) is SeasonProgress
+    assert type(decoded.seasons["1"].episodes) is EpisodeList
+    assert decoded.seasons["1"].episodes[0] == Episode(1, "Pilot", 7.9)
+    assert encode_media(decoded) == stored
+
+def test_status_spellings():
+    for spelling in ("Watching", "WATCHING", "MediaStatus.WATCHING"):
+        assert decode_media(_stored(status=spelling)).status is MediaStatus.WATCHING
+    # Encoding always writes the value
+    assert encode_media(decode_media(_stored(status="MediaStatus.WATCHING")))["status"] == "Watching"
+
+def test_missing_and_null_fields_take_defaults():
+    missing = decode_media(_stored())
+    null = decode_media(_stored(genres=None, imdb_id=None, runtime=None, episode_run_time=None, seasons=None))
+
+    for media in (missing, null):
+        assert media.genres == []
+        assert media.imdb_id is None
+        assert media.runtime is None
+        assert media.episode_run_time == []
+        assert media.seasons == {}
+    # Defaults are fresh per item, not shared
+    assert missing.genres is not null.genres
+
+def test_null_episodes_and_season_fields():
+    media = decode_media(_stored(seasons={"1": {"episodesWatched": 1, "totalEpisodes": 2, "episodes": None}}))
+
+    assert media.seasons["1"].vote_average is None
+    assert media.seasons["1"].episodes == []
+
+def test_stray_name_key_is_ignored():
+    media = decode_media(_stored(name="Title"))
+
+    assert media.title == "Title"
+    assert "name" not in encode_media(media)
+
+def test_repr_string_seasons_are_parsed():
+    # Files written with default=str stored unserializable seasons as their repr()
+    legacy = ("SeasonProgress(episodesWatched=3, totalEpisodes=10, vote_average=7.25, "
+              "episodes=[Episode(episode_number=1, name='Pilot, Part 1', vote_average=8.0)])")
+    media = decode_media(_stored(seasons={"1": legacy, "2": {"episodesWatched": 4, "totalEpisodes": 8},
+                                          "3": "not a repr(", "4": "SeasonProgress(totalEpisodes=len(x))",
+                                          "5": "SeasonProgress(vote_average=1.0)"}))
+
+    assert list(media.seasons) == ["1", "2"]
+    assert media.seasons["1"] == SeasonProgress(3, 10, 7.25, [Episode(1, "Pilot, Part 1", 8.0)])
+    assert media.seasons["2"] == SeasonProgress(4, 8)
+
+def test_baseline_file_survives_load_and_save(tmp_path):
+    # What the original save_list() wrote: item.__dict__ through json.dump(default=str)
+    filepath = tmp_path / "my_list.json"
+    filepath.write_text(json.dumps([{
+        "id": 1, "title": "Title", "year": "2020", "type": "series", "poster_path": None, "plot": "Plot",
+        "vote_average": 7.5, "status": "MediaStatus.WATCHING", "genres": [], "imdb_id": None, "tvdb_id": None,
+        "runtime": None, "episode_run_time": [45], "number_of_seasons": 2, "production_status": "Ended",
+        "seasons": {
+            "1": "SeasonProgress(episodesWatched=4, totalEpisodes=10, vote_average=8.1, episodes=[])",
+            "2": "SeasonProgress(episodesWatched=0, totalEpisodes=10, vote_average=None, episodes=[])",
+        },
+    }], indent=4))
+    expected = {"1": SeasonProgress(4, 10, 8.1), "2": SeasonProgress(0, 10)}
+
+    dm = DataManager(filename=str(filepath))
+    dm.update_media_status(1, MediaStatus.COMPLETED)
+    dm.close()
+    reloaded = DataManager(filename=str(filepath))
+    assert reloaded.get_media_by_id(1).seasons == expected
+    assert reloaded.get_media_by_id(1).status is MediaStatus.COMPLETED
+
+    # A full snapshot rewrites the seasons as plain dicts
+    reloaded.save_list()
+    reloaded.close()
+    stored = json.loads(filepath.read_text())[0]
+    assert stored["seasons"]["1"] == {"episodesWatched": 4, "totalEpisodes": 10, "vote_average": 8.1, "episodes": []}
+    assert stored["status"] == "Completed"
+
+def test_integer_season_keys_become_strings():
+    assert list(decode_media(_stored(seasons={1: {"episodesWatched": 0, "totalEpisodes": 1}})).seasons) == ["1"]
+
+def test_decoding_objects_is_a_no_op():
+    season = SeasonProgress(1, 2)
+    media = decode_media(_stored(status=MediaStatus.DROPPED, seasons={"1": season}))
+
+    assert media.status is MediaStatus.DROPPED
+    assert media.seasons["1"] is season
+    assert isinstance(media, Media)
@@ -0,0 +1,126 @@
+import asyncio
+from concurrent.futures import Future
+from cinescope.api.episode_service import EpisodeService, merge_seasons, seasons_to_fetch
+from cinescope.api.tmdb_client import MAX_APPENDED
+from cinescope.core.media import Episode, EpisodeList, SeasonProgress
+
+class FakeTMDb:
+    """A show of `seasons` seasons with three episodes each; records every appended chunk."""
+
+    def __init__(self, seasons):
+        self.seasons = seasons
+        self.calls = []
+        self.failing = False
+
+    async def get_tv_seasons(self, tmdb_id, season_numbers):
+        self.calls.append(list(season_numbers))
+        if self.failing:
+            return None
+        data = {"id": tmdb_id, "seasons": [{"season_number": number, "episode_count": 3, "vote_average": 7.0}
+                                           for number in range(1, self.seasons + 1)]}
+        for number in season_numbers:
+            data[f"season/{number}"] = {"vote_average": 7.0, "episodes": [
+                {"episode_number": episode, "name": f"S{number}E{episode}", "vote_average": 8.0}
+                for episode in range(1, 4)]}
+        return data
+
+class FakeRunner:
+    """Runs a submitted coroutine to completion on the spot."""
+
+    def submit(self, coro):
+        future = Future()
+        future.set_result(asyncio.run(coro))
+        return future
+
+def _service(seasons):
+    service = EpisodeService(tmdb_client=None, runner=FakeRunner())
+    service.tmdb = FakeTMDb(seasons)
+    return service
+
+def _episodes(count):
+    return [Episode(number, f"Episode {number}", 7.0) for number in range(1, count + 1)]
+
+def _series(make_media, status, **seasons):
+    return make_media(1, type="series", production_status=status,
+                      seasons={number.lstrip("s"): season for number, season in seasons.items()})
+
+def test_ended_show_fetches_only_incomplete_seasons(make_media):
+    media = _series(make_media, "Ended",
+                    s1=SeasonProgress(3, 3, 7.0, _episodes(3)),
+                    s2=SeasonProgress(0, 4, 7.0, _episodes(2)),
+                    s3=SeasonProgress(0, 5, 7.0))
+
+    assert seasons_to_fetch(media) == ["2", "3"]
+
+def test_seasons_without_episodes_are_not_requested_again(make_media):
+    media = _series(make_media, "Ended",
+                    s0=SeasonProgress(0, 0, 0),
+                    s1=SeasonProgress(3, 3, 7.0, _episodes(3)),
+                    s2=SeasonProgress(0, 0, 0))
+
+    assert seasons_to_fetch(media) == []
+
+def test_running_show_keeps_its_latest_season_due(make_media):
+    media = _series(make_media, "Returning Series",
+                    s0=SeasonProgress(0, 0, 0),
+                    s1=SeasonProgress(3, 3, 7.0, _episodes(3)),
+                    s2=SeasonProgress(0, 0, 0))
+
+    # Season 2 is announced but empty; it is the one that gains episodes
+    assert seasons_to_fetch(media) == ["2"]
+
+def test_merge_keeps_watched_counts_and_stored_episodes():
+    stored = {"1": SeasonProgress(3, 3, 7.0, _episodes(3)), "2": SeasonProgress(8, 10, 7.0)}
+    fetched = {"1": SeasonProgress(0, 3, 7.5), "2": SeasonProgress(0, 6, 8.0, _episodes(6))}
+
+    merged = merge_seasons(stored, fetched)
+
+    assert merged["1"].episodesWatched == 3 and merged["1"].episodes == _episodes(3)
+    assert merged["1"].vote_average == 7.5
+    assert merged["2"].episodesWatched == 6 and len(merged["2"].episodes) == 6
+
+def test_fetch_appends_seasons_in_chunks():
+    service = _service(30)
+
+    fetched = asyncio.run(service.fetch(1, [str(number) for number in range(1, 31)]))
+
+    assert MAX_APPENDED == 20
+    assert [len(chunk) for chunk in service.tmdb.calls] == [20, 10]
+    assert sorted(fetched, key=int) == [str(number) for number in range(1, 31)]
+    season = fetched["30"]
+    assert isinstance(season.episodes, EpisodeList)
+    assert season.episodes == [Episode(number, f"S30E{number}", 8.0) for number in range(1, 4)]
+
+def test_fetch_keeps_summaries_of_seasons_not_requested():
+    service = _service(3)
+
+    fetched = asyncio.run(service.fetch(1, ["3"]))
+
+    assert service.tmdb.calls == [["3"]]
+    assert fetched["1"] == SeasonProgress(0, 3, 7.0)
+    assert len(fetched["3"].episodes) == 3
+
+def test_fetch_returns_none_when_every_request_fails():
+    service = _service(3)
+    service.tmdb.failing = True
+
+    assert asyncio.run(service.fetch(1, ["1", "2"])) is None
+
+def test_enrich_emits_the_due_seasons(qapp, make_media):
+    service = _service(2)
+    ready = []
+    service.episodes_ready.connect(lambda tmdb_id, fetched: ready.append((tmdb_id, fetched)))
+    media = _series(make_media, "Ended",
+                    s1=SeasonProgress(3, 3, 7.0, _episodes(3)),
+                    s2=SeasonProgress(1, 3, 7.0))
+
+    assert service.enrich(media) is True
+
+    assert service.tmdb.calls == [["2"]]
+    [(tmdb_id, fetched)] = ready
+    merged = merge_seasons(media.seasons, fetched)
+    assert tmdb_id == 1 and merged["2"].episodesWatched == 1
+    assert merged["2"].episodes == [Episode(number, f"S2E{number}", 8.0) for number in range(1, 4)]
+    # Nothing is due for movies, and nothing is pending once the fetch is done
+    assert service.enrich(make_media(2)) is False
+    assert service._pending == set()
@@ -0,0 +1,91 @@
+import json
+from cinescope.core.id_index import IdIndex, find_results, tmdb_source
+
+def _index(tmp_path) -> IdIndex:
+    return IdIndex(str(tmp_path / "id_index.json"))
+
+def test_link_makes_every_id_find_the_others(tmp_path):
+    index = _index(tmp_path)
+    index.link(tmdb_tv=1399, imdb="tt0944947", tvdb=None)
+
+    expected = {"tmdb_tv": 1399, "imdb": "tt0944947"}
+    assert index.lookup("tmdb_tv", 1399) == expected
+    assert index.lookup("imdb", "tt0944947") == expected
+    assert index.lookup("tvdb", None) is None
+    assert index.lookup("tmdb_movie", 1399) is None
+
+def test_links_through_a_shared_id_merge(tmp_path):
+    index = _index(tmp_path)
+    index.link(tmdb_tv=1, imdb="tt1")
+    index.link(tvdb=5, tvmaze=10)
+
+    index.link(imdb="tt1", tvmaze=10)
+
+    merged = {"tmdb_tv": 1, "imdb": "tt1", "tvdb": 5, "tvmaze": 10}
+    for source, value in merged.items():
+        assert index.lookup(source, value) == merged
+
+def test_new_ids_override_old_ones(tmp_path):
+    index = _index(tmp_path)
+    index.link(tmdb_tv=1, tvmaze=10)
+
+    # TVMaze merged its duplicate show into 11
+    index.link(tmdb_tv=1, tvmaze=11)
+
+    assert index.lookup("tmdb_tv", 1) == {"tmdb_tv": 1, "tvmaze": 11}
+    assert index.lookup("tvmaze", 10) is None
+
+def test_lookup_returns_a_copy(tmp_path):
+    index = _index(tmp_path)
+    index.link(tmdb_movie=550, imdb="tt0137523")
+
+    index.lookup("tmdb_movie", 550)["imdb"] = "changed"
+
+    assert index.lookup("imdb", "tt0137523") == {"tmdb_movie": 550, "imdb": "tt0137523"}
+
+def test_save_and_reload_round_trip(tmp_path):
+    index = _index(tmp_path)
+    index.link(tmdb_tv=1, imdb="tt1", tvmaze=10)
+    index.link(tmdb_movie=2, imdb="tt2")
+    index.put_imdb("tt2", [{"id": 2, "media_type": "movie", "title": "Two"}])
+    index.put_imdb("tt404", [])
+    index.save()
+
+    reloaded = _index(tmp_path)
+
+    assert reloaded.lookup("tvmaze", 10) == {"tmdb_tv": 1, "imdb": "tt1", "tvmaze": 10}
+    assert reloaded.get_imdb("tt2") == [{"id": 2, "media_type": "movie", "title": "Two"}]
+    assert reloaded.get_imdb("tt404") == []
+    assert reloaded.get_imdb("tt3") is None
+    # Each title is stored once, however many ids point at it
+    assert len(json.loads((tmp_path / "id_index.json").read_text())["links"]) == 2
+    # Reloaded ids still share one mapping, so a later override moves every id along
+    reloaded.link(tmdb_tv=1, tvmaze=11)
+    assert reloaded.lookup("imdb", "tt1") == {"tmdb_tv": 1, "imdb": "tt1", "tvmaze": 11}
+
+def test_save_skips_unchanged_index(tmp_path):
+    index = _index(tmp_path)
+    index.save()
+    assert not (tmp_path / "id_index.json").exists()
+
+    index.link(tmdb_tv=1, imdb="tt1")
+    index.save()
+    (tmp_path / "id_index.json").write_text("sentinel")
+    # Linking what is already known changes nothing
+    index.link(imdb="tt1", tmdb_tv=1)
+    index.save()
+
+    assert (tmp_path / "id_index.json").read_text() == "sentinel"
+
+def test_unreadable_file_is_ignored(tmp_path):
+    (tmp_path / "id_index.json").write_text("{not json")
+
+    assert _index(tmp_path).lookup("imdb", "tt1") is None
+
+def test_find_results_and_sources():
+    data = {"movie_results": [{"id": 1, "title": "Film", "popularity": 9.0}],
+            "tv_results": [{"id": 2, "name": "Show", "media_type": "tv"}]}
+
+    assert find_results(data) == [{"id": 1, "title": "Film", "media_type": "movie"},
+                                  {"id": 2, "name": "Show", "media_type": "tv"}]
+    assert tmdb_source("series") == "tmdb_tv" and tmdb_source("movie") == "tmdb_movie"
@@ -0,0 +1,86 @@
+import json
+from cinescope.core.codec import encode_media
+from cinescope.core.data_manager import DataManager
+from cinescope.core.journal import ChangeJournal
+from cinescope.core.media import MediaStatus
+from cinescope.core.storage import JsonStorage
+
+def test_journal_round_trip(tmp_path):
+    journal = ChangeJournal(str(tmp_path / "list.journal"))
+    journal.append([{"op": "remove", "id": 1}, {"op": "remove", "id": 2}])
+    journal.append([{"op": "remove", "id": 3}])
+    journal.close()
+
+    assert [record["id"] for record in journal.replay()] == [1, 2, 3]
+    assert journal.entries == 3
+
+def test_torn_last_line_is_truncated(tmp_path):
+    path = tmp_path / "list.journal"
+    path.write_text('{"op":"remove","id":1}\n{"op":"remove","id":2}\n{"op":"upd')
+    journal = ChangeJournal(str(path))
+
+    assert [record["id"] for record in journal.replay()] == [1, 2]
+    assert path.read_text() == '{"op":"remove","id":1}\n{"op":"remove","id":2}\n'
+    # Later appends land on a clean line
+    journal.append([{"op": "remove", "id": 3}])
+    journal.close()
+    assert [record["id"] for record in journal.replay()] == [1, 2, 3]
+
+def test_replay_on_top_of_snapshot(tmp_path, make_media):
+    filepath = str(tmp_path / "my_list.json")
+    with open(filepath, "w") as f:
+        json.dump([encode_media(make_media(1)), encode_media(make_media(2))], f)
+    journal = ChangeJournal(str(tmp_path / "my_list.journal"))
+    journal.append([
+        {"op": "add", "media": encode_media(make_media(3))},
+        {"op": "update", "id": 1, "fields": {"status": "Completed"}},
+        {"op": "remove", "id": 2},
+    ])
+    journal.close()
+
+    items = JsonStorage(filepath).load()
+
+    assert [media.id for media in items] == [1, 3]
+    assert items[0].status is MediaStatus.COMPLETED
+
+def test_mutations_append_without_rewriting_snapshot(tmp_path, make_media):
+    filepath = str(tmp_path / "my_list.json")
+    dm = DataManager(filename=filepath)
+    dm.add_media(make_media(1))
+    dm.update_media_status(1, MediaStatus.WATCHING)
+    dm.close()
+
+    journal_lines = (tmp_path / "my_list.journal").read_text().splitlines()
+    assert len(journal_lines) == 2
+    assert json.loads(journal_lines[-1]) == {"op": "update", "id": 1, "fields": {"status": "Watching"}}
+    assert not (tmp_path / "my_list.json").exists()
+    assert DataManager(filename=filepath).get_media_by_id(1).status is MediaStatus.WATCHING
+
+def test_compaction_resets_journal(tmp_path, make_media):
+    filepath = str(tmp_path / "my_list.json")
+    dm = DataManager(filename=filepath)
+    dm.storage.journal.max_entries = 5
+    for media_id in range(12):
+        dm.add_media(make_media(media_id))
+        dm.storage.scheduler.flush()
+    dm.close()
+
+    # Twelve appends with a threshold of five: two compactions, two records left in the log
+    with open(filepath) as f:
+        assert len(json.load(f)) == 10
+    assert len((tmp_path / "my_list.journal").read_text().splitlines()) == 2
+    assert [media.id for media in DataManager(filename=filepath).get_list()] == list(range(12))
+
+def test_close_flushes_pending_snapshot(tmp_path, qapp, make_media):
+    filepath = str(tmp_path / "my_list.json")
+    # With an application running, writes wait for the (long) save window
+    dm = DataManager(filename=filepath, save_delay_ms=60_000)
+    dm.add_media(make_media(1))
+    dm.save_list()
+    assert not (tmp_path / "my_list.json").exists()
+
+    dm.close()
+
+    with open(filepath) as f:
+        assert [item["id"] for item in json.load(f)] == [1]
+    assert not (tmp_path / "my_list.journal").exists()
@@ -0,0 +1,157 @@
+import pytest
+from cinescope.core.data_manager import DataManager
+from cinescope.core.lazy_seasons import LazySeasons, SeasonCache, pack_seasons
+from cinescope.core.media import Episode, MediaStatus, SeasonProgress
+from cinescope.core.storage import CompactStorage, SqliteStorage
+
+def _seasons():
+    return {"1": SeasonProgress(5, 10, 7.5, [Episode(1, "Pilot", 8.0)]), "2": SeasonProgress(0, 10, 8.0)}
+
+def _backend(dm) -> str:
+    return {SqliteStorage: "sqlite", CompactStorage: "compact"}.get(type(dm.storage), "json")
+
+def _packed() -> LazySeasons:
+    return LazySeasons(2, 5, 20, payload=pack_seasons(_seasons()))
+
+@pytest.fixture(params=["json", "sqlite", "compact"])
+def reopened(request, tmp_path, make_media):
+    """A library of series reopened from disk, so every title's seasons start out packed."""
+    filepath = str(tmp_path / "my_list.json")
+    dm = DataManager(filename=filepath, backend=request.param)
+    for media_id in range(1, 5):
+        dm.add_media(make_media(media_id, type="series", status=MediaStatus.WATCHING, seasons=_seasons()))
+    # A full snapshot, so nothing is replayed from the journal on reopening
+    dm.save_list()
+    dm.close()
+    dm = DataManager(filename=filepath, backend=request.param, season_cache_size=2)
+    yield dm
+    dm.close()
+
+def test_aggregates_without_materializing():
+    seasons = _packed()
+
+    assert len(seasons) == 2
+    assert seasons.totals() == (5, 20)
+    assert not seasons.loaded
+    assert seasons == _seasons()
+    assert seasons.loaded
+
+def test_release_packs_edits():
+    seasons = _packed()
+    seasons["1"].episodesWatched = 9
+    seasons["3"] = SeasonProgress(1, 4)
+
+    seasons.release()
+
+    assert not seasons.loaded
+    assert seasons.totals() == (10, 24)
+    assert seasons["1"].episodesWatched == 9 and list(seasons) == ["1", "2", "3"]
+
+def test_copy_is_independent():
+    seasons = _packed()
+    copy = seasons.copy()
+    seasons["1"].episodesWatched = 9
+    seasons.release()
+
+    assert copy["1"].episodesWatched == 5
+    assert copy.totals() == (5, 20)
+
+def test_cache_evicts_least_recently_used():
+    cache = SeasonCache(capacity=2)
+    a, b, c = _packed(), _packed(), _packed()
+    for seasons in (a, b, c):
+        cache.attach(seasons)
+        seasons.materialize()
+
+    assert not a.loaded and b.loaded and c.loaded
+
+def test_materialize_never_evicts_itself():
+    cache = SeasonCache(capacity=1)
+    pinned, other = _packed(), _packed()
+    cache.attach(pinned)
+    cache.attach(other)
+    cache.pin(pinned)
+
+    assert other["1"].episodesWatched == 5
+    assert pinned.loaded
+
+def test_zero_capacity_still_returns_data():
+    cache = SeasonCache(capacity=0)
+    seasons = _packed()
+    cache.attach(seasons)
+    cache.pin(seasons)
+
+    assert seasons["2"].totalEpisodes == 10
+
+def test_rollback_discards_edits_to_packed_seasons(reopened):
+    media = reopened.get_media_by_id(1)
+    assert isinstance(media.seasons, LazySeasons) and not media.seasons.loaded
+
+    with pytest.raises(RuntimeError):
+        with reopened.batch():
+            media.seasons["1"].episodesWatched = 9
+            reopened.update_media_seasons(1, media.seasons)
+            raise RuntimeError
+
+    assert media.seasons["1"].episodesWatched == 5
+    # The next write for the title must not persist the rolled-back value
+    reopened.update_media_status(1, MediaStatus.COMPLETED)
+    reopened.close()
+    filepath, backend = reopened.filepath, _backend(reopened)
+    reloaded = DataManager(filename=filepath, backend=backend)
+    assert reloaded.get_media_by_id(1).seasons["1"].episodesWatched == 5
+    assert reloaded.get_media_by_id(1).status is MediaStatus.COMPLETED
+    reloaded.close()
+
+def test_restored_seasons_stay_bounded(reopened):
+    with pytest.raises(RuntimeError):
+        with reopened.batch():
+            reopened.update_media_status(1, MediaStatus.DROPPED)
+            raise RuntimeError
+
+    for media in reopened.get_list():
+        media.seasons.materialize()
+
+    assert sum(media.seasons.loaded for media in reopened.get_list()) == 2
+
+def test_open_and_release_details(reopened):
+    shown = reopened.open_details(reopened.get_media_by_id(1))
+    for media in reopened.get_list():
+        media.seasons.materialize()
+    assert shown.seasons.loaded
+
+    reopened.release_details()
+
+    assert not any(media.seasons.loaded for media in reopened.get_list())
+
+def test_pack_reads_plain_dicts_and_legacy_reprs():
+    seasons = LazySeasons.pack({
+        "1": {"episodesWatched": 5, "totalEpisodes": 10, "vote_average": 7.5,
+              "episodes": [{"episode_number": 1, "name": "Pilot", "vote_average": 8.0}]},
+        "2": "SeasonProgress(episodesWatched=0, totalEpisodes=10, vote_average=8.0, episodes=[])",
+    })
+
+    assert not seasons.loaded and seasons.totals() == (5, 20) and len(seasons) == 2
+    assert seasons == _seasons()
+
+def test_merged_seasons_stay_packable(reopened):
+    media = reopened.open_details(reopened.get_media_by_id(1))
+    lazy = media.seasons
+    # What the details view does with episodes_ready: merge into a plain dict and store it
+    merged = dict(media.seasons, **{"3": SeasonProgress(0, 6, 7.0)})
+
+    reopened.update_media_seasons(1, merged)
+
+    assert media.seasons is lazy and media.seasons.loaded
+    reopened.release_details()
+    assert not media.seasons.loaded
+    assert media.seasons.totals() == (5, 26) and list(media.seasons) == ["1", "2", "3"]
+
+def test_new_titles_are_packable(reopened, make_media):
+    reopened.add_media(make_media(10, type="series", seasons=_seasons()))
+
+    reopened.release_details()
+
+    media = reopened.get_media_by_id(10)
+    assert isinstance(media.seasons, LazySeasons) and not media.seasons.loaded
+    assert media.seasons == _seasons()
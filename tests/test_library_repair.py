@@ -0,0 +1,117 @@
+import asyncio
+import pytest
+from cinescope.api.details_fill import DetailsFill
+from cinescope.api.library_repair import LibraryRepair
+from cinescope.api.runtime_backfill import RuntimeBackfill
+from cinescope.core.data_manager import DataManager
+from cinescope.core.media import MediaStatus, SeasonProgress
+
+class FakeTMDb:
+    """Details for every id except those in `missing`, with no runtime for `no_runtime`; records the requests."""
+
+    def __init__(self):
+        self.missing = set()
+        self.no_runtime = set()
+        self.calls = []
+
+    async def get_details(self, media_type, tmdb_id, fresh=False):
+        self.calls.append((tmdb_id, fresh))
+        if tmdb_id in self.missing:
+            return None
+        details = {"id": tmdb_id, "title": f"Fetched {tmdb_id}", "overview": "New plot", "vote_average": 8.0,
+                   "status": "Released"}
+        if tmdb_id in self.no_runtime:
+            return details
+        if media_type == 'movie':
+            return dict(details, runtime=90 + tmdb_id)
+        return dict(details, episode_run_time=[], last_episode_to_air={"runtime": 40 + tmdb_id},
+                    seasons=[{"season_number": 1, "episode_count": 12, "vote_average": 7.0}])
+
+@pytest.fixture
+def library(tmp_path, make_media):
+    dm = DataManager(filename=str(tmp_path / "my_list.json"), backend="json")
+    dm.add_media(make_media(1, status=MediaStatus.COMPLETED))
+    dm.add_media(make_media(2, status=MediaStatus.PLAN_TO_WATCH))
+    dm.add_media(make_media(3, type="series", status=MediaStatus.WATCHING))
+    dm.add_media(make_media(4, status=MediaStatus.WATCHING, runtime=120))
+    yield dm
+    dm.close()
+
+def _create(cls, dm, tmp_path):
+    task = cls(dm, tmdb_client=None, checkpoint_path=str(tmp_path / f"{cls.name}.jsonl"), runner=object())
+    task.tmdb = FakeTMDb()
+    results = []
+    task.finished.connect(lambda updated, failed: results.append((updated, failed)))
+    return task, results
+
+def _run(task):
+    targets = task.targets()
+    asyncio.run(task._run(targets))
+    return targets
+
+def test_repair_refreshes_every_title_and_keeps_progress(qapp, library, tmp_path):
+    repair, results = _create(LibraryRepair, library, tmp_path)
+    repair.tmdb.missing = {2}
+
+    _run(repair)
+
+    assert sorted(repair.tmdb.calls) == [(1, True), (2, True), (3, True), (4, True)]
+    assert results == [(3, 1)]
+    assert library.get_media_by_id(1).title == "Fetched 1"
+    assert library.get_media_by_id(2).title == "Title 2"
+    series = library.get_media_by_id(3)
+    assert series.status is MediaStatus.WATCHING
+    assert series.seasons["1"] == SeasonProgress(5, 12, 7.0)
+    assert list(repair.checkpoint.replay()) == []
+
+def test_backfill_fetches_only_counted_titles_missing_a_runtime(qapp, library, tmp_path):
+    backfill, results = _create(RuntimeBackfill, library, tmp_path)
+
+    assert _run(backfill) == [(1, 'movie'), (3, 'tv')]
+
+    assert backfill.tmdb.calls == [(1, False), (3, False)]
+    assert results == [(2, 0)]
+    assert library.get_media_by_id(1).runtime == 91
+    assert library.get_media_by_id(3).episode_run_time == [43]
+    # Only the runtime fields are written back
+    assert library.get_media_by_id(1).title == "Title 1"
+    assert library.get_media_by_id(3).seasons["1"] == SeasonProgress(5, 10, 7.5)
+
+def test_backfill_does_not_ask_again_about_unknown_runtimes(qapp, library, tmp_path):
+    backfill, results = _create(RuntimeBackfill, library, tmp_path)
+    backfill.tmdb.no_runtime = {1}
+    _run(backfill)
+
+    assert library.get_media_by_id(1).runtime is None
+    assert backfill.targets() == []
+    assert backfill.start() is False
+
+def test_backfill_retries_failed_requests(qapp, library, tmp_path):
+    backfill, results = _create(RuntimeBackfill, library, tmp_path)
+    backfill.tmdb.missing = {1}
+    _run(backfill)
+    assert results == [(1, 1)]
+
+    backfill.tmdb.missing = set()
+    assert _run(backfill) == [(1, 'movie')]
+
+    assert library.get_media_by_id(1).runtime == 91
+
+def test_details_fill_completes_placeholders_only(qapp, library, tmp_path):
+    for tmdb_id in (1, 3, 4):
+        library.update_media_fields(tmdb_id, {"production_status": "Released"})
+    fill, results = _create(DetailsFill, library, tmp_path)
+    fill.tmdb.missing = {2}
+
+    assert _run(fill) == [(2, 'movie')]
+    assert results == [(0, 1)]
+    # A failed title stays a placeholder for the next start
+    assert fill.targets() == [(2, 'movie')]
+
+    fill.tmdb.missing = set()
+    _run(fill)
+
+    placeholder = library.get_media_by_id(2)
+    assert placeholder.title == "Fetched 2" and placeholder.production_status == "Released"
+    assert placeholder.status is MediaStatus.PLAN_TO_WATCH
+    assert fill.targets() == []
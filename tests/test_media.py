@@ -0,0 +1,101 @@
+import math
+import pytest
+from cinescope.core.media import Episode, EpisodeList, Media, MediaStatus, SeasonProgress, intern_genre
+
+def _episodes():
+    return [Episode(1, "Pilot", 7.8), Episode(2, "Second", None), Episode(None, "Special", 8.125)]
+
+def test_round_trips_through_rows_and_plain():
+    episodes = EpisodeList(_episodes())
+
+    assert list(episodes) == _episodes()
+    assert episodes.rows() == [[1, "Pilot", 7.8], [2, "Second", None], [None, "Special", 8.125]]
+    assert EpisodeList.from_rows(episodes.rows()) == episodes
+    assert episodes.to_plain()[1] == {"episode_number": 2, "name": "Second", "vote_average": None}
+    assert EpisodeList.from_plain(episodes.to_plain()) == episodes
+
+def test_missing_values_use_sentinels():
+    episodes = EpisodeList.from_rows([[None, None, None]])
+
+    assert episodes._numbers[0] == -2 ** 31
+    assert math.isnan(episodes._ratings[0])
+    assert episodes[0] == Episode(None, None, None)
+
+def test_ratings_are_float32_rounded_to_three_decimals():
+    episodes = EpisodeList.from_rows([[1, "a", 7.1], [2, "b", 8.333], [3, "c", 6.66666], [4, "d", 0]])
+
+    # float32 alone would return 7.099999904632568
+    assert [episode.vote_average for episode in episodes] == [7.1, 8.333, 6.667, 0]
+
+def test_from_plain_accepts_objects_and_passes_lists_through():
+    episodes = EpisodeList(_episodes())
+
+    assert EpisodeList.from_plain(episodes) is episodes
+    assert EpisodeList.from_plain(_episodes()) == episodes
+    assert len(EpisodeList.from_plain(["not an episode", None])) == 0
+
+def test_indexing():
+    episodes = EpisodeList(_episodes())
+
+    assert episodes[-1].name == "Special"
+    assert episodes[0:2] == _episodes()[0:2]
+    assert episodes[::-1] == _episodes()[::-1]
+    with pytest.raises(IndexError):
+        episodes[3]
+
+def test_returned_episodes_are_copies():
+    episodes = EpisodeList(_episodes())
+    episode = episodes[0]
+    episode.name = "Renamed"
+
+    assert episodes[0].name == "Pilot"
+    episodes[0] = episode
+    assert episodes[0].name == "Renamed"
+
+def test_setitem_slices():
+    episodes = EpisodeList(_episodes())
+    episodes[1:] = [Episode(9, "Replacement", 5.5)]
+
+    assert episodes == [Episode(1, "Pilot", 7.8), Episode(9, "Replacement", 5.5)]
+    assert len(episodes._names) == len(episodes._numbers) == len(episodes._ratings) == 2
+
+def test_insert_delete_and_sequence_methods():
+    episodes = EpisodeList(_episodes())
+    episodes.insert(0, Episode(0, "Prologue", 6.0))
+    episodes.insert(100, Episode(4, "Finale", 9.0))
+    episodes.append(Episode(5, "Epilogue", None))
+    del episodes[2]
+
+    assert [episode.name for episode in episodes] == ["Prologue", "Pilot", "Special", "Finale", "Epilogue"]
+    assert episodes.index(Episode(4, "Finale", 9.0)) == 3
+    assert Episode(1, "Pilot", 7.8) in episodes
+    episodes.extend([Episode(6, "Six", 1.0)])
+    assert episodes.pop().name == "Six"
+    episodes.reverse()
+    assert episodes[0].name == "Epilogue"
+    assert len(episodes._names) == len(episodes._numbers) == len(episodes._ratings) == 5
+
+def test_equality():
+    assert EpisodeList(_episodes()) == _episodes()
+    assert _episodes() == EpisodeList(_episodes())
+    assert EpisodeList(_episodes()) != _episodes()[:2]
+    assert EpisodeList() == []
+
+def test_season_progress_packs_plain_lists():
+    season = SeasonProgress(1, 3, 7.0, _episodes())
+
+    assert type(season.episodes) is EpisodeList
+    assert season.episodes == _episodes()
+    assert type(SeasonProgress(0, 0).episodes) is EpisodeList
+
+def test_models_are_slotted():
+    media = Media(1, "Title", "2020", "movie", None, "", 7.0, MediaStatus.WATCHING)
+    for obj in (media, SeasonProgress(0, 0), Episode(1, "Pilot", 7.0), EpisodeList()):
+        assert not hasattr(obj, "__dict__")
+
+def test_genres_are_interned():
+    first = Media(1, "A", "2020", "movie", None, "", 7.0, MediaStatus.WATCHING, genres=[{"id": 18, "name": "Drama"}])
+    second = Media(2, "B", "2020", "movie", None, "", 7.0, MediaStatus.WATCHING, genres=[{"id": 18, "name": "Drama"}])
+
+    assert first.genres[0] is second.genres[0]
+    assert intern_genre("not a dict") == "not a dict"
@@ -0,0 +1,66 @@
+import pytest
+from cinescope.core.data_manager import DataManager
+from cinescope.core.media import MediaStatus
+from cinescope.ui import my_list_widget
+from cinescope.ui.widgets import MediaCard, PosterLoader
+
+LIBRARY_SIZE = 5000
+
+class CountingCard(MediaCard):
+    constructed = 0
+
+    def __init__(self, *args, **kwargs):
+        CountingCard.constructed += 1
+        super().__init__(*args, **kwargs)
+
+# Building the grid dominates the runtime, so the tests share one library and touch disjoint ids
+@pytest.fixture(scope="module")
+def widget(qapp, tmp_path_factory, make_media):
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(PosterLoader, "run", lambda self: None)
+        monkeypatch.setattr(my_list_widget, "MediaCard", CountingCard)
+        dm = DataManager(filename=str(tmp_path_factory.mktemp("library") / "my_list.json"))
+        with dm.batch():
+            for media_id in range(LIBRARY_SIZE):
+                dm.add_media(make_media(media_id, type="series" if media_id % 2 else "movie", poster_path="/p.jpg"))
+        CountingCard.constructed = 0
+        widget = my_list_widget.MyListWidget(dm)
+        assert CountingCard.constructed == LIBRARY_SIZE
+        yield widget
+        widget.deleteLater()
+        dm.close()
+
+def constructions(mutate) -> int:
+    before = CountingCard.constructed
+    mutate()
+    return CountingCard.constructed - before
+
+def test_status_change_builds_no_card(widget):
+    assert constructions(lambda: widget.data_manager.update_media_status(1, MediaStatus.COMPLETED)) == 0
+
+def test_add_builds_one_card(widget, make_media):
+    assert constructions(lambda: widget.data_manager.add_media(make_media(LIBRARY_SIZE))) == 1
+
+def test_remove_builds_no_card(widget):
+    assert constructions(lambda: widget.data_manager.remove_media(2)) == 0
+    assert 2 not in widget._cards
+
+def test_title_change_rebuilds_its_card(widget):
+    assert constructions(lambda: widget.data_manager.update_media_fields(3, {"title": "Renamed"})) == 1
+
+def test_batch_builds_only_new_cards(widget, make_media):
+    def mutate():
+        with widget.data_manager.batch():
+            for media_id in range(100, 200):
+                widget.data_manager.update_media_status(media_id, MediaStatus.WATCHING)
+            widget.data_manager.remove_media(200)
+            widget.data_manager.add_media(make_media(LIBRARY_SIZE + 1))
+    assert constructions(mutate) == 1
+
+def test_batch_of_hidden_fields_builds_no_card(widget):
+    # e.g. a runtime backfill or library repair that leaves titles and posters alone
+    def mutate():
+        with widget.data_manager.batch():
+            for media_id in range(300, 400):
+                widget.data_manager.update_media_fields(media_id, {"runtime": 100, "plot": "Updated"})
+    assert constructions(mutate) == 0
@@ -0,0 +1,69 @@
+import pytest
+from cinescope.core.data_manager import DataManager
+from cinescope.core.media import MediaStatus
+
+DRAMA, COMEDY = {"id": 18, "name": "Drama"}, {"id": 35, "name": "Comedy"}
+
+@pytest.fixture(params=["json", "sqlite"])
+def data_manager(request, tmp_path, make_media):
+    dm = DataManager(filename=str(tmp_path / "my_list.json"), backend=request.param)
+    for media_id in range(1, 9):
+        dm.add_media(make_media(media_id, type="series" if media_id % 3 == 0 else "movie",
+                                genres=[DRAMA] if media_id % 2 else [COMEDY]))
+    yield dm
+    dm.close()
+
+def _assert_indexes_match(dm):
+    """Every facet query equals a scan of the list, in list order."""
+    for status in MediaStatus:
+        assert dm.query(status=status) == [media for media in dm.get_list() if media.status is status]
+        for media_type in ("movie", "series"):
+            assert dm.query(status=status, type=media_type) == [
+                media for media in dm.get_list() if media.status is status and media.type == media_type]
+    for genre in (DRAMA["id"], COMEDY["id"]):
+        assert dm.query(genre=genre) == [
+            media for media in dm.get_list() if any(g["id"] == genre for g in media.genres)]
+    assert [media.id for media in dm.find_media(status=MediaStatus.WATCHING)] == [
+        media.id for media in dm.get_list() if media.status is MediaStatus.WATCHING]
+
+def test_indexes_follow_adds_removes_and_updates(data_manager, make_media):
+    dm = data_manager
+    _assert_indexes_match(dm)
+
+    # Status changes reindex an item; the results must keep list order, not reindex order
+    for media_id in (7, 2, 5):
+        dm.update_media_status(media_id, MediaStatus.WATCHING)
+    _assert_indexes_match(dm)
+    assert [media.id for media in dm.query(status=MediaStatus.WATCHING)] == [2, 5, 7]
+
+    dm.remove_media(5)
+    dm.add_media(make_media(9, status=MediaStatus.WATCHING, genres=[DRAMA]))
+    dm.update_media_fields(4, {"genres": [DRAMA, COMEDY], "status": MediaStatus.WATCHING})
+    _assert_indexes_match(dm)
+    assert [media.id for media in dm.query(status=MediaStatus.WATCHING, genre=DRAMA["id"])] == [4, 7, 9]
+
+def test_indexes_survive_batch_rollback(data_manager, make_media):
+    dm = data_manager
+    dm.update_media_status(3, MediaStatus.COMPLETED)
+
+    with pytest.raises(RuntimeError):
+        with dm.batch():
+            dm.update_media_status(1, MediaStatus.COMPLETED)
+            dm.update_media_fields(2, {"genres": [DRAMA]})
+            dm.remove_media(3)
+            dm.add_media(make_media(10, status=MediaStatus.COMPLETED))
+            raise RuntimeError
+
+    _assert_indexes_match(dm)
+    assert [media.id for media in dm.query(status=MediaStatus.COMPLETED)] == [3]
+    # Adds after a rollback still land at the end of the list order
+    dm.add_media(make_media(11, status=MediaStatus.COMPLETED))
+    assert [media.id for media in dm.query(status=MediaStatus.COMPLETED)] == [3, 11]
+
+def test_find_media_orders_like_the_list_on_every_backend(data_manager):
+    for media_id in (8, 1, 6):
+        data_manager.update_media_status(media_id, MediaStatus.COMPLETED)
+
+    assert [media.id for media in data_manager.find_media(status=MediaStatus.COMPLETED)] == [1, 6, 8]
+    assert [media.id for media in data_manager.find_media(status=MediaStatus.COMPLETED, sort="title",
+                                                          descending=True)] == [8, 6, 1]
@@ -0,0 +1,185 @@
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import pytest
+import requests
+from cinescope.api.rate_limit import RateLimit, RateLimiter, retry_after_seconds
+from cinescope.api.transport import HttpTransport
+
+HOST = "127.0.0.1"
+
+class StandIn(ThreadingHTTPServer):
+    """Local API stand-in; the query string says how many 429s to send and with what Retry-After."""
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__((HOST, 0), _Handler)
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        parts = urlsplit(self.path)
+        query = {name: values[0] for name, values in parse_qs(parts.query).items()}
+        with server.lock:
+            call = server.calls[parts.path] = server.calls.get(parts.path, 0) + 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(float(query.get("delay", 0)))
+            if call <= int(query.get("fail", 0)):
+                self.send_response(int(query.get("status", 429)))
+                if query.get("retry_after") == "date":
+                    self.send_header("Retry-After", formatdate(time.time() + 2, usegmt=True))
+                elif "retry_after" in query:
+                    self.send_header("Retry-After", query["retry_after"])
+            else:
+                self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    server = StandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def _transport(**limiter_args) -> HttpTransport:
+    limits = limiter_args.pop("limits", {HOST: RateLimit(rate=1000, burst=1000)})
+    return HttpTransport(limiter=RateLimiter(limits, **limiter_args))
+
+def _get(transport, server, path, **params):
+    return transport.get(f"http://{HOST}:{server.server_port}{path}", params=params)
+
+def _response(retry_after) -> requests.Response:
+    response = requests.Response()
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return response
+
+def test_retry_after_parsing():
+    assert retry_after_seconds(_response("3")) == 3
+    assert retry_after_seconds(_response("-1")) == 0
+    assert 8 <= retry_after_seconds(_response(formatdate(time.time() + 10, usegmt=True))) <= 10
+    assert retry_after_seconds(_response(formatdate(time.time() - 60, usegmt=True))) == 0
+    assert retry_after_seconds(_response("soon")) is None
+    assert retry_after_seconds(_response(None)) is None
+
+@pytest.mark.parametrize("retry_after, minimum", [("1", 0.9), ("date", 0.9)])
+def test_honours_retry_after(server, retry_after, minimum):
+    transport = _transport()
+    started = time.monotonic()
+
+    response = _get(transport, server, "/throttled", fail=1, retry_after=retry_after)
+
+    assert response.status_code == 200
+    assert time.monotonic() - started >= minimum
+    stats = transport.limiter.stats()[HOST]
+    assert (stats["throttled"], stats["retries"], stats["requests"]) == (1, 1, 2)
+
+def test_retry_after_pauses_the_whole_host(server):
+    transport = _transport()
+    results = {}
+
+    def other():
+        time.sleep(0.2)  # Starts while the first request waits out its Retry-After
+        started = time.monotonic()
+        results["other"] = (_get(transport, server, "/other").status_code, time.monotonic() - started)
+
+    thread = threading.Thread(target=other)
+    thread.start()
+    _get(transport, server, "/throttled", fail=1, retry_after="1")
+    thread.join()
+
+    status, waited = results["other"]
+    assert status == 200 and waited >= 0.6
+
+def test_backoff_without_retry_after_gives_up_after_max_retries(server):
+    transport = _transport(max_retries=2, backoff_base=0.01)
+
+    response = _get(transport, server, "/always", fail=100, status=503)
+
+    assert response.status_code == 503
+    assert server.calls["/always"] == 3
+    assert transport.limiter.stats()[HOST]["retries"] == 2
+
+def test_retry_after_past_max_backoff_is_returned(server):
+    transport = _transport(max_backoff=5)
+    started = time.monotonic()
+
+    response = _get(transport, server, "/long", fail=1, retry_after="60")
+
+    assert response.status_code == 429
+    assert time.monotonic() - started < 1
+    assert server.calls["/long"] == 1
+
+def test_concurrency_shrinks_on_errors_and_regrows(server):
+    transport = _transport(limits={HOST: RateLimit(rate=1000, burst=1000, max_concurrency=8)})
+    concurrency = lambda: transport.limiter.stats()[HOST]["concurrency"]
+
+    _get(transport, server, "/error", fail=2, status=500)
+    assert concurrency() == 4
+    # A second failure within the same second counts as the same burst
+    _get(transport, server, "/error", fail=2, status=500)
+    assert concurrency() == 4
+
+    # One slot back per full window of successes
+    for _ in range(4):
+        _get(transport, server, "/ok")
+    assert concurrency() == 5
+    for _ in range(5):
+        _get(transport, server, "/ok")
+    assert concurrency() == 6
+
+def test_concurrency_cap_is_enforced(server):
+    transport = _transport(limits={HOST: RateLimit(rate=1000, burst=1000, max_concurrency=2)})
+    threads = [threading.Thread(target=_get, args=(transport, server, "/slow"), kwargs={"delay": 0.1})
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert server.calls["/slow"] == 8
+    assert server.max_in_flight == 2
+
+def test_per_key_overrides(server):
+    transport = _transport(limits={HOST: RateLimit(rate=5, burst=1)},
+                           key_limits={"paid": RateLimit(rate=1000, burst=1000)})
+
+    started = time.monotonic()
+    for _ in range(5):
+        _get(transport, server, "/paid", api_key="paid")
+    paid = time.monotonic() - started
+    started = time.monotonic()
+    for _ in range(5):
+        _get(transport, server, "/free", api_key="free")
+    free = time.monotonic() - started
+
+    # Four refills at 5 tokens per second for the default limit; the paid key never waits
+    assert free >= 0.7
+    assert paid < 0.5
+    limiter = transport.limiter
+    assert limiter._bucket(HOST, "paid") is not limiter._bucket(HOST, "free")
+    assert limiter._bucket(HOST, "paid").limit.rate == 1000
+
+def test_unlisted_hosts_are_not_limited(server):
+    transport = HttpTransport(limiter=RateLimiter({}))
+
+    assert _get(transport, server, "/throttled", fail=1).status_code == 429
+    assert transport.limiter.stats() == {}
@@ -0,0 +1,60 @@
+import time
+from PySide6.QtTest import QTest
+from cinescope.core.data_manager import DataManager
+from cinescope.core.media import MediaStatus
+from cinescope.core.save_scheduler import SaveScheduler
+
+def _scheduler(writes, **kwargs):
+    def prepare():
+        return lambda: writes.append(time.monotonic())
+    return SaveScheduler(prepare, **kwargs)
+
+def test_bursts_coalesce_into_one_write(qapp):
+    writes = []
+    scheduler = _scheduler(writes, delay_ms=50)
+    for _ in range(10):
+        scheduler.schedule()
+
+    QTest.qWait(150)
+    scheduler.flush()
+
+    assert len(writes) == 1
+    scheduler.close()
+
+def test_steady_edits_are_written_by_the_max_delay(qapp):
+    writes = []
+    scheduler = _scheduler(writes, delay_ms=100, max_delay_ms=200)
+    started = time.monotonic()
+    # An edit every 30 ms would restart a plain debounce forever
+    while time.monotonic() - started < 0.7:
+        scheduler.schedule()
+        QTest.qWait(30)
+    scheduler.flush()
+
+    assert len(writes) >= 3
+    assert writes[0] - started < 0.4
+    scheduler.close()
+
+def test_writes_after_close_are_synchronous(qapp):
+    writes = []
+    scheduler = _scheduler(writes)
+    scheduler.close()
+
+    scheduler.schedule()
+
+    assert len(writes) == 1
+
+def test_changes_after_flush_or_close_are_persisted(qapp, tmp_path, make_media):
+    filepath = str(tmp_path / "my_list.json")
+    dm = DataManager(filename=filepath)
+    dm.add_media(make_media(1))
+    # The window closes first; results still arriving through the event loop must not be lost
+    dm.flush()
+    dm.add_media(make_media(2))
+    dm.close()
+    dm.update_media_status(2, MediaStatus.WATCHING)
+
+    reloaded = DataManager(filename=filepath)
+    assert [media.id for media in reloaded.get_list()] == [1, 2]
+    assert reloaded.get_media_by_id(2).status is MediaStatus.WATCHING
+    reloaded.close()
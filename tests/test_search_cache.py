@@ -0,0 +1,62 @@
+from cinescope.api.search_cache import SearchCache, matches, normalize_query
+
+AMELIE = {"id": 194, "title": "Amélie", "original_title": "Le Fabuleux Destin d'Amélie Poulain"}
+AMERICAN = {"id": 14, "title": "American Beauty"}
+ALIEN = {"id": 348, "title": "Alien"}
+
+def _page(results, page=1, total_pages=1):
+    return {"page": page, "total_pages": total_pages, "results": results}
+
+def test_normalize_query_folds_case_accents_and_spaces():
+    assert normalize_query("  Amélie   POULAIN ") == "amelie poulain"
+    assert normalize_query("Straße") == "strasse"
+
+def test_matches_ignores_accents_on_both_sides():
+    assert matches(AMELIE, normalize_query("amelie p"))
+    assert matches(AMELIE, normalize_query("AMÉLIE"))
+    assert matches(AMELIE, normalize_query("destin poulain"))
+    assert not matches(AMERICAN, normalize_query("amelie"))
+
+def test_pages_accumulate_until_complete():
+    cache = SearchCache()
+    cache.add_page("am", _page([AMELIE], 1, 2))
+    # A repeated or out-of-order page is ignored
+    cache.add_page("am", _page([AMELIE], 1, 2))
+    cache.add_page("am", _page([ALIEN], 3, 3))
+    entry = cache.add_page("am", _page([AMERICAN], 2, 2))
+
+    assert entry.complete and entry.results == [AMELIE, AMERICAN]
+    assert cache.get("AM") is entry
+
+def test_narrow_filters_a_complete_prefix():
+    cache = SearchCache()
+    cache.add_page("am", _page([AMELIE, AMERICAN]))
+
+    entry = cache.narrow("amelie p")
+
+    assert entry.results == [AMELIE] and entry.complete
+    assert cache.get("amélie p") is entry
+
+def test_narrow_needs_a_complete_prefix():
+    cache = SearchCache()
+    cache.add_page("am", _page([AMELIE, AMERICAN], 1, 3))
+
+    assert cache.narrow("ame") is None
+
+def test_empty_narrowing_falls_through_to_tmdb():
+    cache = SearchCache()
+    cache.add_page("am", _page([AMELIE, AMERICAN]))
+
+    # TMDb may still know titles the local filter cannot match, e.g. by alternative titles
+    assert cache.narrow("amx") is None
+    assert cache.get("amx") is None
+
+def test_lru_capacity():
+    cache = SearchCache(capacity=2)
+    cache.add_page("a", _page([]))
+    cache.add_page("b", _page([]))
+    cache.get("a")
+    cache.add_page("c", _page([]))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
@@ -0,0 +1,126 @@
+import json
+import struct
+import pytest
+from cinescope.core.codec import encode_media
+from cinescope.core.data_manager import DataManager
+from cinescope.core.lazy_seasons import LazySeasons
+from cinescope.core.media import Episode, MediaStatus, SeasonProgress
+from cinescope.core.snapshot import MAGIC, decode_snapshot, encode_snapshot
+from cinescope.core.storage import to_plain
+
+def _library(make_media):
+    return [
+        make_media(1, title="Amélie", status=MediaStatus.COMPLETED, runtime=122,
+                   genres=[{"id": 35, "name": "Comédie"}, {"id": 10749, "name": "Romance"}]),
+        make_media(2, type="series", title="Дark ☃", status=MediaStatus.WATCHING, episode_run_time=[50],
+                   production_status="Ended", genres=[{"id": 18, "name": "Drama"}],
+                   seasons={"1": SeasonProgress(2, 3, 8.2, [Episode(1, "Geheimnisse", 8.0),
+                                                            Episode(2, "Lügen – 謊言", None),
+                                                            Episode(None, "Special", 7.25)]),
+                            "0": SeasonProgress(0, 0)}),
+        make_media(3, title="Plain", genres=[{"id": 35, "name": "Comédie"}]),
+    ]
+
+def _plain(items):
+    return to_plain([encode_media(media) for media in items])
+
+def _downgrade_to_v1(data: bytes) -> bytes:
+    """Rewrites a version 2 snapshot as version 1: no aggregates in the header, same season rows."""
+    u32 = struct.Struct("<I")
+    parts = [MAGIC, struct.pack("<H", 1)]
+    offset = len(MAGIC) + 2
+    (length,) = u32.unpack_from(data, offset)
+    parts.append(data[offset:offset + 4 + length])
+    offset += 4 + length
+    (count,) = u32.unpack_from(data, offset)
+    parts.append(data[offset:offset + 4])
+    offset += 4
+    for _ in range(count):
+        (length,) = u32.unpack_from(data, offset)
+        header = json.loads(data[offset + 4:offset + 4 + length])
+        offset += 4 + length
+        header_bytes = json.dumps(header[:-3], separators=(",", ":")).encode("ascii")
+        parts.append(u32.pack(len(header_bytes)) + header_bytes)
+        (length,) = u32.unpack_from(data, offset)
+        parts.append(data[offset:offset + 4 + length])
+        offset += 4 + length
+    return b"".join(parts)
+
+def test_v2_round_trip(make_media):
+    library = _library(make_media)
+
+    decoded = decode_snapshot(encode_snapshot([encode_media(media) for media in library]))
+
+    # Seasons stay packed until read, with the aggregates already known
+    assert isinstance(decoded[1].seasons, LazySeasons) and not decoded[1].seasons.loaded
+    assert decoded[1].seasons.totals() == (2, 3)
+    assert decoded[0].seasons == {}
+    assert decoded[1].status is MediaStatus.WATCHING
+    assert _plain(decoded) == _plain(library)
+
+def test_v2_reencodes_packed_seasons_unchanged(make_media):
+    data = encode_snapshot([encode_media(media) for media in _library(make_media)])
+
+    assert encode_snapshot([encode_media(media) for media in decode_snapshot(data)]) == data
+
+def test_v1_is_read_eagerly(make_media):
+    library = _library(make_media)
+
+    decoded = decode_snapshot(_downgrade_to_v1(encode_snapshot([encode_media(media) for media in library])))
+
+    assert _plain(decoded) == _plain(library)
+    assert type(decoded[1].seasons) is dict
+
+def test_non_ascii_text_survives(make_media):
+    data = encode_snapshot([encode_media(media) for media in _library(make_media)])
+    decoded = decode_snapshot(data)
+
+    assert data.isascii()
+    assert [media.title for media in decoded] == ["Amélie", "Дark ☃", "Plain"]
+    assert decoded[0].genres[0]["name"] == "Comédie"
+    assert decoded[0].genres[0] is decoded[2].genres[0]
+    assert [episode.name for episode in decoded[1].seasons["1"].episodes] == ["Geheimnisse", "Lügen – 謊言", "Special"]
+
+def test_truncated_or_foreign_files_raise_value_error(make_media):
+    data = encode_snapshot([encode_media(media) for media in _library(make_media)])
+
+    for length in range(len(data)):
+        with pytest.raises(ValueError):
+            decode_snapshot(data[:length])
+    with pytest.raises(ValueError):
+        decode_snapshot(b"[]")
+    with pytest.raises(ValueError):
+        decode_snapshot(MAGIC + struct.pack("<H", 99) + data[6:])
+
+def test_compact_storage_falls_back_to_json(tmp_path, make_media):
+    filepath = str(tmp_path / "my_list.json")
+    json_dm = DataManager(filename=filepath)
+    for media in _library(make_media):
+        json_dm.add_media(media)
+    json_dm.close()
+
+    dm = DataManager(filename=filepath, backend="compact")
+    assert _plain(dm.get_list()) == _plain(_library(make_media))
+    dm.close()
+
+    # The compact snapshot is written on close and read from then on
+    assert (tmp_path / "my_list.csnp").exists()
+    dm = DataManager(filename=filepath, backend="compact")
+    assert _plain(dm.get_list()) == _plain(_library(make_media))
+    dm.close()
+
+def test_export_json_from_compact(tmp_path, make_media):
+    dm = DataManager(filename=str(tmp_path / "my_list.json"), backend="compact")
+    for media in _library(make_media):
+        dm.add_media(media)
+    dm.close()
+    dm = DataManager(filename=str(tmp_path / "my_list.json"), backend="compact")
+
+    dm.export_json(str(tmp_path / "export.json"))
+    dm.close()
+
+    with open(tmp_path / "export.json", encoding="utf-8") as f:
+        exported = json.load(f)
+    assert exported == _plain(_library(make_media))
+    # The export reads back as a plain JSON library
+    assert _plain(DataManager(filename=str(tmp_path / "export.json"), journaled=False).get_list()) == exported
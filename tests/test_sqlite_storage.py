@@ -0,0 +1,96 @@
+import json
+from cinescope.core.codec import encode_media
+from cinescope.core.data_manager import DataManager
+from cinescope.core.media import Episode, MediaStatus, SeasonProgress
+from cinescope.core.storage import SqliteStorage, migrate_json_to_sqlite, to_plain
+
+def _library(make_media):
+    return [
+        make_media(1, status=MediaStatus.COMPLETED, runtime=120, genres=[{"id": 18, "name": "Drama"}]),
+        make_media(2, status=MediaStatus.WATCHING, runtime=90, genres=[{"id": 35, "name": "Comedy"}]),
+        make_media(3, status=MediaStatus.PLAN_TO_WATCH, runtime=100),
+        make_media(4, type="series", status=MediaStatus.COMPLETED, episode_run_time=[45],
+                   genres=[{"id": 18, "name": "Drama"}]),
+        make_media(5, type="series", status=MediaStatus.WATCHING, episode_run_time=[30],
+                   seasons={"1": SeasonProgress(3, 8, 7.0, [Episode(1, "Pilot", 7.5), Episode(2, "Två", None)])}),
+        make_media(6, type="series", status=MediaStatus.WATCHING),  # No runtime, not counted
+    ]
+
+def _write_json(path, items):
+    with open(path, "w") as f:
+        json.dump([encode_media(media) for media in items], f)
+
+def test_migrate_json_to_sqlite(tmp_path, make_media):
+    json_path, db_path = str(tmp_path / "my_list.json"), str(tmp_path / "my_list.db")
+    library = _library(make_media)
+    _write_json(json_path, library)
+
+    assert migrate_json_to_sqlite(json_path, db_path) == len(library)
+
+    storage = SqliteStorage(db_path)
+    items = storage.load()
+    assert [media.id for media in items] == [media.id for media in library]
+    # Seasons load lazily, so compare before closing the connection
+    assert to_plain([encode_media(media) for media in items]) == to_plain([encode_media(media) for media in library])
+    storage.close()
+    # The JSON list is left in place
+    assert (tmp_path / "my_list.json").exists()
+
+def test_data_manager_migrates_on_first_sqlite_start(tmp_path, make_media):
+    json_path = str(tmp_path / "my_list.json")
+    _write_json(json_path, _library(make_media))
+
+    dm = DataManager(filename=json_path, backend="sqlite")
+
+    assert (tmp_path / "my_list.db").exists()
+    assert dm.get_media_by_id(5).seasons["1"].episodes[1].name == "Två"
+    dm.close()
+
+def test_summarize_matches_in_memory(tmp_path, make_media):
+    library = _library(make_media)
+    json_dm = DataManager(filename=str(tmp_path / "json" / "my_list.json"), journaled=False)
+    sqlite_dm = DataManager(filename=str(tmp_path / "my_list.json"), backend="sqlite")
+    for media in library:
+        json_dm.add_media(media)
+    for media in _library(make_media):
+        sqlite_dm.add_media(media)
+
+    summary = sqlite_dm.summarize()
+
+    assert summary == json_dm.summarize()
+    assert summary["total_watch_time_minutes"] == 120 + 90 + 20 * 45 + 3 * 30
+    assert summary["completed_movies"] == 1
+    assert summary["completed_shows"] == 1
+    assert summary["total_items"] == 6
+    assert summary["genre_counts"] == {"Drama": 2, "Comedy": 1}
+    sqlite_dm.close()
+    json_dm.close()
+
+def test_single_row_updates_persist(tmp_path, make_media):
+    filepath = str(tmp_path / "my_list.json")
+    dm = DataManager(filename=filepath, backend="sqlite")
+    for media in _library(make_media):
+        dm.add_media(media)
+    dm.update_media_status(3, MediaStatus.DROPPED)
+    dm.remove_media(2)
+    dm.close()
+
+    dm = DataManager(filename=filepath, backend="sqlite")
+    assert [media.id for media in dm.get_list()] == [1, 3, 4, 5, 6]
+    assert dm.get_media_by_id(3).status is MediaStatus.DROPPED
+    assert [media.id for media in dm.find_media(sort="title", descending=True)] == [6, 5, 4, 3, 1]
+    dm.close()
+
+def test_title_search_folds_non_ascii_like_json(tmp_path, make_media):
+    titles = ["Брат", "Élite", "Straße", "Plain"]
+    json_dm = DataManager(filename=str(tmp_path / "json_list.json"), journaled=False)
+    sqlite_dm = DataManager(filename=str(tmp_path / "my_list.json"), backend="sqlite")
+    for media_id, title in enumerate(titles, 1):
+        json_dm.add_media(make_media(media_id, title=title))
+        sqlite_dm.add_media(make_media(media_id, title=title))
+
+    for query, expected in [("брат", ["Брат"]), ("élite", ["Élite"]), ("STRASSE", ["Straße"]), ("pl", ["Plain"])]:
+        assert [media.title for media in sqlite_dm.find_media(title=query)] == expected
+        assert [media.title for media in json_dm.find_media(title=query)] == expected
+    sqlite_dm.close()
+    json_dm.close()
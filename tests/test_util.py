@@ -0,0 +1,37 @@
+import threading
+import pytest
+from cinescope.core.util import Shared, write_atomic
+
+def test_shared_creates_one_instance_across_threads():
+    created = []
+    shared = Shared(lambda: created.append(object()) or created[-1])
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(shared.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert all(result is created[0] for result in results)
+
+def test_write_atomic_replaces_the_file(tmp_path):
+    path = tmp_path / "nested" / "data.json"
+
+    write_atomic(str(path), lambda f: f.write("first"))
+    write_atomic(str(path), lambda f: f.write(b"second"), binary=True, fsync=True)
+
+    assert path.read_text() == "second"
+    assert not (tmp_path / "nested" / "data.json.tmp").exists()
+
+def test_failed_write_keeps_the_old_file(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text("old")
+
+    def fail(f):
+        f.write("half")
+        raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        write_atomic(str(path), fail)
+    assert path.read_text() == "old"